@@ -0,0 +1,88 @@
+# =========================
+# 통합 CLI 하위 명령별 콜드 스타트 측정 (새 인터프리터에서 작업 시작 직전까지)
+# =========================
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+import statistics
+
+
+# 콜드 스타트에서 빠져야 할 무거운 의존성
+HEAVY_MODULES = ('selenium.webdriver', 'pandas', 'numpy', 'pyarrow', 'openpyxl', 'httpx', 'aiohttp')
+
+# 하위 명령 → 새 인터프리터에서 실행할 코드 (작업 시작 직전까지 필요한 import / 명령 자체 실행)
+SCENARIOS = {
+    'crawl': "import cli, orchestrator, skt_crawler, lguplus_crawler",
+    'plan': "import cli; cli.main(['plan', '--offline', '--output', {output!r}])",
+    'export tables': "import cli, tables, pandas",
+    'export history': "import cli; cli.main(['export', 'history', '--history-store', {history!r}, 'stats'])",
+    'bench': "import cli, bench_suite",
+    # 쿠키 캐시가 만료돼 브라우저를 띄울 때만 추가되는 비용 (모듈 로드 시점에서 미룬 부분)
+    'crawl (쿠키 갱신)': "import cli, orchestrator, skt_crawler, lguplus_crawler\n"
+                       "from selenium import webdriver\nwebdriver.Chrome",
+}
+
+REPORT = (
+    "\nimport sys, json\n"
+    "print('@@' + json.dumps([m for m in {heavy!r} if m in sys.modules]))"
+)
+
+
+def write_catalog_caches(output_dir):
+    """
+    plan --offline용 카탈로그 캐시 (요금제 50개씩)
+    """
+    skt = {'saved_at': time.time(), 'groups': {'1': [
+        {'subscriptionId': f"NA{i:05d}", 'subscriptionNm': f"요금제 {i}", 'categoryId': '1'} for i in range(50)
+    ]}}
+    lguplus = {'saved_at': time.time(), 'groups': {'00': [
+        {'code': f"LPZ{i:07d}", 'name': f"요금제 {i}", 'type': '5G'} for i in range(50)
+    ]}}
+    for name, cache in (('.skt_catalog_cache.json', skt), ('.lguplus_catalog_cache.json', lguplus)):
+        with open(os.path.join(output_dir, name), 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+
+
+def measure(code, repeat):
+    """
+    새 인터프리터 실행 시간 목록(초) + 로드된 무거운 의존성
+    """
+    timings, heavy = [], []
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=here)
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-c', code + REPORT.format(heavy=HEAVY_MODULES)],
+                                capture_output=True, text=True, cwd=here, env=env)
+        timings.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+        heavy = json.loads(result.stdout.rsplit('@@', 1)[1])
+    return timings, heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description="통합 CLI 하위 명령별 콜드 스타트 측정")
+    parser.add_argument('--repeat', type=int, default=5, help='명령별 반복 횟수 (중앙값 보고)')
+    args = parser.parse_args()
+
+    output_dir = tempfile.mkdtemp()
+    write_catalog_caches(output_dir)
+    history = os.path.join(output_dir, 'history.sqlite')
+
+    baseline = statistics.median(measure("pass", args.repeat)[0])
+    print(f"🐍 인터프리터 기동: {baseline * 1000:.0f}ms\n")
+
+    for name, code in SCENARIOS.items():
+        timings, heavy = measure(code.format(output=output_dir, history=history), args.repeat)
+        median = statistics.median(timings)
+        print(f"⏱️  {name:<26} {median * 1000:>6.0f}ms (기동 제외 {(median - baseline) * 1000:>5.0f}ms) | "
+              f"무거운 의존성: {', '.join(heavy) or '없음'}")
+
+
+if __name__ == "__main__":
+    main()
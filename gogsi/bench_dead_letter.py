@@ -0,0 +1,173 @@
+# =========================
+# 실패 작업 dead-letter 재시도 점검 (장애를 주입한 스텁 서버)
+# =========================
+import zlib
+import time
+import argparse
+import tempfile
+import threading
+from urllib.parse import urlparse, parse_qs
+
+import bench_skt
+import bench_lguplus
+from skt_crawler import SKTStableCrawler
+from lguplus_crawler import LGUplusCrawler
+
+
+# 주입할 장애 종류 → 키별로 실패시킬 요청 수
+# - 상태 코드 / 연결 끊김은 요청 안 재시도(inline_retries)까지 모두 실패시켜 dead-letter로 보냄
+# - 200 응답의 본문 오류는 재시도 없이 바로 실패하므로 1회만
+FAULTS = {
+    'http': 3,
+    'connection': 3,
+    'json': 1,
+    'parse_miss': 1,
+}
+
+
+class FaultInjector:
+    """
+    요청 키의 해시로 일부 작업(rate 비율)에 장애 종류를 정하고, 키별로 정해진 횟수만큼만 실패 응답
+    """
+
+    def __init__(self, rate, faults):
+        self.rate = rate
+        self.faults = faults
+        self.attempts = {}
+        self.injected = 0
+        self.lock = threading.Lock()
+
+    def fault_for(self, key):
+        """
+        이번 요청에 줄 장애 종류 (없으면 None)
+        """
+        digest = zlib.crc32(key.encode('utf-8'))
+        if digest % 1000 >= self.rate * 1000:
+            return None
+        
+        kind = self.faults[digest % len(self.faults)]
+        with self.lock:
+            attempt = self.attempts.get(key, 0) + 1
+            self.attempts[key] = attempt
+            if attempt > FAULTS[kind]:
+                return None
+            self.injected += 1
+        return kind
+
+
+def send_fault(handler, kind):
+    """
+    장애 종류별 응답 (http: 503 / connection: 응답 없이 끊기 / json: 잘린 JSON / parse_miss: 구조 없는 본문)
+    """
+    if kind == 'connection':
+        handler.close_connection = True
+        return
+    
+    if kind == 'http':
+        status, body, content_type = 503, b'', 'text/plain'
+    elif kind == 'json':
+        status, body, content_type = 200, b'{"dvicMdlbSufuDtoList": [{"urcTrmMdlNm": ', 'application/json'
+    elif handler.path.startswith('/notice'):
+        status, body, content_type = 200, '<html><body>점검 중</body></html>'.encode('utf-8'), 'text/html'
+    else:
+        status, body, content_type = 200, b'{"resultCode": "E"}', 'application/json'
+    
+    handler.send_response(status)
+    handler.send_header('Content-Type', content_type)
+    handler.send_header('Content-Length', str(len(body)))
+    handler.end_headers()
+    handler.wfile.write(body)
+
+
+class FlakySKTHandler(bench_skt.SKTStubHandler):
+    injector = None
+
+    def _notice(self, qs, throttled):
+        key = '|'.join(qs.get(name, [''])[0] for name in ('prodId', 'scrbType', 'saleMonth'))
+        kind = self.injector.fault_for(key) if self.injector else None
+        if kind is None:
+            return super()._notice(qs, throttled)
+        time.sleep(self.latency)
+        send_fault(self, kind)
+
+
+class FlakyLGUplusHandler(bench_lguplus.LGUplusStubHandler):
+    injector = None
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        if not parsed.path.endswith('/mdlb-sufu-list') or self.injector is None:
+            return super().do_GET()
+        
+        qs = parse_qs(parsed.query)
+        key = '|'.join(qs.get(name, [''])[0] for name in ('urcMblPpCd', 'urcHphnEntrPsblKdCd', 'pageNo'))
+        kind = self.injector.fault_for(key)
+        if kind is None:
+            return super().do_GET()
+        time.sleep(self.latency)
+        send_fault(self, kind)
+
+
+def make_crawler(carrier, base_url):
+    if carrier == 'SKT':
+        return SKTStableCrawler(base_url=base_url, output_dir=tempfile.mkdtemp())
+    crawler = LGUplusCrawler(base_url=base_url, output_dir=tempfile.mkdtemp())
+    crawler.cookies = {'cf_clearance': 'stub'}
+    return crawler
+
+
+def run_once(carrier, args, rate, retry_passes):
+    """
+    스텁 서버 1개로 전체 작업 수집 → (행 수, 작업 수, 주입한 실패 응답 수, 남은 실패 작업 수, 초)
+    """
+    injector = FaultInjector(rate, list(FAULTS)) if rate else None
+    if carrier == 'SKT':
+        handler = type('Flaky', (FlakySKTHandler,), {'injector': injector})
+        server, base_url = bench_skt.start_stub_server(latency=args.latency, categories=2,
+                                                       plans_per_category=args.plans, handler_cls=handler)
+    else:
+        handler = type('Flaky', (FlakyLGUplusHandler,), {'injector': injector})
+        server, base_url = bench_lguplus.start_stub_server(latency=args.latency, plans=args.plans, models=25,
+                                                           tls=False, handler_cls=handler)
+    
+    crawler = make_crawler(carrier, base_url)
+    crawler.retry_passes = retry_passes
+    crawler.retry_backoff = args.retry_backoff
+    tasks = crawler.build_tasks(crawler.discover_catalog())
+    
+    start = time.perf_counter()
+    rows = sum(len(r) for _, r in crawler.iter_results(tasks, max_threads=args.threads))
+    elapsed = time.perf_counter() - start
+    
+    lost = len(crawler.dead_letter)
+    crawler.close()
+    server.shutdown()
+    return rows, len(tasks), injector.injected if injector else 0, lost, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="실패 작업 dead-letter 재시도 점검 (장애 주입 스텁)")
+    parser.add_argument('--latency', type=float, default=0.01)
+    parser.add_argument('--plans', type=int, default=10, help='카테고리당 요금제 수')
+    parser.add_argument('--threads', type=int, default=5)
+    parser.add_argument('--fault-rate', type=float, default=0.2, help='장애를 주입할 요청 키 비율')
+    parser.add_argument('--retry-backoff', type=float, default=0.5, help='재시도 단계 기본 대기 (초)')
+    args = parser.parse_args()
+    
+    for carrier in ('SKT', 'LGU+'):
+        print(f"\n{'=' * 60}\n🧪 [{carrier}] 장애 주입 {args.fault_rate:.0%} ({', '.join(FAULTS)})\n{'=' * 60}")
+        clean = run_once(carrier, args, 0, 2)
+        no_retry = run_once(carrier, args, args.fault_rate, 0)
+        retried = run_once(carrier, args, args.fault_rate, 2)
+        
+        print("-" * 60)
+        print(f"정상:            {clean[0]:,}건 / 작업 {clean[1]:,}개 ({clean[4]:.2f}초)")
+        print(f"장애, 재시도 없음: {no_retry[0]:,}건 / 실패 응답 {no_retry[2]:,}회 → 누락 작업 {no_retry[3]:,}개 "
+              f"({no_retry[4]:.2f}초)")
+        print(f"장애, 재시도 2회:  {retried[0]:,}건 / 실패 응답 {retried[2]:,}회 → 누락 작업 {retried[3]:,}개 "
+              f"({retried[4]:.2f}초)")
+        print(f"재시도 후 결과 건수 일치: {'✅' if retried[0] == clean[0] else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# =========================
+# 분산 수집 점검 (재생 서버 + 로컬 워커 프로세스, 워커 강제 종료 후 재배포 확인)
+# =========================
+import io
+import os
+import time
+import signal
+import argparse
+import tempfile
+import threading
+import contextlib
+
+from bench_suite import record_synthetic, make_crawler
+from distributed import ShardCoordinator, make_plugin
+from replay import start_replay_server
+from work_queue import WorkQueue
+
+
+def count_single(carrier, base_url, threads):
+    """
+    단일 프로세스 수집 행 수 / 시간 (비교 기준)
+    """
+    crawler = make_crawler(carrier, 'serial', base_url, tempfile.mkdtemp())
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.time()
+        buffer = crawler.collect(crawler.build_tasks(crawler.discover_catalog()), max_threads=threads)
+        elapsed = time.time() - start
+        crawler.close()
+    return len(buffer), elapsed
+
+
+def kill_one_worker(coordinator, queue_path, after_shards):
+    """
+    샤드가 after_shards개 끝나면 로컬 워커 1개를 SIGKILL (임대 중이던 샤드는 만료 후 재배포되어야 함)
+    """
+    queue = WorkQueue(queue_path)
+    try:
+        while True:
+            time.sleep(0.1)
+            found = queue.conn.execute(
+                "SELECT COUNT(*), SUM(state = 'leased') FROM shards WHERE state IN ('done', 'leased')"
+            ).fetchone()
+            done, leased = found[0] - (found[1] or 0), found[1] or 0
+            if done >= after_shards and leased and coordinator.processes:
+                victim = coordinator.processes[0]
+                os.kill(victim.pid, signal.SIGKILL)
+                print(f"💥 워커 pid {victim.pid} 강제 종료 (완료 샤드 {done}개, 처리 중 {leased}개)")
+                return
+            if coordinator.processes and all(p.poll() is not None for p in coordinator.processes):
+                return
+    finally:
+        queue.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="분산 수집 점검 (로컬 워커 + 재생 서버)")
+    parser.add_argument('--carrier', choices=['skt', 'lguplus'], default='skt')
+    parser.add_argument('--workers', type=int, default=3, help='로컬 워커 프로세스 수')
+    parser.add_argument('--threads', type=int, default=5, help='워커별 스레드 수')
+    parser.add_argument('--shard-size', type=int, default=10)
+    parser.add_argument('--lease', type=int, default=3, help='샤드 임대 시간 (초)')
+    parser.add_argument('--latency', type=float, default=0.03, help='재생 응답 지연 (초)')
+    parser.add_argument('--kill-after', type=int, default=2,
+                        help='샤드 N개 완료 후 워커 1개 강제 종료 (-1: 끔)')
+    args = parser.parse_args()
+
+    fixture_path = os.path.join(tempfile.mkdtemp(), 'synthetic.jsonl.gz')
+    count = record_synthetic(fixture_path)
+    print(f"📼 합성 녹화 파일: {count:,}개 응답")
+
+    server, base_url = start_replay_server(fixture_path, latency=args.latency)
+    print(f"🧪 재생 서버: {base_url} (지연 {args.latency*1000:.0f}ms)\n")
+
+    expected, single_elapsed = count_single(args.carrier, base_url, args.threads)
+    print(f"1️⃣  단일 프로세스: {expected:,}건 / {single_elapsed:.2f}초 (스레드 {args.threads}개)")
+
+    output_dir = tempfile.mkdtemp()
+    queue_path = os.path.join(output_dir, 'work_queue.sqlite')
+    options = {'base_url': base_url, 'paging': 'serial'}
+    plugin = make_plugin(args.carrier, options, output_dir, output_format='csv')
+    plugin.catalog_cache_path = None
+    if args.carrier == 'lguplus':
+        # 워커도 같은 출력 디렉토리의 쿠키 캐시로 준비 단계 통과
+        plugin.save_cookie_cache([{'name': 'cf_clearance', 'value': 'replay', 'expiry': time.time() + 3600}])
+
+    coordinator = ShardCoordinator(plugin, queue_path, options=options, shard_size=args.shard_size,
+                                   local_workers=args.workers, worker_threads=args.threads,
+                                   lease_seconds=args.lease, poll_interval=0.2)
+
+    killer = None
+    if args.kill_after >= 0:
+        killer = threading.Thread(target=kill_one_worker, args=(coordinator, queue_path, args.kill_after),
+                                  daemon=True)
+        killer.start()
+
+    start = time.time()
+    with contextlib.redirect_stdout(io.StringIO()):
+        rows = coordinator.run()
+    elapsed = time.time() - start
+
+    queue = WorkQueue(queue_path)
+    attempts = dict(queue.conn.execute(
+        "SELECT attempts, COUNT(*) FROM shards GROUP BY attempts"
+    ).fetchall())
+    failed = queue.conn.execute("SELECT COUNT(*) FROM shards WHERE state = 'failed'").fetchone()[0]
+    queue.close()
+
+    print(f"🌐 분산 ({args.workers}개 워커): {rows:,}건 / {elapsed:.2f}초 | 샤드 배포 횟수별 "
+          f"{', '.join(f'{k}회 {v}개' for k, v in sorted(attempts.items()))} | 실패 {failed}")
+
+    if rows == expected and not failed:
+        print("✅ 단일 프로세스와 행 수 일치")
+    else:
+        print(f"❌ 행 수 불일치 (기대 {expected:,}건, 분산 {rows:,}건)")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
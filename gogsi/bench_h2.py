@@ -0,0 +1,303 @@
+# =========================
+# HTTP/2 전송 점검 (로컬 h2 TLS 서버 → 기존 스텁 서버 중계)
+# =========================
+import io
+import ssl
+import time
+import queue
+import socket
+import argparse
+import tempfile
+import threading
+import contextlib
+from http.server import BaseHTTPRequestHandler
+
+import requests
+import h2.config
+import h2.events
+import h2.errors
+import h2.exceptions
+import h2.connection
+
+from bench_lguplus import make_self_signed_cert
+
+
+class H2StubServer:
+    """
+    ALPN으로 h2 / http/1.1을 모두 받는 TLS 서버 (요청은 HTTP/1.1 스텁 서버로 중계)
+    - stats: 프로토콜별 커넥션 수 / 요청 수, HTTP/2 커넥션 1개의 최대 동시 스트림 수
+    - goaway_after: HTTP/2 요청 N건마다 GOAWAY(PROTOCOL_ERROR)로 커넥션 종료 (대체 경로 점검용)
+    """
+
+    def __init__(self, backend_url, goaway_after=0):
+        self.backend_url = backend_url
+        self.goaway_after = goaway_after
+        self.backend = requests.Session()
+        self.stats = {'h2_connections': 0, 'h1_connections': 0, 'h2_requests': 0, 'h1_requests': 0,
+                      'max_streams': 0, 'goaways': 0}
+        self._lock = threading.Lock()
+        
+        cert, key = make_self_signed_cert(tempfile.mkdtemp())
+        self.ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        self.ctx.load_cert_chain(cert, key)
+        self.ctx.set_alpn_protocols(['h2', 'http/1.1'])
+        
+        self.sock = socket.socket()
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(('127.0.0.1', 0))
+        self.sock.listen(64)
+        self.base_url = f"https://127.0.0.1:{self.sock.getsockname()[1]}"
+        self._closed = False
+
+    def start(self):
+        threading.Thread(target=self._accept, daemon=True).start()
+        return self
+
+    def shutdown(self):
+        self._closed = True
+        self.sock.close()
+
+    def _incr(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def _accept(self):
+        while not self._closed:
+            try:
+                raw, _ = self.sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(raw,), daemon=True).start()
+
+    def _serve(self, raw):
+        try:
+            conn = self.ctx.wrap_socket(raw, server_side=True)
+        except (ssl.SSLError, OSError):
+            raw.close()
+            return
+        
+        if conn.selected_alpn_protocol() == 'h2':
+            self._incr('h2_connections')
+            _H2Connection(self, conn).run()
+        else:
+            self._incr('h1_connections')
+            _H1ProxyHandler(conn, conn.getpeername(), self)
+
+    def fetch_backend(self, path):
+        """
+        스텁 서버 응답 → (상태 코드, Content-Type, 본문)
+        """
+        resp = self.backend.get(self.backend_url + path, timeout=30)
+        return resp.status_code, resp.headers.get('Content-Type', 'application/octet-stream'), resp.content
+
+
+class _H1ProxyHandler(BaseHTTPRequestHandler):
+    """
+    ALPN http/1.1 커넥션 중계 (requests 세션 / HTTP/1.1 대체 경로)
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server._incr('h1_requests')
+        status, content_type, body = self.server.fetch_backend(self.path)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _H2Connection:
+    """
+    HTTP/2 커넥션 1개 (스트림마다 중계 스레드, 흐름 제어 창만큼 나눠 전송)
+    - TLS 소켓 읽기/쓰기는 run 스레드 하나에서만 (SSLSocket은 스레드 간 동시 사용 불가)
+    - 중계 스레드는 응답을 ready 큐에 넣고, run 스레드가 꺼내 전송
+    """
+
+    def __init__(self, server, sock):
+        self.server = server
+        self.sock = sock
+        self.conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        self.ready = queue.Queue()
+        self.pending = {}
+        self.active = 0
+        self.served = 0
+        self.closed = False
+
+    def run(self):
+        self.conn.initiate_connection()
+        self._flush_socket()
+        self.sock.settimeout(0.005)
+        
+        headers = {}
+        try:
+            while not self.closed:
+                try:
+                    data = self.sock.recv(65536)
+                    if not data:
+                        break
+                except (socket.timeout, ssl.SSLWantReadError):
+                    data = None
+                
+                for event in self.conn.receive_data(data) if data else ():
+                    if isinstance(event, h2.events.RequestReceived):
+                        headers[event.stream_id] = dict(event.headers)
+                    elif isinstance(event, h2.events.StreamEnded):
+                        self._start_stream(event.stream_id, headers.pop(event.stream_id, {}))
+                    elif isinstance(event, h2.events.ConnectionTerminated):
+                        self.closed = True
+                
+                while not self.ready.empty():
+                    stream_id, status, content_type, body = self.ready.get()
+                    self.conn.send_headers(stream_id, [
+                        (':status', str(status)), ('content-type', content_type),
+                        ('content-length', str(len(body)))
+                    ])
+                    self.pending[stream_id] = body
+                
+                self._send_pending()
+                self._flush_socket()
+        except (OSError, h2.exceptions.ProtocolError):
+            pass
+        finally:
+            self.closed = True
+            self.sock.close()
+
+    def _start_stream(self, stream_id, headers):
+        self.active += 1
+        self.served += 1
+        self.server._incr('h2_requests')
+        with self.server._lock:
+            self.server.stats['max_streams'] = max(self.server.stats['max_streams'], self.active)
+        
+        if self.server.goaway_after and self.served % self.server.goaway_after == 0:
+            # 처리 중인 스트림까지 끊어 클라이언트에 RemoteProtocolError 유발
+            self.server._incr('goaways')
+            self.conn.close_connection(error_code=h2.errors.ErrorCodes.PROTOCOL_ERROR)
+            self._flush_socket()
+            self.closed = True
+            return
+        
+        path = headers.get(b':path', b'/').decode('utf-8')
+        threading.Thread(target=self._respond, args=(stream_id, path), daemon=True).start()
+
+    def _respond(self, stream_id, path):
+        try:
+            status, content_type, body = self.server.fetch_backend(path)
+        except requests.RequestException:
+            status, content_type, body = 502, 'text/plain', b''
+        self.ready.put((stream_id, status, content_type, body))
+
+    def _send_pending(self):
+        # 흐름 제어 창이 허락하는 만큼만 DATA 프레임 전송 (나머지는 WINDOW_UPDATE 후)
+        for stream_id in list(self.pending):
+            body = self.pending[stream_id]
+            while body:
+                size = min(self.conn.local_flow_control_window(stream_id), self.conn.max_outbound_frame_size,
+                           len(body))
+                if size <= 0:
+                    break
+                self.conn.send_data(stream_id, body[:size])
+                body = body[size:]
+            
+            if body:
+                self.pending[stream_id] = body
+            else:
+                del self.pending[stream_id]
+                self.conn.end_stream(stream_id)
+                self.active -= 1
+
+    def _flush_socket(self):
+        data = self.conn.data_to_send()
+        if data:
+            self.sock.settimeout(None)
+            try:
+                self.sock.sendall(data)
+            except OSError:
+                self.closed = True
+            self.sock.settimeout(0.005)
+
+
+# ==========================================================
+# 수집 비교
+# ==========================================================
+def crawl(carrier, base_url, http2, threads):
+    """
+    스텁 카탈로그 전체 수집 → (행 목록, 경과 시간, 세션 통계)
+    """
+    output_dir = tempfile.mkdtemp()
+    if carrier == 'skt':
+        from skt_crawler import SKTStableCrawler
+        crawler = SKTStableCrawler(base_url=base_url, output_dir=output_dir, http2=http2)
+    else:
+        from lguplus_crawler import LGUplusCrawler
+        crawler = LGUplusCrawler(base_url=base_url, output_dir=output_dir, http2=http2)
+        crawler.cookies = {'cf_clearance': 'stub'}
+    crawler.catalog_cache_path = None
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        rows = list(crawler.collect(crawler.build_tasks(crawler.discover_catalog()),
+                                    max_threads=threads).iter_dicts())
+        elapsed = time.perf_counter() - start
+
+    stats = {}
+    if http2:
+        sessions = [crawler.session] if carrier == 'skt' else [crawler._h2_session]
+        stats = sessions[0].connection_stats()
+    with contextlib.redirect_stdout(io.StringIO()):
+        crawler.close()
+    return rows, elapsed, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP/2 다중화 전송 점검 (로컬 h2 서버)")
+    parser.add_argument('--carriers', nargs='+', choices=['skt', 'lguplus'], default=['skt', 'lguplus'])
+    parser.add_argument('--latency', type=float, default=0.03, help='스텁 응답 지연 (초)')
+    parser.add_argument('--threads', type=int, default=10)
+    parser.add_argument('--goaway-after', type=int, default=25,
+                        help='대체 경로 점검: HTTP/2 요청 N건마다 GOAWAY (0: 생략)')
+    args = parser.parse_args()
+
+    for carrier in args.carriers:
+        if carrier == 'skt':
+            from bench_skt import start_stub_server
+            backend, backend_url = start_stub_server(latency=args.latency, categories=2,
+                                                     plans_per_category=5, devices=20)
+        else:
+            from bench_lguplus import start_stub_server
+            backend, backend_url = start_stub_server(latency=args.latency, plans=10, models=25, tls=False)
+        
+        print(f"\n{'=' * 70}\n📡 {carrier} (스텁 지연 {args.latency * 1000:.0f}ms, 스레드 {args.threads}개)")
+        
+        results = {}
+        scenarios = [('HTTP/1.1', False, 0), ('HTTP/2', True, 0)]
+        if args.goaway_after:
+            scenarios.append((f'HTTP/2 + GOAWAY/{args.goaway_after}', True, args.goaway_after))
+        
+        for name, http2, goaway_after in scenarios:
+            server = H2StubServer(backend_url, goaway_after=goaway_after).start()
+            rows, elapsed, session_stats = crawl(carrier, server.base_url, http2, args.threads)
+            server.shutdown()
+            results[name] = rows
+            
+            s = server.stats
+            print(f"{name:<22} {elapsed:>6.2f}초 | 행 {len(rows):>6,} | "
+                  f"커넥션 h2 {s['h2_connections']} / h1 {s['h1_connections']} | "
+                  f"요청 h2 {s['h2_requests']:,} / h1 {s['h1_requests']:,} | 최대 동시 스트림 {s['max_streams']}"
+                  + (f" | 대체 {session_stats.get('fallbacks', 0):,}회" if goaway_after else ''))
+        
+        baseline = sorted(map(repr, results['HTTP/1.1']))
+        for name, rows in results.items():
+            same = sorted(map(repr, rows)) == baseline
+            print(f"   {'✅' if same else '❌'} {name}: HTTP/1.1 결과와 {'일치' if same else '불일치'}")
+        
+        backend.shutdown()
+
+
+if __name__ == "__main__":
+    main()
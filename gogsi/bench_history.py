@@ -0,0 +1,105 @@
+# =========================
+# 지원금 이력 저장소 점검 (합성 실행 누적 → 기간 조회 시간)
+# =========================
+import os
+import time
+import random
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+from history_store import HistoryStore
+
+
+SIGNUP_TYPES = ('기기변경', '번호이동', '신규가입')
+
+
+def synthetic_rows(carrier, devices, plans, terms, rng, amounts):
+    """
+    통신사 1곳 전체 수집 결과 (amounts: {키: 공시지원금}, 호출마다 일부 키 금액을 바꿈)
+    """
+    rows = []
+    for d in range(devices):
+        name = f"갤럭시 S{20 + d % 6} {d:03d}" if d % 2 == 0 else f"아이폰 {12 + d % 5} {d:03d}"
+        for p in range(plans):
+            for signup_type in SIGNUP_TYPES:
+                for term in terms:
+                    key = (d, p, signup_type, term)
+                    subsidy = amounts.setdefault(key, rng.randrange(10, 60) * 10000)
+                    if carrier == 'SKT':
+                        rows.append({
+                            '제조사': '삼성전자' if d % 2 == 0 else 'Apple', '단말명': name, '용량': '256GB',
+                            '요금제명': f"5GX 요금제 {p:02d}", '가입유형': signup_type, '약정기간': term,
+                            '출고가': 1200000, '공시지원금': subsidy, '추가지원금': subsidy * 15 // 100,
+                            '실구매가': 1200000 - subsidy * 115 // 100, '공시일': '2026-10-01'
+                        })
+                    else:
+                        rows.append({
+                            '요금제명': f"5G 요금제 {p:02d}", '요금제유형': '5G', '가입유형': signup_type, '약정': term,
+                            '모델명': name, '출고가': 1200000, '이통사지원금': subsidy,
+                            '추가지원금': subsidy * 15 // 100, '유통망지원금': 0, '지원금총액': subsidy * 115 // 100
+                        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="지원금 이력 저장소 점검 (합성 실행 누적 + 조회 시간)")
+    parser.add_argument('--days', type=int, default=30, help='누적할 실행 수 (하루 1회)')
+    parser.add_argument('--devices', type=int, default=60)
+    parser.add_argument('--plans', type=int, default=20)
+    parser.add_argument('--change-rate', type=float, default=0.02, help='실행마다 금액이 바뀌는 키 비율')
+    parser.add_argument('--repeat', type=int, default=20, help='조회 반복 횟수')
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    path = os.path.join(tempfile.mkdtemp(), 'history.sqlite')
+    store = HistoryStore(path)
+
+    carriers = {'SKT': ('12개월', '24개월'), 'LGU+': ('24개월',)}
+    amounts = {carrier: {} for carrier in carriers}
+    start_day = datetime(2026, 9, 1, 9, 0)
+
+    observed = 0
+    start = time.perf_counter()
+    for day in range(args.days):
+        for carrier, terms in carriers.items():
+            # 직전 실행 대비 일부 키 금액 변동
+            for key in rng.sample(sorted(amounts[carrier]), int(len(amounts[carrier]) * args.change_rate)):
+                amounts[carrier][key] += rng.choice((-5, 5, 10)) * 10000
+            
+            rows = synthetic_rows(carrier, args.devices, args.plans, terms, rng, amounts[carrier])
+            run_id = store.begin_run(carrier, start_day + timedelta(days=day))
+            store.append(run_id, rows)
+            store.finish_run(run_id)
+            observed += len(rows)
+    elapsed = time.perf_counter() - start
+
+    intervals = store.conn.execute("SELECT COUNT(*) FROM prices").fetchone()[0]
+    print(f"🗂️  누적: 실행 {args.days * len(carriers)}회 / 관찰 행 {observed:,} → 가격 구간 {intervals:,}개 "
+          f"({elapsed:.1f}초, {observed / elapsed:,.0f}행/초, 파일 {os.path.getsize(path) / 1024 / 1024:.1f}MB)\n")
+
+    month_start = (start_day + timedelta(days=args.days - 1)).strftime('%Y-%m-01')
+    queries = [
+        ("단말 + 가입유형 + 이번 달 (통신사 비교)", dict(device='S24', signup_type='번호이동', since=month_start)),
+        ("요금제 1개 전체 기간", dict(plan='요금제 07')),
+        ("통신사 + 가입유형 + 약정 + 이번 달", dict(carrier='SKT', signup_type='기기변경', term='24개월',
+                                           since=month_start)),
+        ("단말 1개 + 요금제 1개", dict(device='S22 002', plan='요금제 03')),
+    ]
+
+    for name, filters in queries:
+        timings = []
+        for _ in range(args.repeat):
+            t = time.perf_counter()
+            series = store.movements(**filters)
+            timings.append((time.perf_counter() - t) * 1000)
+        timings.sort()
+        changed = sum(1 for item in series if len(item['points']) > 1)
+        print(f"🔎 {name:<34} 키 {len(series):>6,} (변동 {changed:,}) | "
+              f"중앙값 {timings[len(timings) // 2]:.2f}ms / 최대 {timings[-1]:.2f}ms")
+
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
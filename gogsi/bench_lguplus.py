@@ -0,0 +1,326 @@
+# =========================
+# LG U+ 커넥션 재사용 벤치마크 (로컬 TLS 스텁 서버)
+# =========================
+import os
+import ssl
+import json
+import time
+import argparse
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+from lguplus_crawler import LGUplusCrawler
+
+
+class LGUplusStubHandler(BaseHTTPRequestHandler):
+    """
+    LG U+ API를 흉내내는 스텁 핸들러 (keep-alive 지원)
+    - /uhdc/fo/prdv/mdlbsufu/v1/mdlb-pp-list
+    - /uhdc/fo/prdv/mdlbsufu/v2/mdlb-sufu-list (pageNo / rowSize 페이징)
+    - model_counts가 있으면 요금제 번호 순서대로 돌아가며 요금제별 모델 수 지정 (없으면 모두 models개)
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    plans = 20
+    models = 25
+    model_counts = None
+    latency = 0.02
+    max_row_size = 50
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def models_for(self, plan_cd):
+        """
+        요금제 코드({그룹}P{번호}) → 모델 수
+        """
+        if not self.model_counts:
+            return self.models
+        return self.model_counts[int(plan_cd.rsplit('P', 1)[-1] or 0) % len(self.model_counts)]
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        qs = parse_qs(parsed.query)
+        
+        time.sleep(self.latency)
+        
+        if parsed.path.endswith('/mdlb-pp-list'):
+            grp = qs.get('hphnPpGrpKwrdCd', ['00'])[0]
+            detail = [
+                {'urcMblPpCd': f'{grp}P{i:03d}', 'urcMblPpNm': f'요금제 {grp}-{i}'}
+                for i in range(self.plans)
+            ]
+            self._send_json({'dvicMdlbSufuPpList': [{'dvicMdlbSufuPpDetlList': detail}]})
+        
+        elif parsed.path.endswith('/mdlb-sufu-list'):
+            plan_cd = qs.get('urcMblPpCd', [''])[0]
+            page_no = int(qs.get('pageNo', ['1'])[0])
+            # 실제 API처럼 rowSize 상한 적용
+            row_size = min(int(qs.get('rowSize', ['10'])[0]), self.max_row_size)
+            
+            total = self.models_for(plan_cd)
+            start = (page_no - 1) * row_size
+            end = min(start + row_size, total)
+            models = [
+                {
+                    'urcTrmMdlNm': f'모델 {plan_cd}-{m}',
+                    'dlvrPrc': 1000000 + m,
+                    'sixPlanPuanSuptAmt': 300000,
+                    'sixPlanAddSuptAmt': 45000,
+                    'dsnwSupportAmt': 0,
+                    'sixPlanSuptTamt': 345000,
+                    'basicPlanPuanSuptAmt': 250000,
+                    'basicPlanAddSuptAmt': 37500,
+                    'basicPlanSuptTamt': 287500
+                }
+                for m in range(start, end)
+            ]
+            self._send_json({'dvicMdlbSufuDtoList': models, 'totalCnt': total})
+        
+        else:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+
+class ExpiringClearanceHandler(LGUplusStubHandler):
+    """
+    expire_after번째 요청부터 기존 cf_clearance 쿠키를 Cloudflare 챌린지(403 + HTML)로 거부하는 스텁
+    - 새 쿠키 값(갱신된 쿠키)이면 정상 응답
+    """
+
+    expire_after = 100
+    served = 0
+    revoked = set()
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cookie = self.headers.get('Cookie', '')
+        value = next((part.split('=', 1)[1] for part in cookie.split('; ') if part.startswith('cf_clearance=')), '')
+        
+        cls = type(self)
+        with cls.lock:
+            cls.served += 1
+            if cls.served == cls.expire_after:
+                cls.revoked.add(value)
+            rejected = value in cls.revoked
+        
+        if not rejected:
+            return super().do_GET()
+        
+        body = (b'<!DOCTYPE html><html><head><title>Just a moment...</title></head>'
+                b'<body><script src="/cdn-cgi/challenge-platform/h/g/orchestrate/chl_page/v1"></script></body></html>')
+        self.send_response(403)
+        self.send_header('Content-Type', 'text/html; charset=UTF-8')
+        self.send_header('cf-mitigated', 'challenge')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def make_self_signed_cert(workdir):
+    """
+    openssl로 localhost용 자체 서명 인증서 생성
+    """
+    cert = os.path.join(workdir, 'cert.pem')
+    key = os.path.join(workdir, 'key.pem')
+    subprocess.run(
+        ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes',
+         '-keyout', key, '-out', cert, '-days', '1', '-subj', '/CN=127.0.0.1'],
+        check=True, capture_output=True
+    )
+    return cert, key
+
+
+def start_stub_server(latency=0.02, plans=20, models=25, max_row_size=50, tls=True,
+                      handler_cls=LGUplusStubHandler, model_counts=None):
+    """
+    (TLS) 스텁 서버를 백그라운드 스레드로 시작하고 (server, base_url) 반환
+    """
+    handler = type('Handler', (handler_cls,), {
+        'latency': latency,
+        'plans': plans,
+        'models': models,
+        'model_counts': model_counts,
+        'max_row_size': max_row_size
+    })
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    
+    scheme = 'http'
+    if tls:
+        cert, key = make_self_signed_cert(tempfile.mkdtemp())
+        ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        ctx.load_cert_chain(cert, key)
+        server.socket = ctx.wrap_socket(server.socket, server_side=True)
+        scheme = 'https'
+    
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"{scheme}://127.0.0.1:{server.server_address[1]}"
+
+
+# 병렬 페이징 점검용 요금제별 모델 수 (서버 rowSize 상한 아래 / 같음 / 위, 첫 요금제는 상한 바로 아래)
+PAGING_MODEL_COUNTS = (45, 3, 80, 12, 120, 50, 51, 100, 10, 99)
+
+
+def bench_paging(tasks, threads, page_concurrency, latency=0.02, max_row_size=50,
+                 model_counts=PAGING_MODEL_COUNTS):
+    """
+    순차 페이징 vs 병렬 페이징 (결과 동일 여부 확인)
+    - 요금제마다 모델 수가 다른 스텁 서버로 rowSize 탐색이 상한을 잘못 잡으면 불일치로 드러나게 함
+    """
+    server, base_url = start_stub_server(latency=latency, max_row_size=max_row_size, tls=False,
+                                         model_counts=model_counts)
+    results = {}
+    for mode in ('serial', 'concurrent'):
+        crawler = LGUplusCrawler(base_url=base_url, output_dir=tempfile.mkdtemp(),
+                                 paging=mode, page_concurrency=page_concurrency)
+        crawler.cookies = {'cf_clearance': 'stub'}
+        crawler.start_page_pool()
+        
+        def fetch_models(task):
+            try:
+                if mode == 'serial':
+                    return crawler.fetch_models_serial(
+                        crawler.get_session(), crawler.request_headers(),
+                        task['plan']['code'], task['signup_code']
+                    )
+                return crawler.fetch_models_concurrent(task['plan']['code'], task['signup_code'])
+            except Exception as e:
+                return f"❌ {e}"
+        
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            models = list(executor.map(fetch_models, tasks))
+        elapsed = time.perf_counter() - t0
+        
+        stats = crawler.connection_stats()
+        crawler.stop_page_pool()
+        crawler.close_sessions()
+        results[mode] = (elapsed, stats['requests'], models)
+    server.shutdown()
+    
+    same = results['serial'][2] == results['concurrent'][2]
+    if not same:
+        mismatched = [
+            (task['plan']['code'], serial, concurrent)
+            for task, serial, concurrent in zip(tasks, results['serial'][2], results['concurrent'][2])
+            if serial != concurrent
+        ]
+        for code, serial, concurrent in mismatched[:5]:
+            print(f"  ↳ {code}: 순차 {len(serial) if isinstance(serial, list) else serial} / "
+                  f"병렬 {len(concurrent) if isinstance(concurrent, list) else concurrent}")
+    print(f"순차 페이징: {results['serial'][0]:.2f}초, 요청 {results['serial'][1]:,}회")
+    print(f"병렬 페이징: {results['concurrent'][0]:.2f}초, 요청 {results['concurrent'][1]:,}회")
+    print(f"모델 목록 일치: {'✅' if same else '❌'}")
+    return same
+
+
+def bench_clearance(tasks, threads, latency, plans, models, paging):
+    """
+    실행 도중 통과 쿠키 만료 → 쿠키 갱신 + 재조회 후 결과 건수가 정상 실행과 같은지 확인
+    (브라우저 대신 새 쿠키 값을 돌려주는 함수로 갱신)
+    """
+    counts = {}
+    for expire_after in (None, len(tasks) // 2):
+        handler = type('Expiring', (ExpiringClearanceHandler,), {
+            'expire_after': expire_after or 10 ** 9, 'served': 0, 'revoked': set(), 'lock': threading.Lock()
+        })
+        server, base_url = start_stub_server(latency=latency, plans=plans, models=models, tls=False,
+                                             handler_cls=handler)
+        crawler = LGUplusCrawler(base_url=base_url, output_dir=tempfile.mkdtemp(), paging=paging)
+        crawler.cookies = {'cf_clearance': 'stub'}
+        refreshed = iter(range(1, 100))
+        crawler.fetch_fresh_cookies = lambda: {'cf_clearance': f"fresh-{next(refreshed)}"}
+        crawler.start_page_pool()
+        
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            rows = sum(len(r) for r in executor.map(crawler.fetch_subsidy_worker, tasks))
+        elapsed = time.perf_counter() - t0
+        
+        crawler.close()
+        server.shutdown()
+        counts[expire_after] = rows
+        label = f"{expire_after}번째 요청에서 쿠키 만료" if expire_after else "쿠키 만료 없음"
+        print(f"{label}: {elapsed:.2f}초, {rows:,}건")
+    
+    same = len(set(counts.values())) == 1
+    print(f"쿠키 갱신 후 결과 건수 일치: {'✅' if same else '❌'}")
+    return same
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LG U+ 세션 재사용 벤치마크")
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--plans', type=int, default=20, help='그룹당 요금제 수')
+    parser.add_argument('--models', type=int, default=25, help='요금제당 모델 수')
+    parser.add_argument('--max-row-size', type=int, default=50, help='스텁 서버 rowSize 상한')
+    parser.add_argument('--threads', type=int, default=5)
+    parser.add_argument('--page-concurrency', type=int, default=4)
+    args = parser.parse_args()
+    
+    server, base_url = start_stub_server(latency=args.latency, plans=args.plans, models=args.models,
+                                         max_row_size=args.max_row_size)
+    print(f"🧪 TLS 스텁 서버: {base_url}")
+    
+    crawler = LGUplusCrawler(base_url=base_url, output_dir=tempfile.mkdtemp())
+    crawler.cookies = {'cf_clearance': 'stub'}
+    plans = crawler.get_plan_codes()
+    tasks = [
+        {'plan': plan, 'signup_code': code, 'signup_name': name}
+        for plan in plans
+        for code, name in crawler.signup_type_map.items()
+    ]
+    
+    # 기존 방식 흉내: 작업마다 세션을 새로 만들고 닫음
+    def legacy_worker(task):
+        try:
+            return crawler.fetch_subsidy_worker(task)
+        finally:
+            crawler._local.session.close()
+            del crawler._local.session
+    
+    crawler.close_sessions()
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        legacy_rows = sum(len(r) for r in executor.map(legacy_worker, tasks))
+    legacy_time = time.perf_counter() - t0
+    crawler.close_sessions()
+    
+    # 공용 세션 방식
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        pooled_rows = sum(len(r) for r in executor.map(crawler.fetch_subsidy_worker, tasks))
+    pooled_time = time.perf_counter() - t0
+    stats = crawler.connection_stats()
+    crawler.close_sessions()
+    
+    print("\n" + "=" * 60)
+    print(f"작업마다 세션: {legacy_time:.2f}초, 핸드셰이크 ≥ {len(tasks):,}회, {legacy_rows:,}건")
+    print(f"스레드 세션:   {pooled_time:.2f}초, 핸드셰이크 {stats['connections']:,}회 "
+          f"(요청 {stats['requests']:,}회, {stats['handshakes_avoided']:,}회 절약), {pooled_rows:,}건")
+    print("-" * 60)
+    bench_paging(tasks, args.threads, args.page_concurrency, args.latency, args.max_row_size)
+    print("-" * 60)
+    bench_clearance(tasks, args.threads, args.latency, args.plans, args.models, 'serial')
+    print("=" * 60)
+    
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
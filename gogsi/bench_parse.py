@@ -0,0 +1,82 @@
+# =========================
+# SKT parseObject 추출 마이크로 벤치마크
+# =========================
+import os
+import glob
+import time
+import argparse
+
+import skt_crawler
+from skt_crawler import SKTStableCrawler, extract_parse_object
+from bench_skt import build_notice_html
+
+
+def load_fixtures(fixture_dir, count, devices, padding_kb):
+    """
+    저장된 /notice HTML 픽스처 로드 (없으면 합성 페이지 생성)
+    """
+    if fixture_dir:
+        paths = sorted(glob.glob(os.path.join(fixture_dir, '*.html')))
+        if paths:
+            fixtures = []
+            for path in paths:
+                with open(path, 'rb') as f:
+                    fixtures.append(f.read())
+            return fixtures
+        print(f"⚠️  {fixture_dir}에 *.html 픽스처가 없어 합성 페이지를 사용합니다")
+    
+    return [
+        build_notice_html(f'NA0000{i:04d}', devices, padding_kb).encode('utf-8')
+        for i in range(count)
+    ]
+
+
+def bench(label, func, fixtures, rounds):
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for body in fixtures:
+            func(body)
+    elapsed = time.perf_counter() - t0
+    per_page = elapsed / (rounds * len(fixtures)) * 1e6
+    print(f"{label:<28} {elapsed:7.3f}초  ({per_page:8.1f} µs/page)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="parseObject 추출 방식 비교")
+    parser.add_argument('--fixtures', help='저장된 /notice HTML 디렉토리 (*.html)')
+    parser.add_argument('--pages', type=int, default=50, help='합성 페이지 수')
+    parser.add_argument('--devices', type=int, default=40, help='페이지당 단말 수')
+    parser.add_argument('--padding-kb', type=int, default=200, help='합성 페이지 마크업 분량 (KB)')
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+    
+    fixtures = load_fixtures(args.fixtures, args.pages, args.devices, args.padding_kb)
+    total_kb = sum(len(b) for b in fixtures) / 1024
+    print(f"🧪 픽스처 {len(fixtures)}개 ({total_kb:,.0f} KB), {args.rounds}회 반복")
+    print(f"JSON 백엔드: {skt_crawler._json_loads.__module__}\n")
+    
+    crawler = SKTStableCrawler.__new__(SKTStableCrawler)
+    crawler.scrb_type_map = {'31': '기기변경', '32': '번호이동', '33': '신규가입'}
+    task = {'id': 'NA00000000', 'nm': '요금제', 'type': '31', 'month': '24'}
+    
+    # 결과 동일성 확인
+    for body in fixtures:
+        old = crawler.parse_subsidy_html(body.decode('utf-8'), task)
+        new = crawler.parse_subsidy_body(body, task)
+        if old != new:
+            print("❌ 추출 결과 불일치")
+            return
+    print("✅ 추출 결과 일치\n")
+    
+    regex_time = bench('정규식 (decode + re + json)', lambda b: crawler.parse_subsidy_html(b.decode('utf-8'), task),
+                       fixtures, args.rounds)
+    scan_time = bench('바이트 스캔 (slice + json)', lambda b: crawler.parse_subsidy_body(b, task),
+                      fixtures, args.rounds)
+    bench('  └ 추출만 (행 생성 제외)', extract_parse_object, fixtures, args.rounds)
+    
+    print(f"\n⚡ {regex_time / scan_time:.1f}배 빠름")
+
+
+if __name__ == "__main__":
+    main()
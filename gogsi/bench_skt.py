@@ -0,0 +1,254 @@
+# =========================
+# SKT 크롤러 엔진 벤치마크 (로컬 스텁 서버)
+# =========================
+import json
+import time
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+from skt_crawler import SKTStableCrawler
+
+
+def build_notice_html(prod_id, devices=30, padding_kb=0):
+    """
+    parseObject([...])가 들어있는 /notice 유사 HTML 생성
+    - padding_kb: 실제 페이지처럼 앞뒤에 붙는 마크업 분량 (KB)
+    """
+    items = [
+        {
+            'companyNm': '삼성전자',
+            'productNm': f'갤럭시 {prod_id}-{d}',
+            'productMem': '256GB',
+            'factoryPrice': 1200000,
+            'telecomSaleAmt': 500000 + d,
+            'selDsnetSupmAmt': 75000,
+            'price': 625000 - d,
+            'effStaDt': '2026-01-01'
+        }
+        for d in range(devices)
+    ]
+    padding = '<div class="item">공시지원금 안내 [1] (2);</div>\n' * (padding_kb * 1024 // 60)
+    return (
+        '<html><head><title>T world</title></head><body>\n'
+        f'{padding}'
+        '<script>\n'
+        f'var list = parseObject({json.dumps(items, ensure_ascii=False)});\n'
+        '</script>\n'
+        f'{padding}'
+        '</body></html>'
+    )
+
+
+class SKTStubHandler(BaseHTTPRequestHandler):
+    """
+    T월드 API를 흉내내는 스텁 핸들러
+    - /api/wireless/subscription/category
+    - /api/wireless/subscription/list
+    - /notice (parseObject([...]) 포함 HTML)
+    """
+
+    # 서버 단위 설정 (start_stub_server에서 주입)
+    categories = 4
+    plans_per_category = 10
+    devices = 30
+    padding_kb = 0
+    latency = 0.05
+    max_in_flight = 0          # 0보다 크면 동시 /notice 요청이 이 값을 넘을 때 429 응답
+    
+    # 의도적 스로틀링 상태 (서버 단위 공유)
+    in_flight = 0
+    throttled = 0
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        # 요청 로그 출력 생략
+        pass
+
+    def _send(self, body, content_type):
+        data = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        qs = parse_qs(parsed.query)
+        
+        if parsed.path == '/notice':
+            # 처리 중인 /notice 요청 수 집계 (지연 구간 포함)
+            cls = type(self)
+            with cls.lock:
+                cls.in_flight += 1
+                over = self.max_in_flight and cls.in_flight > self.max_in_flight
+                if over:
+                    cls.throttled += 1
+            try:
+                self._notice(qs, over)
+            finally:
+                with cls.lock:
+                    cls.in_flight -= 1
+            return
+        
+        # 원격 서버 응답 지연 흉내
+        time.sleep(self.latency)
+        
+        if parsed.path == '/api/wireless/subscription/category':
+            content = [{'categoryId': f'C{i}'} for i in range(self.categories)]
+            self._send(json.dumps({'content': content}), 'application/json')
+        
+        elif parsed.path == '/api/wireless/subscription/list':
+            cat_id = qs.get('categoryId', [''])[0]
+            content = [
+                {'subscriptionId': f'{cat_id}-P{i}', 'subscriptionNm': f'요금제 {cat_id}-{i}'}
+                for i in range(self.plans_per_category)
+            ]
+            self._send(json.dumps({'content': content}, ensure_ascii=False), 'application/json')
+        
+        else:
+            self.send_response(404)
+            self.end_headers()
+
+    def _notice(self, qs, throttled):
+        time.sleep(self.latency)
+        
+        if throttled:
+            self.send_response(429)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        
+        prod_id = qs.get('prodId', [''])[0]
+        self._send(build_notice_html(prod_id, self.devices, self.padding_kb), 'text/html; charset=utf-8')
+
+
+def start_stub_server(latency=0.05, categories=4, plans_per_category=10, devices=30, max_in_flight=0,
+                      padding_kb=0, handler_cls=SKTStubHandler):
+    """
+    스텁 서버를 백그라운드 스레드로 시작하고 (server, base_url) 반환
+    """
+    handler = type('Handler', (handler_cls,), {
+        'latency': latency,
+        'categories': categories,
+        'plans_per_category': plans_per_category,
+        'devices': devices,
+        'padding_kb': padding_kb,
+        'max_in_flight': max_in_flight,
+        'in_flight': 0,
+        'throttled': 0,
+        'lock': threading.Lock()
+    })
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _row_key(row):
+    return tuple(sorted(row.items()))
+
+
+def check_async_worker_failure(base_url, concurrency=4, fail_at=2, timeout=10):
+    """
+    비동기 엔진 워커가 예외로 끝나도 collect_async가 멈추지 않고 그 예외를 다시 발생시키는지 확인
+    - fail_at번째 fetch_subsidy_async 호출에서 RuntimeError 발생, timeout초 안에 끝나야 통과
+    """
+    import asyncio
+    import tempfile
+    
+    crawler = SKTStableCrawler(base_url=base_url, output_dir=tempfile.mkdtemp())
+    tasks = crawler.build_tasks()
+    fetch = crawler.fetch_subsidy_async
+    calls = 0
+    
+    async def failing_fetch(client, task):
+        nonlocal calls
+        calls += 1
+        if calls == fail_at:
+            raise RuntimeError('워커 예외 주입')
+        return await fetch(client, task)
+    
+    crawler.fetch_subsidy_async = failing_fetch
+    try:
+        asyncio.run(asyncio.wait_for(crawler.collect_async(tasks, concurrency=concurrency), timeout))
+    except RuntimeError:
+        return True
+    except asyncio.TimeoutError:
+        print(f"❌ 워커 예외 후 {timeout}초 안에 끝나지 않음")
+        return False
+    print("❌ 워커 예외가 다시 발생하지 않음")
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SKT 스레드/비동기 엔진 벤치마크")
+    parser.add_argument('--latency', type=float, default=0.05, help='스텁 응답 지연 (초)')
+    parser.add_argument('--categories', type=int, default=4)
+    parser.add_argument('--plans', type=int, default=10, help='카테고리당 요금제 수')
+    parser.add_argument('--threads', type=int, default=5)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--throttle-above', type=int, default=0,
+                        help='동시 /notice 요청이 이 값을 넘으면 스텁이 429 응답 (0: 끔)')
+    parser.add_argument('--adaptive-max', type=int, default=0,
+                        help='적응형(AIMD) 스레드 엔진도 측정 (동시성 상한, 0: 생략)')
+    args = parser.parse_args()
+    
+    server, base_url = start_stub_server(
+        latency=args.latency,
+        categories=args.categories,
+        plans_per_category=args.plans,
+        max_in_flight=args.throttle_above
+    )
+    handler = server.RequestHandlerClass
+    print(f"🧪 스텁 서버: {base_url}")
+    
+    import tempfile
+    crawler = SKTStableCrawler(base_url=base_url, output_dir=tempfile.mkdtemp())
+    tasks = crawler.build_tasks()
+    print(f"✅ 총 {len(tasks)}개 작업\n")
+    
+    t0 = time.perf_counter()
+    thread_rows = crawler.collect(tasks, max_threads=args.threads)
+    thread_time = time.perf_counter() - t0
+    thread_429, handler.throttled = handler.throttled, 0
+    
+    import asyncio
+    t0 = time.perf_counter()
+    async_rows = asyncio.run(crawler.collect_async(tasks, concurrency=args.concurrency))
+    async_time = time.perf_counter() - t0
+    async_429, handler.throttled = handler.throttled, 0
+    
+    adaptive = None
+    if args.adaptive_max:
+        from rate_limit import AIMDController
+        controller = AIMDController(initial=args.threads, max_limit=args.adaptive_max)
+        adaptive_crawler = SKTStableCrawler(base_url=base_url, output_dir=tempfile.mkdtemp(),
+                                            controller=controller)
+        t0 = time.perf_counter()
+        adaptive_rows = adaptive_crawler.collect(tasks)
+        adaptive = (time.perf_counter() - t0, adaptive_rows, handler.throttled, controller)
+    
+    same = (sorted(map(_row_key, thread_rows.iter_dicts()))
+            == sorted(map(_row_key, async_rows.iter_dicts())))
+    
+    print("\n" + "=" * 60)
+    print(f"스레드 ({args.threads}개): {thread_time:.2f}초, {len(tasks)/thread_time:.1f} tasks/s, "
+          f"{len(thread_rows):,}건, 429 {thread_429:,}회")
+    print(f"비동기 (동시 {args.concurrency}): {async_time:.2f}초, {len(tasks)/async_time:.1f} tasks/s, "
+          f"{len(async_rows):,}건, 429 {async_429:,}회")
+    if adaptive:
+        elapsed, rows, throttled, controller = adaptive
+        print(f"적응형 (상한 {args.adaptive_max}): {elapsed:.2f}초, {len(tasks)/elapsed:.1f} tasks/s, "
+              f"{len(rows):,}건, 429 {throttled:,}회, 최종 {controller.status()}")
+    print(f"결과 일치: {'✅' if same else '❌'}")
+    print(f"워커 예외 전파: {'✅' if check_async_worker_failure(base_url) else '❌'}")
+    print("=" * 60)
+    
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+# =========================
+# 크롤러 처리량 벤치마크 모음 (녹화 응답 재생 서버)
+# =========================
+import os
+import io
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import contextlib
+import multiprocessing
+from queue import Empty
+
+from replay import FixtureRecorder, start_replay_server
+
+# getrusage는 유닉스 전용 (Windows에서는 CPU 시간만 process_time으로, RSS는 생략)
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# (통신사, 엔진) 조합 - 엔진별 동시성 값은 --concurrency 목록 전체를 순회
+ENGINES = {
+    'skt': ('thread', 'async'),
+    'lguplus': ('serial', 'concurrent')
+}
+
+
+def make_crawler(carrier, engine, base_url, output_dir, parse_processes=0):
+    """
+    재생 서버를 바라보는 크롤러 생성 (카탈로그 캐시 미사용)
+    """
+    if carrier == 'skt':
+        from skt_crawler import SKTStableCrawler
+        crawler = SKTStableCrawler(base_url=base_url, output_dir=output_dir)
+    else:
+        from lguplus_crawler import LGUplusCrawler
+        crawler = LGUplusCrawler(base_url=base_url, output_dir=output_dir, paging=engine)
+        crawler.cookies = {'cf_clearance': 'replay'}
+
+    crawler.catalog_cache_path = None
+    crawler.parse_processes = parse_processes
+    return crawler
+
+
+def record_synthetic(path, categories=4, plans=10, devices=30, lg_plans=20, lg_models=25, padding_kb=0):
+    """
+    bench_skt / bench_lguplus 스텁 서버를 실제 사이트 대신 녹화해 합성 녹화 파일 생성
+    (실제 녹화본이 없을 때 벤치마크용, padding_kb: /notice 페이지 마크업 분량)
+    """
+    from bench_skt import start_stub_server as start_skt_stub
+    from bench_lguplus import start_stub_server as start_lguplus_stub
+
+    skt_server, skt_url = start_skt_stub(latency=0, categories=categories,
+                                         plans_per_category=plans, devices=devices,
+                                         padding_kb=padding_kb)
+    lg_server, lg_url = start_lguplus_stub(latency=0, plans=lg_plans, models=lg_models, tls=False)
+
+    recorder = FixtureRecorder(path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for carrier, base_url in (('skt', skt_url), ('lguplus', lg_url)):
+            crawler = make_crawler(carrier, 'serial', base_url, tempfile.mkdtemp())
+            crawler.recorder = recorder
+            crawler.collect(crawler.build_tasks(crawler.discover_catalog()))
+            crawler.close()
+    recorder.close()
+
+    skt_server.shutdown()
+    lg_server.shutdown()
+    return recorder.count
+
+
+def run_config(carrier, engine, concurrency, parse_processes, base_url, queue):
+    """
+    별도 프로세스에서 한 가지 설정 실행 (CPU 시간 / 최대 RSS 분리 측정)
+    - 작업 지연: 작업 1건의 조회 시간 (async는 파싱 포함, LG U+는 페이지 전체 포함)
+    - 파싱 프로세스를 쓰면 CPU 시간은 자식 프로세스 합산, RSS는 가장 큰 자식 RSS를 더함
+    """
+    import asyncio
+
+    crawler = make_crawler(carrier, engine, base_url, tempfile.mkdtemp(), parse_processes)
+    latencies = []
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        tasks = crawler.build_tasks(crawler.discover_catalog())
+
+    if engine == 'async':
+        fetch_async = crawler.fetch_subsidy_async
+        slots = None
+
+        async def timed_async(client, task):
+            # 커넥터 대기 시간은 빼고 측정 (스레드 엔진의 작업 대기열과 같은 기준)
+            nonlocal slots
+            slots = slots or asyncio.Semaphore(concurrency)
+            async with slots:
+                start = time.perf_counter()
+                try:
+                    return await fetch_async(client, task)
+                finally:
+                    latencies.append(time.perf_counter() - start)
+        
+        crawler.fetch_subsidy_async = timed_async
+    else:
+        fetch_payload = crawler.fetch_payload
+
+        def timed(task):
+            start = time.perf_counter()
+            try:
+                return fetch_payload(task)
+            finally:
+                latencies.append(time.perf_counter() - start)
+        
+        crawler.fetch_payload = timed
+
+    cpu_start, _ = resource_usage(parse_processes)
+    t0 = time.perf_counter()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        if engine == 'async':
+            rows = asyncio.run(crawler.collect_async(tasks, concurrency=concurrency))
+        else:
+            rows = crawler.collect(tasks, max_threads=concurrency)
+            crawler.close()
+
+    elapsed = time.perf_counter() - t0
+    cpu_end, peak_rss = resource_usage(parse_processes)
+
+    queue.put({
+        'carrier': carrier,
+        'engine': engine,
+        'concurrency': concurrency,
+        'parse_processes': parse_processes,
+        'tasks': len(tasks),
+        'rows': len(rows),
+        'elapsed': elapsed,
+        'tasks_per_sec': len(tasks) / elapsed if elapsed else 0.0,
+        'latency': percentiles(latencies),
+        'cpu_sec': cpu_end - cpu_start,
+        'peak_rss_mb': peak_rss
+    })
+
+
+def resource_usage(parse_processes):
+    """
+    (누적 CPU 초, 최대 RSS MB) - 파싱 프로세스를 쓰면 자식 프로세스 RSS도 합산
+    - resource 모듈이 없으면(Windows) CPU는 이 프로세스만, RSS는 None
+    """
+    if resource is None:
+        return time.process_time(), None
+    
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu = usage.ru_utime + usage.ru_stime + children.ru_utime + children.ru_stime
+    # 리눅스 ru_maxrss 단위는 KB
+    return cpu, (usage.ru_maxrss + (children.ru_maxrss if parse_processes else 0)) / 1024
+
+
+def wait_result(proc, queue, poll=1.0):
+    """
+    설정 실행 프로세스의 결과 대기 (결과 없이 종료되면 None)
+    - 자식이 죽어도(import 오류 / OOM / segfault) 전체 벤치마크가 멈추지 않도록 poll초마다 생존 확인
+    """
+    while True:
+        try:
+            return queue.get(timeout=poll)
+        except Empty:
+            if proc.is_alive():
+                continue
+        
+        # 종료 직전에 넣은 결과가 아직 파이프에 남아 있을 수 있음
+        try:
+            return queue.get(timeout=poll)
+        except Empty:
+            return None
+
+
+def percentiles(values):
+    """
+    p50 / p95 / p99 (밀리초)
+    """
+    if len(values) < 2:
+        value = values[0] * 1000 if values else 0.0
+        return {'p50': value, 'p95': value, 'p99': value}
+
+    q = statistics.quantiles(values, n=100, method='inclusive')
+    return {'p50': q[49] * 1000, 'p95': q[94] * 1000, 'p99': q[98] * 1000}
+
+
+def parse_crossover(results):
+    """
+    (통신사, 엔진)별로 파싱 프로세스가 같은 파싱 안 함 설정보다 빨라지는 가장 낮은 동시성
+    → [(통신사, 엔진, 동시성 또는 None, 파싱 프로세스 수, 처리량 비율), ...]
+    """
+    groups = {}
+    for r in results:
+        groups.setdefault((r['carrier'], r['engine']), {}).setdefault(r['concurrency'], {})[
+            r['parse_processes']] = r['tasks_per_sec']
+
+    crossover = []
+    for (carrier, engine), by_concurrency in groups.items():
+        found = None
+        for concurrency in sorted(by_concurrency):
+            runs = by_concurrency[concurrency]
+            pooled = {p: tps for p, tps in runs.items() if p > 0}
+            if 0 not in runs or not pooled:
+                continue
+            best = max(pooled, key=pooled.get)
+            if pooled[best] > runs[0]:
+                found = (carrier, engine, concurrency, best, pooled[best] / runs[0] if runs[0] else 0.0)
+                break
+        
+        if found is None and any(p > 0 for runs in by_concurrency.values() for p in runs):
+            found = (carrier, engine, None, 0, 0.0)
+        if found is not None:
+            crossover.append(found)
+    return crossover
+
+
+def main():
+    parser = argparse.ArgumentParser(description="녹화 응답 재생 기반 크롤러 처리량 벤치마크")
+    parser.add_argument('--fixtures', help='녹화 파일 (.jsonl.gz, 없으면 스텁 서버로 합성)')
+    parser.add_argument('--carriers', nargs='+', choices=list(ENGINES), default=list(ENGINES))
+    parser.add_argument('--engines', nargs='+', help='측정할 엔진 (기본: 통신사별 전체)')
+    parser.add_argument('--concurrency', default='5,10,20', help='동시성 값 목록 (쉼표 구분)')
+    parser.add_argument('--parse-processes', default='0',
+                        help='SKT 파싱 프로세스 수 목록 (쉼표 구분, 예: 0,2,4 - 0은 프로세스 풀 없음)')
+    parser.add_argument('--padding-kb', type=int, default=0, help='합성 /notice 페이지 마크업 분량 (KB)')
+    parser.add_argument('--latency', type=float, default=0.03, help='재생 응답 지연 (초)')
+    parser.add_argument('--jitter', type=float, default=0.02, help='재생 응답 지연 무작위 추가분 상한 (초)')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='429 응답 확률')
+    parser.add_argument('--max-in-flight', type=int, default=0, help='동시 요청 상한 (초과 시 429, 0: 끔)')
+    parser.add_argument('--json', help='결과를 JSON 파일로 저장 (회귀 비교용)')
+    args = parser.parse_args()
+
+    fixture_path = args.fixtures
+    if fixture_path is None:
+        fixture_path = os.path.join(tempfile.mkdtemp(), 'synthetic.jsonl.gz')
+        count = record_synthetic(fixture_path, padding_kb=args.padding_kb)
+        print(f"📼 합성 녹화 파일: {count:,}개 응답")
+
+    server, base_url = start_replay_server(
+        fixture_path, latency=args.latency, jitter=args.jitter,
+        throttle_rate=args.throttle_rate, max_in_flight=args.max_in_flight
+    )
+    stats = server.RequestHandlerClass.stats
+    print(f"🧪 재생 서버: {base_url} (지연 {args.latency*1000:.0f}ms + 지터 ≤{args.jitter*1000:.0f}ms)\n")
+
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    results = []
+    failed = []
+
+    print(f"🖥️  CPU 코어: {os.cpu_count()}개\n")
+    print(f"{'통신사':<9}{'엔진':<12}{'동시성':>6}{'파싱P':>6}{'tasks/s':>10}{'p50(ms)':>10}{'p95(ms)':>10}"
+          f"{'p99(ms)':>10}{'CPU(초)':>9}{'RSS(MB)':>9}{'429':>6}{'행':>9}")
+
+    for carrier in args.carriers:
+        for engine in ENGINES[carrier]:
+            if args.engines and engine not in args.engines:
+                continue
+            
+            # 파싱 프로세스 풀은 SKT(/notice HTML)만 지원
+            parse_counts = list(map(int, args.parse_processes.split(','))) if carrier == 'skt' else [0]
+            
+            for concurrency in map(int, args.concurrency.split(',')):
+                for parse_processes in parse_counts:
+                    stats.clear()
+                    proc = ctx.Process(target=run_config,
+                                       args=(carrier, engine, concurrency, parse_processes, base_url, queue))
+                    proc.start()
+                    result = wait_result(proc, queue)
+                    proc.join()
+                    
+                    if result is None:
+                        failed.append((carrier, engine, concurrency, parse_processes, proc.exitcode))
+                        print(f"{carrier:<9}{engine:<12}{concurrency:>6}{parse_processes:>6}  "
+                              f"❌ 결과 없이 종료 (종료 코드 {proc.exitcode})")
+                        continue
+                    
+                    result['throttled'] = stats.get('throttled', 0)
+                    result['missing'] = stats.get('missing', 0)
+                    results.append(result)
+                    
+                    lat = result['latency']
+                    rss = result['peak_rss_mb']
+                    print(f"{carrier:<9}{engine:<12}{concurrency:>6}{parse_processes:>6}"
+                          f"{result['tasks_per_sec']:>10.1f}"
+                          f"{lat['p50']:>10.1f}{lat['p95']:>10.1f}{lat['p99']:>10.1f}"
+                          f"{result['cpu_sec']:>9.2f}{'-' if rss is None else f'{rss:.1f}':>9}"
+                          f"{result['throttled']:>6}{result['rows']:>9,}")
+
+    for carrier, engine, concurrency, processes, ratio in parse_crossover(results):
+        if concurrency is None:
+            print(f"\n🔀 {carrier}/{engine}: 측정한 동시성 범위에서는 파싱 프로세스가 더 느림")
+        else:
+            print(f"\n🔀 {carrier}/{engine}: 동시성 {concurrency}부터 파싱 프로세스 {processes}개가 유리 "
+                  f"(처리량 ×{ratio:.2f})")
+
+    if failed:
+        print(f"\n❌ 실패한 설정 {len(failed)}개:")
+        for carrier, engine, concurrency, parse_processes, exitcode in failed:
+            print(f"   ↳ {carrier}/{engine} 동시성 {concurrency}, 파싱 프로세스 {parse_processes} "
+                  f"(종료 코드 {exitcode})")
+
+    missing = sum(r['missing'] for r in results)
+    if missing:
+        print(f"\n⚠️  녹화에 없는 요청 {missing:,}회 (404) - 녹화 파일이 현재 크롤러 요청과 맞지 않음")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 결과 저장: {args.json}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# =========================
+# 결과 저장 방식 벤치마크 (최대 RSS / 저장 시간)
+# =========================
+import os
+import time
+import argparse
+import resource
+import tempfile
+import multiprocessing
+
+from records import ColumnBuffer
+from writers import WRITER_FORMATS
+from skt_crawler import SKTStableCrawler
+
+
+def synthetic_rows(count):
+    """
+    SKT 결과와 같은 형태의 행을 하나씩 생성
+    """
+    scrb_types = ('기기변경', '번호이동', '신규가입')
+    for i in range(count):
+        yield {
+            '제조사': '삼성전자' if i % 3 else 'Apple',
+            '단말명': f'갤럭시 S24 {i % 120}',
+            '용량': '256GB',
+            '요금제명': f'5GX 프라임 {i // 720}',
+            '가입유형': scrb_types[i % 3],
+            '약정기간': '24개월' if i % 2 else '12개월',
+            '출고가': 1155000,
+            '공시지원금': 500000 + i % 1000,
+            '추가지원금': 75000,
+            '실구매가': 580000 - i % 1000,
+            '공시일': '2026-10-18'
+        }
+
+
+def peak_rss_mb():
+    # 리눅스 ru_maxrss 단위는 KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_mode(mode, rows, batch, out_dir, queue):
+    """
+    별도 프로세스에서 한 가지 저장 방식 실행 (최대 RSS 분리 측정)
+    """
+    base_rss = peak_rss_mb()
+    t0 = time.perf_counter()
+    path = None
+    
+    if mode == 'dicts':
+        # 행 보관 비교: dict 목록
+        data = list(synthetic_rows(rows))
+    elif mode == 'columns':
+        # 행 보관 비교: 컬럼 버퍼 (사전 인코딩 문자열 + 정수 배열)
+        data = ColumnBuffer(SKTStableCrawler.COLUMNS)
+        data.append_dicts(synthetic_rows(rows))
+    elif mode == 'pandas':
+        # 기존 방식: 전체 행 목록 → DataFrame → to_excel
+        import pandas as pd
+        data = list(synthetic_rows(rows))
+        path = os.path.join(out_dir, 'pandas.xlsx')
+        pd.DataFrame(data).to_excel(path, index=False)
+    else:
+        writer_cls, ext = WRITER_FORMATS[mode]
+        path = os.path.join(out_dir, f'stream.{ext}')
+        writer = writer_cls(path)
+        chunk = []
+        for row in synthetic_rows(rows):
+            chunk.append(row)
+            if len(chunk) >= batch:
+                writer.write_rows(chunk)
+                chunk = []
+        writer.write_rows(chunk)
+        writer.close()
+    
+    elapsed = time.perf_counter() - t0
+    size = os.path.getsize(path) / 1024 / 1024 if path else 0.0
+    queue.put((mode, elapsed, peak_rss_mb() - base_rss, size))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="결과 저장 방식 비교")
+    parser.add_argument('--rows', type=int, default=200000, help='행 수 (현재 실행의 약 10배)')
+    parser.add_argument('--batch', type=int, default=40, help='작업 1건당 행 수')
+    parser.add_argument('--modes', default='dicts,columns,pandas,xlsx,csv,parquet')
+    args = parser.parse_args()
+    
+    out_dir = tempfile.mkdtemp()
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    
+    print(f"🧪 {args.rows:,}행 저장 비교\n")
+    print(f"{'방식':<10}{'시간(초)':>10}{'RSS 증가(MB)':>16}{'파일(MB)':>12}")
+    
+    for mode in args.modes.split(','):
+        proc = ctx.Process(target=run_mode, args=(mode, args.rows, args.batch, out_dir, queue))
+        proc.start()
+        mode, elapsed, rss, size = queue.get()
+        proc.join()
+        print(f"{mode:<10}{elapsed:>10.2f}{rss:>16.1f}{size:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,11 +15,8 @@ if %errorlevel% neq 0 (
     exit /b 1
 )
 echo.
-echo [1/2] LG U+ 크롤러 실행 중...
-podman run --rm -v ./output:/app/output -v ./lguplus_crawler.py:/app/lguplus_crawler.py --shm-size=2g gongsi-crawler python lguplus_crawler.py
-
-echo [2/2] SKT 크롤러 실행 중...
-podman run --rm -v ./output:/app/output -v ./skt_crawler.py:/app/skt_crawler.py gongsi-crawler python skt_crawler.py
+echo SKT + LG U+ 통합 크롤러 실행 중...
+podman run --rm -v ./output:/app/output --shm-size=2g gongsi-crawler python -u orchestrator.py
 
 
 echo.
@@ -0,0 +1,770 @@
+# =========================
+# 통신사 플러그인 인터페이스
+# =========================
+import os
+import json
+import time
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+from dead_letter import DeadLetterQueue, TaskFailure, failure_kind
+from journal import TaskJournal
+from pipeline import Pipeline
+from scheduler import ScheduledStream
+from tables import DedupWriter
+from writers import open_writer
+
+
+class CarrierPlugin:
+    """
+    통신사 크롤러 공통 인터페이스
+    - 하위 클래스 구현: catalog_groups / fetch_catalog_group / build_tasks / fetch / parse / store_keys
+    - 공통 제공: 카탈로그 병렬 조회 + 캐시 / 단계별 파이프라인(iter_results) / 증분 수집 처리
+    - 오케스트레이터(orchestrator.py)는 이 인터페이스만 사용하므로
+      새 통신사는 이 클래스를 상속해 위 메서드만 구현하면 됨
+    """
+
+    # 통신사 이름 / 결과 컬럼 [(컬럼명, 'str' | 'int'), ...]
+    CARRIER = None
+    COLUMNS = ()
+
+    # 증분 수집 시 단말 식별 컬럼 / 변동 기록 금액 컬럼
+    STORE_DEVICE_FIELDS = ()
+    STORE_AMOUNT_FIELD = None
+
+    # 표 키 컬럼 (요금제 / 가입유형 / 약정 등, 나머지 컬럼이 같은 표는 1번만 저장)
+    TABLE_KEY_FIELDS = ()
+
+    # 선택 구성 요소 (하위 클래스 __init__에서 설정)
+    store = None
+    controller = None
+    recorder = None
+    _run_id = None
+
+    # 지원금 이력 저장소 (history_store.HistoryStore, 실행마다 원본 행을 가격 구간으로 누적)
+    history = None
+    _history_run = None
+
+    # 결과 파일을 고유 표 + 색인으로 나눠 저장 (tables.DedupWriter)
+    dedup_output = False
+
+    # 변동 빈도 기반 작업 순서 (scheduler.ChangeScheduler, 증분 저장소가 있을 때만 사용)
+    # 실행 중 핫 작업 결과는 조기 스냅샷 파일로 먼저 저장
+    scheduler = None
+    _early = None
+
+    # 실행 계측 (metrics.RunMetrics, 하위 클래스 __init__에서 생성) / OpenMetrics 파일도 저장할지
+    metrics = None
+    openmetrics = False
+
+    # 체크포인트 저널 (journal.TaskJournal, 실행 중에만 열림)
+    journal = None
+    journal_path = None
+
+    # 요금제 카탈로그 캐시 (경로가 None이면 캐시 미사용)
+    catalog_cache_path = None
+    catalog_cache_ttl = 6 * 3600
+    catalog_workers = 4
+
+    # 직전 카탈로그 조회에서 실패한 그룹 (그룹 키 → 실패 분류, '*' = 그룹 목록 자체 실패)
+    catalog_failures = {}
+
+    # 수집 파이프라인 (pipeline.Pipeline, 실행 중에만 설정) / 파싱 스레드 수 / 단계 간 큐 크기 (None: 조회 스레드 × 2)
+    pipeline = None
+    parse_workers = 1
+    queue_size = None
+
+    # 파싱 프로세스 수 (0: 파싱 스레드에서 직접 파싱, process_parser를 구현한 통신사만 적용)
+    parse_processes = 0
+    _parse_pool = None
+
+    # HTTP/2 다중화 전송 (h2_transport.H2Session, 하위 클래스 __init__의 http2 인자) / 호스트당 커넥션 수
+    http2 = False
+    http2_connections = 2
+
+    # 실패 작업 재시도
+    # - 요청 단위 재시도는 짧게 (inline_retries회, backoff_factor inline_backoff) 해서 본 수집을 붙잡지 않고
+    # - 그래도 실패한 작업은 dead-letter 큐(dead_letter.DeadLetterQueue)에 모아 본 수집이 끝난 뒤
+    #   retry_backoff × 2^(n-1)초 대기 후 스레드 retry_workers개로 retry_passes회 재시도
+    # - 실패한 카탈로그 그룹도 같은 간격으로 retry_passes회 재조회 (iter_catalog)
+    inline_retries = 2
+    inline_backoff = 0.5
+    retry_passes = 2
+    retry_backoff = 5.0
+    retry_workers = 2
+    dead_letter = None
+
+    # ==========================================================
+    # 하위 클래스 구현
+    # ==========================================================
+    def prepare(self):
+        """
+        수집 전 준비 (쿠키 획득 등), 실패 시 False
+        """
+        return True
+
+    def catalog_groups(self):
+        """
+        카탈로그 그룹 목록 (요금제 카테고리 등, 그룹 단위로 병렬 조회, 실패 시 예외)
+        """
+        raise NotImplementedError
+
+    def catalog_group_key(self, group):
+        """
+        캐시 키로 쓸 그룹 식별자
+        """
+        return str(group)
+
+    def fetch_catalog_group(self, group):
+        """
+        그룹 1개의 요금제 목록 조회
+        - 빈 목록은 요금제가 없는 그룹, 조회 실패는 예외 (빈 목록과 구분해야 미완료 카탈로그를 알 수 있음)
+        """
+        raise NotImplementedError
+
+    def build_tasks(self, catalog):
+        """
+        요금제 목록 → 조회 작업 목록
+        """
+        raise NotImplementedError
+
+    def fetch(self, task):
+        """
+        작업 1건 조회 → 원본 응답 (실패 시 None)
+        """
+        raise NotImplementedError
+
+    def parse(self, task, payload):
+        """
+        원본 응답 → 결과 행 목록 (dict)
+        """
+        raise NotImplementedError
+
+    def process_parser(self):
+        """
+        파싱 프로세스 풀에서 실행할 (모듈 함수, 추가 인자), 미지원 시 None
+        - func(task, payload, *args) → 행 목록 (parseObject 등이 비었으면 None)
+        """
+        return None
+
+    def store_keys(self, task):
+        """
+        증분 저장소 키 목록 [(요금제 ID, 가입유형, 약정), ...]
+        """
+        raise NotImplementedError
+
+    def split_for_store(self, task, rows):
+        """
+        결과 행을 저장소 키별로 분배 (키가 여러 개면 하위 클래스에서 재정의)
+        """
+        return [(self.store_keys(task)[0], rows)]
+
+    def close(self):
+        """
+        수집 종료 후 정리 (세션/풀 종료 등)
+        """
+
+    # ==========================================================
+    # 요금제 카탈로그 (그룹 병렬 조회 + 디스크 캐시)
+    # ==========================================================
+    def iter_catalog(self):
+        """
+        그룹별 요금제 목록을 도착 순서대로 반환
+        - 캐시가 TTL 이내이고 그룹 구성이 현재와 같으면 캐시 사용
+        - 아니면 그룹을 병렬 조회하고, 모든 그룹이 성공했을 때만 캐시 저장
+        - 실패한 그룹(그룹 목록 포함)은 실패 작업과 같은 간격으로 retry_passes회 재조회
+          (요청 단위 재시도가 짧아 잠깐의 5xx에도 그룹 전체가 빠지지 않도록)
+        - 끝까지 실패한 그룹은 건너뛰지 않고 catalog_failures에 기록 (카탈로그 미완료)
+        """
+        self.catalog_failures = {}
+        
+        for attempt in range(self.retry_passes + 1):
+            try:
+                with self.metrics.stage('catalog'):
+                    groups = self.catalog_groups()
+                break
+            except Exception as e:
+                self.catalog_group_failed('*', e)
+                if attempt == self.retry_passes:
+                    return
+                self.wait_catalog_retry(attempt + 1, '그룹 목록')
+        self.catalog_failures.pop('*', None)
+        keys = [self.catalog_group_key(g) for g in groups]
+        
+        cached = self.load_catalog_cache(keys)
+        if cached is not None:
+            print(f"♻️  [{self.CARRIER}] 캐시 카탈로그 재사용: {sum(len(p) for p in cached.values())}개 요금제")
+            for key in keys:
+                yield cached[key]
+            return
+        
+        def fetch_group(group):
+            with self.metrics.stage('catalog'):
+                return self.fetch_catalog_group(group)
+        
+        fresh = {}
+        if groups:
+            with ThreadPoolExecutor(max_workers=min(len(groups), self.catalog_workers)) as executor:
+                futures = {
+                    executor.submit(fetch_group, group): key
+                    for group, key in zip(groups, keys)
+                }
+                
+                for future in as_completed(futures):
+                    key = futures[future]
+                    try:
+                        plans = future.result()
+                    except Exception as e:
+                        self.catalog_group_failed(key, e)
+                        continue
+                    
+                    fresh[key] = plans
+                    if plans:
+                        yield plans
+        
+        pending = [(group, key) for group, key in zip(groups, keys) if key in self.catalog_failures]
+        for attempt in range(1, self.retry_passes + 1):
+            if not pending:
+                break
+            self.wait_catalog_retry(attempt, f"그룹 {len(pending)}개")
+            
+            retry, pending = pending, []
+            for group, key in retry:
+                try:
+                    plans = fetch_group(group)
+                except Exception as e:
+                    self.catalog_group_failed(key, e)
+                    pending.append((group, key))
+                    continue
+                
+                del self.catalog_failures[key]
+                fresh[key] = plans
+                if plans:
+                    yield plans
+        
+        if fresh and len(fresh) == len(keys):
+            self.save_catalog_cache(fresh)
+
+    def wait_catalog_retry(self, attempt, what):
+        """
+        카탈로그 재조회 전 대기 (실패 작업 재시도와 같은 retry_backoff × 2^(n-1)초)
+        """
+        delay = self.retry_backoff * 2 ** (attempt - 1)
+        print(f"🔁 [{self.CARRIER}] 카탈로그 {what} 재조회 {attempt}/{self.retry_passes} ({delay:g}초 후)")
+        time.sleep(delay)
+
+    def catalog_group_failed(self, key, error):
+        """
+        카탈로그 그룹 조회 실패 기록
+        """
+        kind = failure_kind(error)
+        self.catalog_failures[key] = kind
+        print(f"❌ [{self.CARRIER}] 카탈로그 그룹 {key} 조회 실패 ({kind}): {error}")
+
+    def discover_catalog(self):
+        """
+        요금제 카탈로그 전체 목록
+        """
+        return [plan for plans in self.iter_catalog() for plan in plans]
+
+    def load_catalog_cache(self, keys):
+        """
+        카탈로그 캐시 로드 (만료되었거나 그룹 구성이 다르면 None)
+        """
+        if not self.catalog_cache_path or not os.path.exists(self.catalog_cache_path):
+            return None
+        
+        try:
+            with open(self.catalog_cache_path, encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if time.time() - cache.get('saved_at', 0) > self.catalog_cache_ttl:
+            return None
+        
+        groups = cache.get('groups', {})
+        if sorted(groups) != sorted(keys):
+            return None
+        return groups
+
+    def save_catalog_cache(self, groups):
+        """
+        그룹별 요금제 목록을 캐시 파일로 저장
+        """
+        if not self.catalog_cache_path:
+            return
+        
+        try:
+            with open(self.catalog_cache_path, 'w', encoding='utf-8') as f:
+                json.dump({'saved_at': time.time(), 'groups': groups}, f, ensure_ascii=False)
+        except OSError as e:
+            print(f"⚠️  [{self.CARRIER}] 카탈로그 캐시 저장 실패: {e}")
+
+    # ==========================================================
+    # 공통 수집 로직
+    # ==========================================================
+    def fetch_payload(self, task):
+        """
+        조회 단계 (실패해도 전체 프로세스는 계속 진행, 실패 시 dead-letter 큐에 기록 후 None)
+        """
+        try:
+            with self.metrics.stage('fetch'):
+                return self.fetch(task)
+        except Exception as e:
+            self.metrics.exception('fetch', e)
+            self.dead_letter_task(task, 'fetch', e)
+            return None
+
+    def parse_payload(self, task, payload):
+        """
+        파싱 단계 (조회 실패 / 파싱 실패는 빈 목록)
+        """
+        if payload is None:
+            return []
+        
+        try:
+            with self.metrics.stage('parse'):
+                if self._parse_pool is not None:
+                    return self.pool_rows(self.parse_in_pool(task, payload).result())
+                return self.parse(task, payload)
+        except Exception as e:
+            self.metrics.exception('parse', e)
+            self.dead_letter_task(task, 'parse', e)
+            return []
+
+    def fetch_rows(self, task):
+        """
+        조회 + 파싱 (단일 작업용)
+        """
+        return self.parse_payload(task, self.fetch_payload(task))
+
+    def iter_results(self, all_tasks, max_threads=5):
+        """
+        단계별 파이프라인(작업 생성 → 조회 → 파싱)으로 전체 작업을 돌려 완료 순서대로 (task, rows) 반환
+        - all_tasks는 목록 또는 TaskStream (조회 대기열이 차면 작업 생성도 멈춤)
+        - 체크포인트에 있는 작업은 조회하지 않고 기록된 행을 바로 반환
+        - 적응형 모드: 스레드는 최대 한도만큼 두고 실제 동시 요청 수는 제어기가 결정
+        - 실패한 작업은 바로 반환하지 않고 본 수집이 끝난 뒤 재시도 결과로 반환 (retry_failed)
+        """
+        if self.controller is not None:
+            max_threads = self.controller.max_limit
+        self.dead_letter = DeadLetterQueue(self.journal_key)
+        
+        # 프로세스 풀 사용 시 파싱 스레드는 응답 전달/결과 수신만 하므로 프로세스당 2개
+        parse_workers = self.parse_workers
+        if self.start_parse_pool():
+            parse_workers = self.parse_processes * 2
+        
+        self.pipeline = Pipeline(
+            all_tasks, self.fetch_payload, self.parse_payload,
+            fetch_workers=max_threads, parse_workers=parse_workers,
+            queue_size=self.queue_size, skip=self.resumed_rows
+        )
+        try:
+            for task, rows, resumed in self.pipeline:
+                if not resumed and self.dead_letter.holds(task):
+                    continue
+                if not resumed:
+                    self.journal_result(task, rows)
+                yield task, rows
+            
+            yield from self.retry_failed(max_threads)
+        finally:
+            self.pipeline = None
+            self.stop_parse_pool()
+
+    # ==========================================================
+    # 실패 작업 재시도 (dead-letter 큐)
+    # ==========================================================
+    def dead_letter_task(self, task, stage, error):
+        """
+        실패 작업을 분류해 dead-letter 큐에 기록 (iter_results 밖의 단일 조회는 기록만 생략)
+        """
+        if self.dead_letter is None:
+            return
+        kind = self.dead_letter.add(task, stage, error)
+        self.metrics.incr('dead_letter', label=kind)
+
+    def retry_failed(self, max_threads):
+        """
+        본 수집에서 실패한 작업을 백오프 후 낮은 동시성으로 재시도해 완료 순서대로 (task, rows) 반환
+        - retry_passes회까지 반복, 끝까지 실패한 작업은 빈 결과로 반환 (진행률 / 조기 스냅샷 집계용)
+        - 남은 실패는 분류별 건수 / 작업 키 출력 + {output_dir}/metrics에 JSONL로 저장
+        """
+        workers = max(1, min(self.retry_workers, max_threads))
+        
+        for attempt in range(1, self.retry_passes + 1):
+            tasks = self.dead_letter.take()
+            if not tasks:
+                break
+            
+            delay = self.retry_backoff * 2 ** (attempt - 1)
+            print(f"\n🔁 [{self.CARRIER}] 실패 작업 {len(tasks):,}개 재시도 {attempt}/{self.retry_passes} "
+                  f"({delay:g}초 후, 스레드 {workers}개)")
+            time.sleep(delay)
+            
+            self.pipeline = Pipeline(tasks, self.fetch_payload, self.parse_payload,
+                                     fetch_workers=workers, parse_workers=1)
+            recovered = 0
+            for task, rows, _ in self.pipeline:
+                if self.dead_letter.holds(task):
+                    continue
+                self.dead_letter.resolve(task)
+                self.journal_result(task, rows)
+                recovered += 1
+                yield task, rows
+            
+            self.metrics.incr('dead_letter_recovered', recovered)
+            print(f"   ↳ 복구 {recovered:,}개 / 실패 {len(tasks) - recovered:,}개")
+        
+        lost = self.dead_letter.take()
+        for task in lost:
+            yield task, []
+        self.report_failures()
+
+    def report_failures(self, limit=10):
+        """
+        재시도 후에도 실패한 작업의 분류별 건수 / 키 출력 후 JSONL 저장
+        """
+        failures = len(self.dead_letter)
+        if not failures:
+            return
+        
+        self.metrics.incr('dead_letter_lost', failures)
+        counts = ', '.join(f"{kind} {count:,}" for kind, count in self.dead_letter.counts().items())
+        print(f"❌ [{self.CARRIER}] 재시도 후에도 실패한 작업 {failures:,}개 ({counts})")
+        for key, entry in list(self.dead_letter.failures.items())[:limit]:
+            print(f"   ↳ [{entry['kind']}] {key} ({entry['attempts']}회: {entry['detail']})")
+        if failures > limit:
+            print(f"   ↳ ... 외 {failures - limit:,}개")
+        
+        stamp = time.strftime('%Y%m%d_%H%M%S', time.localtime(self.metrics.started_at))
+        name = f"{self.CARRIER.lower().replace('+', 'plus')}_{stamp}_failed.jsonl"
+        path = self.dead_letter.save(os.path.join(self.output_dir, 'metrics', name))
+        print(f"   ↳ 실패 목록: {os.path.relpath(path, self.output_dir)}")
+
+    # ==========================================================
+    # 파싱 프로세스 풀 (조회 스레드의 GIL 경합 분리)
+    # ==========================================================
+    def start_parse_pool(self):
+        """
+        parse_processes > 0이고 process_parser를 구현했으면 프로세스 풀 시작 (시작 여부 반환)
+        - 수집 스레드가 도는 중에 fork하지 않도록 spawn 방식 사용
+        """
+        if self.parse_processes <= 0 or self.process_parser() is None:
+            return False
+        
+        self._parse_pool = ProcessPoolExecutor(
+            max_workers=self.parse_processes, mp_context=multiprocessing.get_context('spawn')
+        )
+        return True
+
+    def stop_parse_pool(self):
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown()
+            self._parse_pool = None
+
+    def parse_in_pool(self, task, payload):
+        """
+        원본 응답을 파싱 프로세스에 보내고 concurrent.futures.Future 반환
+        """
+        func, args = self.process_parser()
+        return self._parse_pool.submit(func, task, payload, *args)
+
+    def pool_rows(self, rows):
+        """
+        프로세스 풀 결과 → 행 목록 (None은 parseObject 없음 → 실패, 빈 목록은 빈 parseObject로 집계)
+        """
+        if rows is None:
+            raise TaskFailure('parse_miss', 'parseObject 없음')
+        if not rows:
+            self.metrics.incr('empty_parse')
+        return rows
+
+    # ==========================================================
+    # 체크포인트 (완료 작업 기록 / 재개)
+    # ==========================================================
+    def open_journal(self, resume=False):
+        """
+        체크포인트 저널 열기 (resume=True면 직전 실행의 완료 작업부터 이어서)
+        """
+        if not self.journal_path:
+            return
+        
+        self.journal = TaskJournal(self.journal_path, self.CARRIER, resume=resume)
+        if self.journal.completed:
+            print(f"♻️  [{self.CARRIER}] 체크포인트에서 {len(self.journal.completed):,}개 작업 복원 "
+                  f"({self.journal.started_at} 시작 실행)")
+
+    def close_journal(self, completed):
+        """
+        끝까지 수집했으면 체크포인트 삭제, 아니면 다음 --resume을 위해 남김
+        (카탈로그 그룹이 실패한 실행도 미완료)
+        """
+        if self.journal is None:
+            return
+        
+        if completed and not self.catalog_failures:
+            self.journal.discard()
+        else:
+            if completed:
+                print(f"💾 [{self.CARRIER}] 카탈로그 그룹 {len(self.catalog_failures)}개 실패 → "
+                      f"체크포인트 유지 (--resume으로 이어서 수집)")
+            self.journal.close()
+        self.journal = None
+
+    def journal_key(self, task):
+        return json.dumps(task, ensure_ascii=False, sort_keys=True)
+
+    def resumed_rows(self, task):
+        """
+        체크포인트에 기록된 작업이면 그 행 목록 (아니면 None)
+        """
+        if self.journal is None:
+            return None
+        
+        rows = self.journal.pop(self.journal_key(task))
+        if rows is not None:
+            self.metrics.incr('resumed_tasks')
+        return rows
+
+    def journal_result(self, task, rows):
+        """
+        완료된 작업 기록 (빈 결과는 실패일 수 있으므로 재개 시 다시 조회)
+        """
+        if self.journal is not None and rows:
+            self.journal.append(self.journal_key(task), rows)
+
+    def record_columns(self):
+        """
+        저장 컬럼 (증분 모드는 '변동유형' 추가)
+        """
+        if self.store is not None:
+            return tuple(self.COLUMNS) + (('변동유형', 'str'),)
+        return tuple(self.COLUMNS)
+
+    def task_stream(self):
+        """
+        이번 실행의 작업 목록 (스케줄러가 있으면 핫 키 우선 / 콜드 키 생략 순서)
+        """
+        stream = TaskStream(self)
+        if self.scheduler is not None and self.store is not None:
+            return ScheduledStream(stream, self.scheduler)
+        return stream
+
+    def open_output(self, prefix):
+        """
+        실행 설정(형식/파티션/표 중복 제거)에 맞는 스트리밍 저장기 생성
+        """
+        if self.dedup_output:
+            return DedupWriter(self.output_format, self.output_dir, prefix, self.CARRIER, self.partition,
+                               self.record_columns(), self.TABLE_KEY_FIELDS)
+        return open_writer(self.output_format, self.output_dir, prefix, self.CARRIER, self.partition,
+                           schema=self.record_columns())
+
+    def controller_status(self):
+        """
+        진행률 뒤에 붙일 적응형 동시성 상태
+        """
+        if self.controller is None:
+            return ''
+        return f" | {self.controller.status()}"
+
+    def pipeline_status(self):
+        """
+        진행률 뒤에 붙일 단계별 처리 상태 (파이프라인 실행 중일 때만)
+        """
+        pipeline = self.pipeline
+        if pipeline is None:
+            return ''
+        return f"\n   ↳ {pipeline.status()}"
+
+    # ==========================================================
+    # HTTP/2 전송
+    # ==========================================================
+    def open_h2_session(self, retry, fallback):
+        """
+        urllib3 Retry와 같은 재시도 설정의 공유 HTTP/2 세션 생성
+        - fallback: HTTP/1.1 대체 requests.Session을 만드는 함수 (프로토콜 오류 시 사용)
+        - httpx[http2] 미설치 시 경고 후 None (기존 HTTP/1.1 세션 사용)
+        """
+        from h2_transport import H2Session, http2_available
+        
+        if not http2_available():
+            print(f"⚠️  [{self.CARRIER}] httpx[http2] 미설치 - HTTP/1.1로 수집합니다")
+            return None
+        
+        return H2Session(
+            retries=retry.total or 0,
+            backoff_factor=retry.backoff_factor,
+            status_forcelist=retry.status_forcelist or (),
+            max_connections=self.http2_connections,
+            fallback=fallback
+        )
+
+    # ==========================================================
+    # 핫 키 조기 스냅샷 (스케줄러 사용 시)
+    # ==========================================================
+    def record_early(self, all_tasks, task, rows):
+        """
+        핫 작업의 원본 행을 조기 스냅샷 파일에 저장하고, 핫 작업이 모두 끝나면 바로 파일 마무리
+        """
+        hot = getattr(all_tasks, 'hot', None)
+        if not hot or self._early is False:
+            return
+        
+        key = self.journal_key(task)
+        if key not in hot:
+            return
+        
+        if self._early is None:
+            prefix = f"{self.CARRIER.lower().replace('+', 'plus')}_subsidy_hot"
+            if not self.partition:
+                prefix = f"{prefix}_{time.strftime('%Y%m%d_%H%M%S')}"
+            self._early = {
+                'writer': open_writer(self.output_format, self.output_dir, prefix, self.CARRIER,
+                                      self.partition, schema=self.COLUMNS),
+                'pending': set(hot)
+            }
+        
+        with self.metrics.stage('write'):
+            self._early['writer'].write_rows(rows)
+        self._early['pending'].discard(key)
+        
+        if not self._early['pending']:
+            self.close_early()
+
+    def close_early(self):
+        """
+        조기 스냅샷 마무리 (이후 이번 실행에서는 다시 열지 않음)
+        """
+        if not self._early:
+            return
+        
+        with self.metrics.stage('write'):
+            path = self._early['writer'].close()
+        self._early = False
+        if path:
+            print(f"⚡ [{self.CARRIER}] 핫 키 조기 스냅샷 저장: {os.path.relpath(path, self.output_dir)}")
+
+    # ==========================================================
+    # 지원금 이력 누적 (증분 여부와 무관하게 원본 행 기준)
+    # ==========================================================
+    def record_history(self, task, rows):
+        """
+        작업 1건의 원본 행을 이력 저장소에 누적 (빈 결과는 관찰 없음으로 처리)
+        """
+        if self.history is None or not rows:
+            return
+        with self.metrics.stage('history'):
+            self.history.append(self._history_run, rows)
+
+    def end_history(self):
+        """
+        이번 실행의 이력 마무리 (금액이 그대로인 구간의 마지막 확인 시각 갱신)
+        """
+        if self.history is None or self._history_run is None:
+            return
+        with self.metrics.stage('history'):
+            summary = self.history.finish_run(self._history_run)
+        self._history_run = None
+        print(f"🗂️  [{self.CARRIER}] 이력 저장: 행 {summary['rows']:,} / 새 키 {summary['new']:,} / "
+              f"금액 변동 {summary['changed']:,}건")
+
+    # ==========================================================
+    # 증분 수집 (직전 실행 대비 변동분만 유지)
+    # ==========================================================
+    def begin_incremental(self):
+        self._early = None
+        if self.history is not None:
+            self._history_run = self.history.begin_run(self.CARRIER)
+        if self.store is not None:
+            if self.scheduler is not None:
+                self.scheduler.load(self.CARRIER)
+            self._run_id = self.store.begin_run(self.CARRIER)
+
+    def record_incremental(self, task, rows):
+        """
+        작업 결과를 저장소와 비교해 변동 행만 반환
+        - 빈 결과(요청 실패 포함)는 직전 스냅샷을 그대로 유지
+        """
+        if not rows:
+            return []
+        
+        delta = []
+        with self.metrics.stage('incremental'):
+            for (plan_id, signup_type, term), key_rows in self.split_for_store(task, rows):
+                delta.extend(self.store.apply(
+                    self._run_id, self.CARRIER, plan_id, signup_type, term, key_rows,
+                    self.STORE_DEVICE_FIELDS, self.STORE_AMOUNT_FIELD, self.TABLE_KEY_FIELDS
+                ))
+        return delta
+
+    def end_incremental(self, all_tasks, writer):
+        """
+        카탈로그에서 빠진 키의 삭제분을 저장하고 변동 요약 출력
+        (카탈로그 그룹이 하나라도 실패했으면 삭제 판정 생략)
+        """
+        self.close_early()
+        self.end_history()
+        if self.store is None:
+            return
+        
+        if self.catalog_failures:
+            print(f"⚠️  [{self.CARRIER}] 카탈로그 그룹 {len(self.catalog_failures)}개 조회 실패 → "
+                  f"삭제 판정 생략 (직전 스냅샷 유지)")
+        
+        with self.metrics.stage('incremental'):
+            removed = self.store.finish_run(
+                self._run_id, self.CARRIER,
+                [key for task in all_tasks for key in self.store_keys(task)],
+                self.STORE_DEVICE_FIELDS, self.STORE_AMOUNT_FIELD, self.TABLE_KEY_FIELDS,
+                catalog_complete=not self.catalog_failures
+            )
+        with self.metrics.stage('write'):
+            writer.write_rows(removed)
+        summary = self.store.change_summary(self._run_id)
+        print(f"🔁 [{self.CARRIER}] 증분 비교: 추가 {summary['added']:,} / "
+              f"변경 {summary['changed']:,} / 삭제 {summary['removed']:,}건")
+
+    # ==========================================================
+    # 실행 계측 저장
+    # ==========================================================
+    def save_metrics(self):
+        """
+        단계별 시간 / 지연 / 카운터를 출력하고 {output_dir}/metrics에 저장
+        (total = 계측 시작부터 지금까지의 실행 시간)
+        """
+        self.metrics.add_stage('total', time.time() - self.metrics.started_at)
+        print(self.metrics.report())
+        path = self.metrics.save(self.output_dir, self.openmetrics)
+        print(f"📈 계측 저장: {os.path.relpath(path, self.output_dir)}")
+        return path
+
+
+class TaskStream:
+    """
+    카탈로그 그룹이 도착하는 대로 조회 작업을 내보내는 작업 목록
+    - 전체 카탈로그를 기다리지 않고 첫 그룹부터 지원금 조회 시작
+    - tasks: 지금까지 생성된 작업 (증분 마무리용)
+    - complete: 카탈로그를 빠짐없이 받았는지 (조회 종료 후 실패한 그룹이 없을 때만 True)
+    - failed_groups: 조회에 실패한 카탈로그 그룹 (그룹 키 → 실패 분류)
+    """
+
+    def __init__(self, plugin):
+        self.plugin = plugin
+        self.tasks = []
+        self.complete = False
+        self.failed_groups = {}
+
+    def __iter__(self):
+        for plans in self.plugin.iter_catalog():
+            for task in self.plugin.build_tasks(plans):
+                self.tasks.append(task)
+                yield task
+        self.failed_groups = dict(self.plugin.catalog_failures)
+        self.complete = not self.failed_groups
+
+    def __len__(self):
+        return len(self.tasks)
@@ -0,0 +1,188 @@
+# =========================
+# 통합 실행 진입점 (crawl / plan / export / bench)
+# =========================
+# 무거운 의존성(selenium / pandas / pyarrow / openpyxl)은 하위 명령이 실제로 쓸 때만 로드
+# - 이 파일은 표준 라이브러리만 import, 하위 명령별 모듈은 실행 직전에 import
+import os
+import sys
+import time
+import runpy
+import argparse
+
+
+# 하위 명령 → {대상: 모듈} (모듈의 기존 실행 진입점에 나머지 인자를 그대로 전달)
+COMMANDS = {
+    'crawl': {
+        'all': 'orchestrator', 'skt': 'skt_crawler', 'lguplus': 'lguplus_crawler', 'distributed': 'distributed'
+    },
+    'export': {'tables': 'tables', 'history': 'history_store'},
+    'bench': {
+        'suite': 'bench_suite', 'skt': 'bench_skt', 'lguplus': 'bench_lguplus', 'parse': 'bench_parse',
+        'writers': 'bench_writers', 'distributed': 'bench_distributed', 'h2': 'bench_h2',
+        'history': 'bench_history', 'cli': 'bench_cli', 'dead-letter': 'bench_dead_letter'
+    },
+}
+
+COMMAND_HELP = {
+    'crawl': '수집 실행 (all: 통합, skt / lguplus: 단일 통신사, distributed: 작업 큐 coordinator / worker)',
+    'export': '저장본 변환 / 조회 (tables: 중복 제거 저장본 펼치기, history: 이력 저장소 조회 / 가져오기)',
+    'bench': '벤치마크 / 점검 스크립트 실행',
+}
+
+
+def run_module(module, argv):
+    """
+    모듈을 `python {module}.py {argv}`와 같게 실행
+    """
+    sys.argv = [f"{module}.py", *argv]
+    runpy.run_module(module, run_name='__main__', alter_sys=True)
+
+
+# ==========================================================
+# plan: 작업 행렬만 구성 (지원금 조회 없음)
+# ==========================================================
+def make_plugin(carrier, output_dir, base_url=None):
+    if carrier == 'skt':
+        from skt_crawler import SKTStableCrawler
+        kwargs = {'base_url': base_url} if base_url else {}
+        return SKTStableCrawler(output_dir=output_dir, **kwargs)
+
+    from lguplus_crawler import LGUplusCrawler
+    kwargs = {'base_url': base_url} if base_url else {}
+    return LGUplusCrawler(output_dir=output_dir, **kwargs)
+
+
+def cached_catalog(plugin):
+    """
+    카탈로그 캐시 파일 → (요금제 목록, 저장 후 경과 초) (유효 시간 / 그룹 구성 확인 없이, 없으면 None)
+    """
+    import json
+
+    try:
+        with open(plugin.catalog_cache_path, encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    age = time.time() - cache.get('saved_at', 0)
+    return [plan for plans in cache.get('groups', {}).values() for plan in plans], age
+
+
+def plan_carrier(carrier, args, store):
+    """
+    통신사 1곳의 카탈로그 → 작업 행렬 구성 후 건수 출력
+    - --offline: 캐시 파일만 사용 (네트워크 없음, 유효 시간 무시)
+    - 기본: 캐시가 유효하면 재사용, 아니면 카탈로그만 조회 (쿠키가 필요한 통신사는 준비 단계 포함)
+    """
+    from metrics import RunMetrics
+
+    start = time.perf_counter()
+    plugin = make_plugin(carrier, args.output, args.base_url)
+    plugin.metrics = RunMetrics(plugin.CARRIER)
+    plugin.catalog_cache_ttl = args.catalog_ttl
+
+    if args.offline:
+        found = cached_catalog(plugin)
+        if found is None:
+            print(f"❌ [{plugin.CARRIER}] 카탈로그 캐시 없음: {plugin.catalog_cache_path}")
+            return None
+        catalog, age = found
+        source = f"캐시 ({age / 3600:.1f}시간 전)"
+
+    else:
+        keys = [plugin.catalog_group_key(g) for g in plugin.catalog_groups()]
+        if plugin.load_catalog_cache(keys) is None and not plugin.prepare():
+            print(f"❌ [{plugin.CARRIER}] 수집 준비 실패 (카탈로그 조회 불가)")
+            return None
+        catalog = plugin.discover_catalog()
+        source = "조회"
+
+    tasks = plugin.build_tasks(catalog)
+    keys = [key for task in tasks for key in plugin.store_keys(task)]
+    elapsed = time.perf_counter() - start
+
+    signup_types, terms = {}, {}
+    for _, signup_type, term in keys:
+        signup_types[signup_type] = signup_types.get(signup_type, 0) + 1
+        terms[term] = terms.get(term, 0) + 1
+
+    print(f"🗺️  [{plugin.CARRIER}] 카탈로그 {source}: 요금제 {len(catalog):,}개 → 조회 작업 {len(tasks):,}개 "
+          f"/ 저장 키 {len(keys):,}개 ({elapsed * 1000:.0f}ms)")
+    print(f"   ↳ 가입유형: {', '.join(f'{k} {v:,}' for k, v in signup_types.items())}")
+    print(f"   ↳ 약정: {', '.join(f'{k} {v:,}' for k, v in terms.items())}")
+
+    if store is not None:
+        from scheduler import ChangeScheduler
+        
+        plugin.store = store
+        scheduler = ChangeScheduler(store, cold_revisit=args.cold_revisit * 3600)
+        _, _, counts = scheduler.plan(plugin, tasks)
+        print(f"   ↳ 스케줄: 핫 {counts['hot']:,} → 웜 {counts['warm']:,} → 콜드 {counts['cold']:,} "
+              f"(재방문 전이라 생략 {counts['skip']:,}, 실제 조회 {len(tasks) - counts['skip']:,}개)")
+
+    plugin.close()
+    return len(tasks)
+
+
+def plan(argv):
+    parser = argparse.ArgumentParser(prog='cli.py plan', description="조회 작업 행렬 구성 / 건수 확인 (지원금 조회 없음)")
+    parser.add_argument('--carriers', nargs='+', choices=['skt', 'lguplus'], default=['skt', 'lguplus'])
+    parser.add_argument('--output', default='/app/output', help='카탈로그 / 쿠키 캐시 디렉토리')
+    parser.add_argument('--offline', action='store_true', help='카탈로그 캐시 파일만 사용 (네트워크 없음)')
+    parser.add_argument('--catalog-ttl', type=int, default=6 * 3600, help='카탈로그 캐시 유효 시간 (초)')
+    parser.add_argument('--base-url', help='대상 사이트 주소 (스텁/재생 서버 테스트용, 단일 통신사)')
+    parser.add_argument('--schedule', action='store_true', help='증분 저장소 변동 이력으로 핫 / 콜드 / 생략 건수 계산')
+    parser.add_argument('--store', default='/app/output/subsidy_store.sqlite', help='증분 저장소 경로')
+    parser.add_argument('--cold-revisit', type=float, default=24, help='콜드 키 재방문 간격 (시간)')
+    args = parser.parse_args(argv)
+
+    store = None
+    if args.schedule:
+        if not os.path.exists(args.store):
+            print(f"⚠️  증분 저장소 없음 ({args.store}): 스케줄 계산 생략")
+        else:
+            from result_store import ResultStore
+            store = ResultStore(args.store)
+
+    total = 0
+    try:
+        for carrier in args.carriers:
+            total += plan_carrier(carrier, args, store) or 0
+    finally:
+        if store is not None:
+            store.close()
+
+    print(f"\n📋 전체 조회 작업: {total:,}개")
+    return 0
+
+
+# ==========================================================
+# 실행 진입점
+# ==========================================================
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+
+    parser = argparse.ArgumentParser(
+        prog='cli.py',
+        description="공시지원금 크롤러 통합 실행 (하위 명령이 필요한 모듈만 로드)",
+        epilog="예: cli.py crawl all --incremental | cli.py plan --offline | "
+               "cli.py export history query --device S24 | cli.py bench suite"
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+    for name, targets in COMMANDS.items():
+        sub = commands.add_parser(name, help=COMMAND_HELP[name])
+        sub.add_argument('target', choices=sorted(targets))
+        sub.add_argument('args', nargs=argparse.REMAINDER, help='대상 모듈 인자 (대상 뒤에 --help로 확인)')
+    commands.add_parser('plan', help='조회 작업 행렬만 구성해 건수 확인 (지원금 조회 없음)', add_help=False)
+
+    # plan은 자체 인자 파서 사용 (나머지 인자 전체 전달)
+    if argv and argv[0] == 'plan':
+        return plan(argv[1:])
+
+    args = parser.parse_args(argv)
+    run_module(COMMANDS[args.command][args.target], args.args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+# =========================
+# 실패 작업 dead-letter 큐 (본 수집이 끝난 뒤 재시도 단계용)
+# =========================
+import os
+import json
+import threading
+
+import requests
+
+
+# 실패 분류 (출력 순서)
+FAILURE_KINDS = ('timeout', 'connection', 'http', 'json', 'parse_miss', 'clearance', 'error')
+
+
+class TaskFailure(Exception):
+    """
+    빈 결과 대신 발생시키는 작업 실패
+    - kind: 실패 분류 (FAILURE_KINDS), detail: 상태 코드 등 부가 정보
+    """
+
+    kind = 'error'
+
+    def __init__(self, kind, detail=''):
+        super().__init__(f"{kind} {detail}".strip())
+        self.kind = kind
+        self.detail = str(detail)
+
+
+def failure_kind(error):
+    """
+    예외 → 실패 분류
+    - TaskFailure(및 하위 클래스)는 자체 분류
+    - 시간 초과 / 연결 오류 (HTTP/2 세션이 감싼 httpx 예외는 원인 예외로 판별)
+    - JSON 파싱 오류(ValueError) / 그 밖의 예외
+    """
+    kind = getattr(error, 'kind', None)
+    if kind:
+        return kind
+
+    for err in (error, error.__cause__):
+        if err is not None and (isinstance(err, (requests.Timeout, TimeoutError))
+                                or 'Timeout' in type(err).__name__):
+            return 'timeout'
+    if isinstance(error, (requests.ConnectionError, ConnectionError)):
+        return 'connection'
+    if isinstance(error, (requests.exceptions.RetryError, requests.HTTPError)):
+        return 'http'
+    if isinstance(error, ValueError):
+        return 'json'
+    return 'error'
+
+
+class DeadLetterQueue:
+    """
+    실패한 작업 모음 (스레드 안전)
+    - add: 실패 분류 후 재시도 대기 목록에 추가 (같은 작업은 마지막 실패로 갱신, 시도 횟수 누적)
+    - take: 재시도할 작업을 꺼내고 대기 목록 비움 (실패 기록은 resolve 전까지 유지)
+    - key: 작업 → 고유 키 (기본: 정렬된 JSON, 체크포인트 키와 같음)
+    """
+
+    def __init__(self, key=None):
+        self.key = key or (lambda task: json.dumps(task, ensure_ascii=False, sort_keys=True))
+        self.pending = {}
+        self.failures = {}
+        self._lock = threading.Lock()
+
+    def add(self, task, stage, error):
+        """
+        실패 기록 후 분류 반환
+        """
+        kind = failure_kind(error)
+        key = self.key(task)
+        with self._lock:
+            entry = self.failures.setdefault(key, {'task': task, 'attempts': 0})
+            entry.update(stage=stage, kind=kind, detail=str(error)[:200])
+            entry['attempts'] += 1
+            self.pending[key] = task
+        return kind
+
+    def holds(self, task):
+        """
+        재시도 대기 중인 작업인지 (실패 결과는 재시도가 끝날 때까지 내보내지 않음)
+        """
+        with self._lock:
+            return self.key(task) in self.pending
+
+    def take(self):
+        with self._lock:
+            tasks, self.pending = list(self.pending.values()), {}
+        return tasks
+
+    def resolve(self, task):
+        """
+        재시도에 성공한 작업의 실패 기록 삭제
+        """
+        with self._lock:
+            self.failures.pop(self.key(task), None)
+
+    def counts(self):
+        """
+        남은 실패의 분류별 건수 (FAILURE_KINDS 순서)
+        """
+        with self._lock:
+            kinds = [entry['kind'] for entry in self.failures.values()]
+        return {kind: kinds.count(kind) for kind in FAILURE_KINDS if kind in kinds}
+
+    def __len__(self):
+        with self._lock:
+            return len(self.failures)
+
+    def save(self, path):
+        """
+        남은 실패를 JSONL로 저장 (작업 / 단계 / 분류 / 마지막 오류 / 시도 횟수), 경로 반환
+        """
+        with self._lock:
+            entries = list(self.failures.values())
+        
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+        return path
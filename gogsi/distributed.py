@@ -0,0 +1,361 @@
+# =========================
+# 분산 수집 (코디네이터 1개 + 워커 N개, 작업 큐: work_queue.WorkQueue)
+# =========================
+import os
+import sys
+import time
+import socket
+import threading
+import subprocess
+
+from metrics import RunMetrics
+from work_queue import WorkQueue
+
+# 크롤러 CARRIER → 큐에 기록하는 통신사 이름 (make_plugin 인자)
+QUEUE_CARRIERS = {'SKT': 'skt', 'LGU+': 'lguplus'}
+
+
+def make_plugin(carrier, options, output_dir, store=None, output_format='xlsx', partition=None):
+    """
+    작업 설정(options)으로 통신사 크롤러 생성 (코디네이터 / 워커 공통)
+    - options: {'base_url', 'paging', 'page_concurrency', 'http2', 'warm_browser', 'retry_passes'} (없으면 크롤러 기본값)
+    """
+    if carrier == 'skt':
+        from skt_crawler import SKTStableCrawler
+        plugin = SKTStableCrawler(output_dir=output_dir, store=store, output_format=output_format,
+                                  partition=partition, http2=options.get('http2', False),
+                                  **_base_url(options))
+    else:
+        from lguplus_crawler import LGUplusCrawler
+        plugin = LGUplusCrawler(output_dir=output_dir, store=store, output_format=output_format,
+                                partition=partition, paging=options.get('paging', 'serial'),
+                                page_concurrency=options.get('page_concurrency', 4),
+                                http2=options.get('http2', False),
+                                warm_browser=options.get('warm_browser', False), **_base_url(options))
+
+    plugin.metrics = RunMetrics(plugin.CARRIER)
+    plugin.retry_passes = options.get('retry_passes', plugin.retry_passes)
+    return plugin
+
+
+def _base_url(options):
+    return {'base_url': options['base_url']} if options.get('base_url') else {}
+
+
+class ShardCoordinator:
+    """
+    카탈로그로 전체 작업을 만들어 샤드로 올리고, 워커가 보낸 결과를 증분 비교 후 파일 1개로 저장
+    - 워커는 같은 큐 파일을 여는 로컬 프로세스(local_workers) 또는 다른 호스트 (python distributed.py worker)
+    - 증분 저장소 / 저장기는 코디네이터만 사용 (워커는 조회 + 파싱만)
+    - 워커가 죽으면 임대 만료 후 다른 워커가 같은 샤드를 다시 처리
+    - 로컬 워커가 모두 종료됐는데 처리 중인 샤드가 없으면 남은 샤드를 실패 처리 (무한 대기 방지)
+    """
+
+    def __init__(self, plugin, queue_path, options=None, shard_size=20, local_workers=0,
+                 worker_threads=5, lease_seconds=60, poll_interval=0.5):
+        self.plugin = plugin
+        self.queue = WorkQueue(queue_path)
+        self.queue_path = queue_path
+        self.options = options or {}
+        self.shard_size = shard_size
+        self.local_workers = local_workers
+        self.worker_threads = worker_threads
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.processes = []
+
+    def spawn_workers(self):
+        """
+        로컬 워커 프로세스 시작 (같은 출력 디렉토리의 쿠키 캐시 공유, 작업 게시 후라 남은 샤드가 없으면 바로 종료)
+        """
+        script = os.path.abspath(__file__)
+        for _ in range(self.local_workers):
+            self.processes.append(subprocess.Popen([
+                sys.executable, script, 'worker', '--queue', self.queue_path,
+                '--output', self.plugin.output_dir, '--threads', str(self.worker_threads),
+                '--lease', str(self.lease_seconds), '--idle-exit', '0'
+            ]))
+
+    def abandon_orphaned_shards(self, job_id):
+        """
+        로컬 워커가 모두 종료됐고 유효한 임대도 없으면 남은 샤드를 실패 처리, 처리한 샤드 수 반환
+        (로컬 워커 없이 원격 워커만 기다리는 실행은 대상 아님)
+        """
+        if not self.processes or any(process.poll() is None for process in self.processes):
+            return 0
+        if self.queue.active_leases(job_id):
+            return 0
+        
+        failed = self.queue.fail_open_shards(job_id)
+        if failed:
+            codes = ', '.join(str(process.returncode) for process in self.processes)
+            print(f"❌ [{self.plugin.CARRIER}] 로컬 워커 {len(self.processes)}개가 모두 종료됨 "
+                  f"(종료 코드 {codes}) → 남은 샤드 {failed}개 실패 처리")
+        return failed
+
+    def run(self):
+        """
+        전체 분산 수집 후 결과 저장, 저장된 행 수 반환
+        """
+        plugin = self.plugin
+        carrier = plugin.CARRIER
+        start_time = time.time()
+        
+        print("\n" + "🚀" * 40)
+        print(f"분산 지원금 크롤러 - 코디네이터 ({carrier})")
+        print("🚀" * 40)
+        
+        # LG U+ 카탈로그 조회에도 쿠키가 필요 (워커는 같은 쿠키 캐시를 재사용)
+        if not plugin.prepare():
+            print(f"❌ [{carrier}] 수집 준비 실패")
+            return 0
+        
+        print("\n🔍 요금제 카탈로그 조회 중...")
+        stream = plugin.task_stream()
+        tasks = list(stream)
+        if not tasks:
+            print(f"❌ [{carrier}] 조회 작업이 없습니다.")
+            plugin.close()
+            return 0
+        
+        job_id = self.queue.publish(QUEUE_CARRIERS[carrier], tasks, self.shard_size, self.options)
+        shards = sum(self.queue.progress(job_id).values())
+        print(f"📤 작업 {len(tasks):,}개 → 샤드 {shards:,}개 게시 (작업 #{job_id}, 샤드당 {self.shard_size}개)")
+        print(f"⚙️  큐: {self.queue_path} | 로컬 워커 {self.local_workers}개 | 임대 {self.lease_seconds}초\n")
+        
+        writer = plugin.open_writer()
+        plugin.begin_incremental()
+        self.spawn_workers()
+        
+        done, collected = 0, 0
+        try:
+            while True:
+                # 샤드 완료와 결과 기록은 같은 트랜잭션이라, 전부 끝난 뒤 꺼낸 결과가 없으면 수집 종료
+                progress = self.queue.progress(job_id)
+                finished = progress['pending'] == 0 and progress['leased'] == 0
+                
+                results = self.queue.take_results(job_id)
+                for task, rows in results:
+                    plugin.record_history(task, rows)
+                    if plugin.store is not None:
+                        rows = plugin.record_incremental(task, rows)
+                    if rows:
+                        with plugin.metrics.stage('write'):
+                            writer.write_rows(rows)
+                        collected += len(rows)
+                    
+                    done += 1
+                    if done % 100 == 0 or done == len(tasks):
+                        print(f"📊 [{carrier}] 진행률: {done}/{len(tasks)} ({done/len(tasks)*100:.1f}%) | "
+                              f"수집 데이터: {collected:,}건 | 샤드 완료 {progress['done']}/{shards} "
+                              f"(처리 중 {progress['leased']}, 실패 {progress['failed']})")
+                
+                if not results:
+                    if finished:
+                        break
+                    if self.abandon_orphaned_shards(job_id):
+                        continue
+                    time.sleep(self.poll_interval)
+        finally:
+            self.queue.finish_job(job_id)
+            for process in self.processes:
+                process.wait()
+        
+        # 실패 샤드의 키도 전체 작업에는 포함되므로 삭제로 판정되지 않고 직전 스냅샷 유지
+        progress = self.queue.progress(job_id)
+        if progress['failed']:
+            print(f"⚠️  [{carrier}] 실패한 샤드 {progress['failed']}개 (재시도 한도 초과 / 처리할 워커 없음) "
+                  f"(작업 최대 {progress['failed'] * self.shard_size}개 누락, 증분 모드면 직전 스냅샷 유지)")
+        
+        print(f"✅ 총 {done}개의 조회 조합 처리됨")
+        plugin.end_incremental(stream.tasks, writer)
+        plugin.close()
+        
+        with plugin.metrics.stage('write'):
+            output_path = writer.close()
+        plugin.metrics.add_stage('total', time.time() - start_time)
+        
+        if output_path:
+            print(f"\n🎉 수집 성공!")
+            print(f"📂 파일명: {os.path.relpath(output_path, plugin.output_dir)}")
+            print(f"📊 데이터: {writer.rows_written:,}건")
+        elif plugin.store is not None:
+            print("\n✅ 직전 실행 대비 변동 없음")
+        else:
+            print("\n❌ 수집된 데이터가 없습니다.")
+        
+        plugin.save_metrics()
+        self.queue.close()
+        return writer.rows_written
+
+
+class ShardWorker:
+    """
+    큐에서 샤드를 임대해 조회 + 파싱 후 결과를 보고하는 워커
+    - 통신사/설정별 크롤러를 한 번만 만들어 재사용 (쿠키 / keep-alive 세션 유지)
+    - 처리 중에는 lease_seconds / 3마다 임대 연장 (멈춘 워커만 만료되도록)
+    - 끝나지 않은 샤드가 idle_exit초 동안 없으면 종료
+    """
+
+    def __init__(self, queue_path, output_dir, max_threads=5, lease_seconds=60, idle_exit=10,
+                 poll_interval=0.5):
+        self.queue = WorkQueue(queue_path)
+        self.queue_path = queue_path
+        self.output_dir = output_dir
+        self.max_threads = max_threads
+        self.lease_seconds = lease_seconds
+        self.idle_exit = idle_exit
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.plugins = {}
+
+    def plugin_for(self, carrier, options):
+        key = (carrier, tuple(sorted(options.items())))
+        plugin = self.plugins.get(key)
+        if plugin is None:
+            plugin = make_plugin(carrier, options, self.output_dir)
+            if hasattr(plugin, 'start_page_pool'):
+                plugin.start_page_pool()
+            if not plugin.prepare():
+                print(f"❌ [{self.worker_id}] {plugin.CARRIER} 수집 준비 실패")
+                return None
+            self.plugins[key] = plugin
+        return plugin
+
+    def process(self, lease):
+        """
+        샤드 1개 처리, 보고 성공 여부 반환
+        """
+        shard_id, job_id, carrier, options, tasks = lease
+        plugin = self.plugin_for(carrier, options)
+        if plugin is None:
+            # 임대를 그대로 두면 만료 후 다른 워커가 가져감
+            return False
+        
+        stopped = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(shard_id, stopped), daemon=True)
+        heartbeat.start()
+        try:
+            results = list(plugin.iter_results(tasks, max_threads=self.max_threads))
+        finally:
+            stopped.set()
+            heartbeat.join()
+        
+        if not self.queue.complete(shard_id, self.worker_id, results):
+            print(f"⚠️  [{self.worker_id}] 샤드 #{shard_id} 임대 만료로 결과 폐기 (다른 워커가 처리)")
+            return False
+        
+        plugin.metrics.incr('shards_done')
+        print(f"📦 [{self.worker_id}] 샤드 #{shard_id} 완료 ({len(tasks)}개 작업, "
+              f"{sum(len(rows) for _, rows in results):,}건)")
+        return True
+
+    def _heartbeat(self, shard_id, stopped):
+        # 워커 스레드와 커넥션을 공유하지 않도록 별도 연결
+        queue = WorkQueue(self.queue_path)
+        try:
+            while not stopped.wait(self.lease_seconds / 3):
+                if not queue.heartbeat(shard_id, self.worker_id, self.lease_seconds):
+                    break
+        finally:
+            queue.close()
+
+    def run(self):
+        print(f"👷 워커 시작: {self.worker_id} (큐: {self.queue_path}, 스레드 {self.max_threads}개)")
+        
+        idle_since = time.time()
+        while True:
+            lease = self.queue.lease(self.worker_id, self.lease_seconds)
+            if lease is not None:
+                self.process(lease)
+                idle_since = time.time()
+                continue
+            
+            # 다른 워커가 임대 중인 샤드가 남아 있으면 만료될 때를 대비해 대기
+            if self.queue.has_open_work():
+                idle_since = time.time()
+            elif time.time() - idle_since >= self.idle_exit:
+                break
+            time.sleep(self.poll_interval)
+        
+        for plugin in self.plugins.values():
+            plugin.close()
+            print(plugin.metrics.report())
+        self.queue.close()
+        print(f"👋 워커 종료: {self.worker_id}")
+
+
+# ==========================================================
+# 실행 진입점
+# ==========================================================
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="분산 공시지원금 크롤러 (코디네이터 / 워커)")
+    sub = parser.add_subparsers(dest='role', required=True)
+
+    coord = sub.add_parser('coordinator', help='작업 게시 + 결과 저장')
+    coord.add_argument('carrier', choices=['skt', 'lguplus'])
+    coord.add_argument('--queue', default='/app/output/work_queue.sqlite', help='작업 큐 경로 (워커와 공유)')
+    coord.add_argument('--output', default='/app/output', help='저장 디렉토리')
+    coord.add_argument('--shard-size', type=int, default=20, help='샤드당 작업 수')
+    coord.add_argument('--local-workers', type=int, default=0, help='이 호스트에서 띄울 워커 프로세스 수')
+    coord.add_argument('--threads', type=int, default=5, help='로컬 워커별 스레드 수')
+    coord.add_argument('--lease', type=int, default=60, help='샤드 임대 시간 (초)')
+    coord.add_argument('--base-url', help='대상 사이트 주소 (스텁/재생 서버 테스트용)')
+    coord.add_argument('--paging', choices=['serial', 'concurrent'], default='serial', help='LG U+ 페이징 모드')
+    coord.add_argument('--page-concurrency', type=int, default=4)
+    coord.add_argument('--retry-passes', type=int, default=2,
+                       help='실패 작업 재시도 횟수 (본 수집 후 백오프 + 낮은 동시성, 0이면 재시도 없음)')
+    coord.add_argument('--http2', action='store_true', help='워커 HTTP/2 다중화 전송 (httpx[http2])')
+    coord.add_argument('--warm-browser', action='store_true',
+                       help='LG U+ 워커마다 쿠키 갱신용 헤드리스 브라우저 유지 (통과 쿠키 만료 시 바로 갱신)')
+    coord.add_argument('--incremental', action='store_true', help='직전 실행 대비 변동분만 저장')
+    coord.add_argument('--store', default='/app/output/subsidy_store.sqlite', help='증분 저장소 경로')
+    coord.add_argument('--history', action='store_true', help='지원금 이력 저장소에도 누적 (history_store.py로 조회)')
+    coord.add_argument('--history-store', default='/app/output/subsidy_history.sqlite', help='이력 저장소 경로')
+    coord.add_argument('--format', choices=['xlsx', 'csv', 'parquet'], default='xlsx', help='저장 형식')
+    coord.add_argument('--dedup', action='store_true', help='같은 지원금 표는 1번만 저장 (고유 표 + 색인 파일)')
+    coord.add_argument('--catalog-ttl', type=int, default=6 * 3600,
+                       help='요금제 카탈로그 캐시 유효 시간 (초, 0이면 매번 조회)')
+
+    work = sub.add_parser('worker', help='샤드 임대 + 조회 + 결과 보고')
+    work.add_argument('--queue', default='/app/output/work_queue.sqlite', help='작업 큐 경로')
+    work.add_argument('--output', default='/app/output', help='쿠키 캐시 / 계측 디렉토리')
+    work.add_argument('--threads', type=int, default=5, help='샤드 처리 스레드 수')
+    work.add_argument('--lease', type=int, default=60, help='샤드 임대 시간 (초)')
+    work.add_argument('--idle-exit', type=float, default=10, help='남은 샤드가 없을 때 종료까지 대기 (초)')
+    args = parser.parse_args()
+
+    if args.role == 'worker':
+        ShardWorker(args.queue, args.output, max_threads=args.threads, lease_seconds=args.lease,
+                    idle_exit=args.idle_exit).run()
+        sys.exit(0)
+
+    store = None
+    if args.incremental:
+        from result_store import ResultStore
+        store = ResultStore(args.store)
+
+    history = None
+    if args.history:
+        from history_store import HistoryStore
+        history = HistoryStore(args.history_store)
+
+    options = {'base_url': args.base_url, 'paging': args.paging, 'page_concurrency': args.page_concurrency,
+               'http2': args.http2, 'warm_browser': args.warm_browser,
+               'retry_passes': args.retry_passes}
+    plugin = make_plugin(args.carrier, options, args.output, store=store, output_format=args.format)
+    plugin.catalog_cache_ttl = args.catalog_ttl
+    plugin.dedup_output = args.dedup
+    plugin.history = history
+
+    ShardCoordinator(plugin, args.queue, options=options, shard_size=args.shard_size,
+                     local_workers=args.local_workers, worker_threads=args.threads,
+                     lease_seconds=args.lease).run()
+
+    if store is not None:
+        store.close()
+    
+    if history is not None:
+        history.close()
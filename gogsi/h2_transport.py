@@ -0,0 +1,193 @@
+# =========================
+# HTTP/2 다중화 전송 (httpx, requests.Session 호환 인터페이스)
+# =========================
+import time
+import asyncio
+import threading
+
+import requests
+
+# 선택 의존성: httpx + h2 (없으면 크롤러는 기존 requests 세션 사용)
+try:
+    import httpx
+    import h2  # noqa: F401 (httpx http2=True 사용 조건)
+except ImportError:
+    httpx = None
+
+
+def http2_available():
+    return httpx is not None
+
+
+class H2Response:
+    """
+    httpx 응답을 크롤러가 쓰는 requests.Response 속성으로 감싼 응답
+    - status_code / content / text / headers / url / json() / raise_for_status()
+    - raw.retries.history: 세션 안에서 재시도한 횟수 (metrics.observe_response 집계용)
+    - http_version: 'HTTP/2' / 'HTTP/1.1'
+    """
+
+    def __init__(self, resp, retries):
+        self._resp = resp
+        self.status_code = resp.status_code
+        self.content = resp.content
+        self.headers = resp.headers
+        self.url = str(resp.url)
+        self.http_version = resp.http_version
+        self.raw = _RawInfo(retries)
+
+    @property
+    def text(self):
+        return self._resp.text
+
+    def json(self):
+        return self._resp.json()
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+class _RawInfo:
+    def __init__(self, retries):
+        self.retries = _RetryHistory(retries)
+
+
+class _RetryHistory:
+    def __init__(self, count):
+        self.history = [None] * count
+
+
+class H2Session:
+    """
+    여러 스레드가 공유하는 HTTP/2 세션 (호스트당 커넥션 max_connections개에 요청을 다중화)
+    - requests.Session처럼 get / cookies / headers / close 제공 (크롤러 코드 변경 최소화)
+    - 요청은 세션 전용 이벤트 루프 스레드 1개의 httpx.AsyncClient가 보냄
+      (httpx 동기 클라이언트는 여러 스레드가 HTTP/2 커넥션 1개를 동시에 쓰면 스트림 ID / HPACK 순서가 꼬임)
+    - 재시도: urllib3 Retry와 같은 의미 (retries회, status_forcelist 코드 / 연결 오류,
+      두 번째 재시도부터 backoff_factor × 2^(n-1)초 대기, 대기는 호출 스레드에서)
+    - 서버가 ALPN으로 h2를 고르지 않으면(또는 http:// 주소) httpx가 HTTP/1.1로 통신
+    - HTTP/2 프로토콜 오류는 해당 요청을 HTTP/1.1 세션으로 다시 보내고,
+      fallback_after번 쌓이면 이후 요청 전체를 HTTP/1.1로 전환
+    """
+
+    def __init__(self, retries=0, backoff_factor=0.0, status_forcelist=(), max_connections=2,
+                 fallback=None, fallback_after=3):
+        if httpx is None:
+            raise RuntimeError("HTTP/2 전송에는 httpx[http2]가 필요합니다 (pip install 'httpx[http2]')")
+        
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.status_forcelist = set(status_forcelist)
+        
+        # 호스트당 커넥션 수 (HTTP/2는 커넥션 1개에 여러 스트림, 동시 스트림 한도를 넘으면 추가 연결)
+        self.client = httpx.AsyncClient(
+            http2=True,
+            verify=False,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        )
+        self.cookies = self.client.cookies
+        self.headers = self.client.headers
+        
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        
+        # HTTP/1.1 대체 세션 (requests.Session을 돌려주는 함수, 첫 프로토콜 오류 때 생성)
+        self.fallback = fallback
+        self.fallback_after = fallback_after
+        self._fallback_session = None
+        self.protocol_errors = 0
+        
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'connections': 0, 'http2': 0, 'fallbacks': 0}
+
+    # ==========================================================
+    # 요청
+    # ==========================================================
+    def get(self, url, params=None, headers=None, verify=False, timeout=15):
+        """
+        GET 요청 (verify는 requests 호환용, 세션 생성 시 verify=False 고정)
+        """
+        if self.protocol_errors >= self.fallback_after and self.fallback is not None:
+            return self._fallback_get(url, params, headers, timeout)
+        
+        attempt = 0
+        while True:
+            try:
+                resp = asyncio.run_coroutine_threadsafe(
+                    self.client.get(url, params=params, headers=headers, timeout=timeout,
+                                    extensions={'trace': self._trace}),
+                    self._loop
+                ).result()
+            except httpx.RemoteProtocolError:
+                # GOAWAY / 잘못된 프레임 등: HTTP/1.1로 다시 보냄
+                with self._lock:
+                    self.protocol_errors += 1
+                    if self.protocol_errors == self.fallback_after:
+                        print(f"⚠️  HTTP/2 프로토콜 오류 {self.protocol_errors}회 → 이후 요청은 HTTP/1.1로 전환")
+                if self.fallback is None:
+                    raise
+                return self._fallback_get(url, params, headers, timeout)
+            except httpx.TransportError as e:
+                if attempt >= self.retries:
+                    raise requests.ConnectionError(str(e)) from e
+            else:
+                self._count(resp)
+                if resp.status_code not in self.status_forcelist or attempt >= self.retries:
+                    return H2Response(resp, attempt)
+            
+            attempt += 1
+            if attempt > 1:
+                time.sleep(self.backoff_factor * (2 ** (attempt - 1)))
+
+    def _fallback_get(self, url, params, headers, timeout):
+        with self._lock:
+            if self._fallback_session is None:
+                # 공통 헤더는 대체 세션을 만드는 쪽에서 설정 (httpx 기본 헤더는 옮기지 않음)
+                self._fallback_session = self.fallback()
+                self._fallback_session.cookies.update(dict(self.cookies))
+            self._stats['fallbacks'] += 1
+        return self._fallback_session.get(url, params=params, headers=headers, verify=False, timeout=timeout)
+
+    def update_cookies(self, cookies):
+        """
+        쿠키 교체 (실행 중 쿠키 갱신용, HTTP/1.1 대체 세션 포함)
+        """
+        with self._lock:
+            self.cookies.clear()
+            self.cookies.update(cookies)
+            if self._fallback_session is not None:
+                self._fallback_session.cookies.clear()
+                self._fallback_session.cookies.update(cookies)
+
+    def _count(self, resp):
+        with self._lock:
+            self._stats['requests'] += 1
+            if resp.http_version == 'HTTP/2':
+                self._stats['http2'] += 1
+
+    async def _trace(self, event, info):
+        # httpcore 추적 이벤트: 새 TCP 연결마다 1회
+        if event == 'connection.connect_tcp.complete':
+            with self._lock:
+                self._stats['connections'] += 1
+
+    # ==========================================================
+    # 통계 / 종료
+    # ==========================================================
+    def connection_stats(self):
+        """
+        요청 수 / 새 커넥션 수 / HTTP/2로 보낸 요청 수 / HTTP/1.1 대체 요청 수
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def close(self):
+        if self._loop.is_running():
+            asyncio.run_coroutine_threadsafe(self.client.aclose(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+        if self._fallback_session is not None:
+            self._fallback_session.close()
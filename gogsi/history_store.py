@@ -0,0 +1,535 @@
+# =========================
+# 지원금 이력 저장소 (SQLite, 실행 간 조회용)
+# =========================
+import os
+import re
+import math
+import sqlite3
+from datetime import datetime
+
+
+# 통신사별 원본 컬럼 → 이력 컬럼
+CARRIER_FIELDS = {
+    'SKT': {
+        'maker': '제조사', 'device': '단말명', 'capacity': '용량', 'plan': '요금제명',
+        'signup_type': '가입유형', 'term': '약정기간', 'release_price': '출고가', 'subsidy': '공시지원금',
+        'extra_subsidy': '추가지원금', 'net_price': '실구매가', 'announced_on': '공시일'
+    },
+    'LGU+': {
+        'device': '모델명', 'plan': '요금제명', 'plan_type': '요금제유형', 'signup_type': '가입유형',
+        'term': '약정', 'release_price': '출고가', 'subsidy': '이통사지원금', 'extra_subsidy': '추가지원금',
+        'dealer_subsidy': '유통망지원금', 'total_subsidy': '지원금총액'
+    },
+}
+
+# 가격 구간 값 컬럼 (하나라도 바뀌면 새 구간)
+VALUE_FIELDS = ('release_price', 'subsidy', 'extra_subsidy', 'dealer_subsidy', 'total_subsidy',
+                'net_price', 'announced_on')
+
+# CLI 통신사 이름 → 저장 이름
+CARRIER_NAMES = {'skt': 'SKT', 'lguplus': 'LGU+'}
+
+# 결과 파일명 규칙 (크롤러 / 오케스트레이터 저장 파일)
+# - skt_subsidy_final_HHMMSS / skt_subsidy_delta_HHMMSS (날짜 없음: 파티션 디렉토리 또는 파일 수정 날짜)
+# - lguplus_subsidy[_delta]_YYYYMMDD_HHMMSS / subsidy_all[_delta]_YYYYMMDD_HHMMSS ('통신사' 컬럼)
+ARCHIVE_PATTERN = re.compile(
+    r'^(?P<prefix>skt_subsidy_(?:final|delta)|lguplus_subsidy(?:_delta)?|subsidy_all(?:_delta)?)'
+    r'(?:_(?P<date>\d{8}))?_(?P<time>\d{6})\.(?:xlsx|csv|parquet)$'
+)
+ARCHIVE_CARRIERS = {'skt': 'SKT', 'lguplus': 'LGU+', 'subsidy': None}
+
+
+class HistoryStore:
+    """
+    모든 실행의 지원금을 (통신사, 단말, 요금제, 가입유형, 약정) 키별 가격 구간으로 누적하는 저장소
+    - 단말 / 요금제는 통신사별 차원 테이블로 정규화 (단말명 / 요금제명 검색은 작은 표에서만)
+    - prices 한 행 = 같은 금액이 유지된 구간 [first_seen, last_seen] (금액이 같으면 last_seen만 갱신)
+    - 단말 / 요금제 / 통신사 / 가입유형 / 날짜 색인으로 기간 조회는 수 ms
+    - 실행은 시간순으로 쌓아야 함 (키의 마지막 확인 시각보다 이른 관찰은 건너뜀)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id      INTEGER PRIMARY KEY AUTOINCREMENT,
+                carrier     TEXT NOT NULL,
+                observed_at TEXT NOT NULL,
+                source      TEXT,
+                rows        INTEGER NOT NULL DEFAULT 0,
+                finished_at TEXT
+            );
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_runs_source ON runs (source, carrier)
+                WHERE source IS NOT NULL;
+            CREATE TABLE IF NOT EXISTS devices (
+                device_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                carrier   TEXT NOT NULL,
+                maker     TEXT NOT NULL,
+                name      TEXT NOT NULL,
+                capacity  TEXT NOT NULL,
+                UNIQUE (carrier, name, capacity, maker)
+            );
+            CREATE INDEX IF NOT EXISTS idx_devices_name ON devices (name);
+            CREATE TABLE IF NOT EXISTS plans (
+                plan_id   INTEGER PRIMARY KEY AUTOINCREMENT,
+                carrier   TEXT NOT NULL,
+                name      TEXT NOT NULL,
+                plan_type TEXT NOT NULL,
+                UNIQUE (carrier, name, plan_type)
+            );
+            CREATE INDEX IF NOT EXISTS idx_plans_name ON plans (name);
+            CREATE TABLE IF NOT EXISTS prices (
+                price_id       INTEGER PRIMARY KEY AUTOINCREMENT,
+                carrier        TEXT NOT NULL,
+                device_id      INTEGER NOT NULL,
+                plan_id        INTEGER NOT NULL,
+                signup_type    TEXT NOT NULL,
+                term           TEXT NOT NULL,
+                release_price  INTEGER,
+                subsidy        INTEGER,
+                extra_subsidy  INTEGER,
+                dealer_subsidy INTEGER,
+                total_subsidy  INTEGER,
+                net_price      INTEGER,
+                announced_on   TEXT,
+                first_seen     TEXT NOT NULL,
+                last_seen      TEXT NOT NULL,
+                is_current     INTEGER NOT NULL DEFAULT 1
+            );
+            CREATE INDEX IF NOT EXISTS idx_prices_device ON prices (device_id, signup_type, first_seen);
+            CREATE INDEX IF NOT EXISTS idx_prices_plan ON prices (plan_id, signup_type, first_seen);
+            CREATE INDEX IF NOT EXISTS idx_prices_carrier ON prices (carrier, signup_type, first_seen);
+            CREATE INDEX IF NOT EXISTS idx_prices_date ON prices (first_seen, last_seen);
+            CREATE INDEX IF NOT EXISTS idx_prices_current
+                ON prices (carrier, device_id, plan_id, signup_type, term) WHERE is_current = 1;
+        """)
+        self.conn.commit()
+        
+        # 통신사별 캐시: 단말 / 요금제 ID, 키별 현재 구간 [price_id, 값, last_seen]
+        self._devices = {}
+        self._plans = {}
+        self._current = {}
+        
+        # 진행 중 실행 {run_id: 실행 상태}
+        self._runs = {}
+
+    # ==========================================================
+    # 실행 단위 관리
+    # ==========================================================
+    def begin_run(self, carrier, observed_at=None, source=None):
+        """
+        새 관찰 실행 기록 후 run_id 반환 (source: 가져온 파일 경로, 이미 가져온 파일이면 None)
+        """
+        observed_at = (observed_at or datetime.now()).isoformat(timespec='seconds')
+        try:
+            cur = self.conn.execute(
+                "INSERT INTO runs (carrier, observed_at, source) VALUES (?, ?, ?)",
+                (carrier, observed_at, source)
+            )
+        except sqlite3.IntegrityError:
+            return None
+        
+        self._load_carrier(carrier)
+        self._runs[cur.lastrowid] = {
+            'carrier': carrier, 'observed_at': observed_at, 'seen': set(), 'unchanged': [],
+            'rows': 0, 'new': 0, 'changed': 0, 'stale': 0
+        }
+        return cur.lastrowid
+
+    def finish_run(self, run_id):
+        """
+        실행 종료: 금액이 그대로인 구간의 last_seen 갱신 후 커밋
+        - 반환: {'rows': 관찰 행, 'new': 새 키, 'changed': 금액 변동, 'stale': 더 최근 관찰이 있어 건너뜀}
+        """
+        run = self._runs.pop(run_id)
+        unchanged = run['unchanged']
+        
+        for start in range(0, len(unchanged), 500):
+            chunk = unchanged[start:start + 500]
+            self.conn.execute(
+                f"UPDATE prices SET last_seen = ? WHERE price_id IN ({','.join('?' * len(chunk))})",
+                (run['observed_at'], *chunk)
+            )
+        
+        self.conn.execute(
+            "UPDATE runs SET rows = ?, finished_at = ? WHERE run_id = ?",
+            (run['rows'], datetime.now().isoformat(timespec='seconds'), run_id)
+        )
+        self.conn.commit()
+        return {name: run[name] for name in ('rows', 'new', 'changed', 'stale')}
+
+    def _load_carrier(self, carrier):
+        if carrier in self._current:
+            return
+        
+        self._devices[carrier] = {
+            (maker, name, capacity): device_id
+            for device_id, maker, name, capacity in self.conn.execute(
+                "SELECT device_id, maker, name, capacity FROM devices WHERE carrier = ?", (carrier,)
+            )
+        }
+        self._plans[carrier] = {
+            (name, plan_type): plan_id
+            for plan_id, name, plan_type in self.conn.execute(
+                "SELECT plan_id, name, plan_type FROM plans WHERE carrier = ?", (carrier,)
+            )
+        }
+        self._current[carrier] = {
+            (row[1], row[2], row[3], row[4]): [row[0], tuple(row[5:-1]), row[-1]]
+            for row in self.conn.execute(
+                f"SELECT price_id, device_id, plan_id, signup_type, term, {', '.join(VALUE_FIELDS)}, last_seen "
+                f"FROM prices WHERE carrier = ? AND is_current = 1",
+                (carrier,)
+            )
+        }
+
+    # ==========================================================
+    # 관찰 누적
+    # ==========================================================
+    def append(self, run_id, rows):
+        """
+        원본 행(크롤러 컬럼)을 가격 구간으로 누적
+        - 같은 실행에서 같은 키가 다시 나오면 첫 행만 사용
+        """
+        run = self._runs[run_id]
+        carrier, observed_at = run['carrier'], run['observed_at']
+        fields = CARRIER_FIELDS[carrier]
+        current = self._current[carrier]
+        
+        for row in rows:
+            record = {name: row.get(column) for name, column in fields.items()}
+            device = _text(record.get('device'))
+            if not device:
+                continue
+            
+            device_id = self._device_id(carrier, _text(record.get('maker')), device,
+                                        _text(record.get('capacity')))
+            plan_id = self._plan_id(carrier, _text(record.get('plan')), _text(record.get('plan_type')))
+            key = (device_id, plan_id, _text(record.get('signup_type')), _text(record.get('term')))
+            if key in run['seen']:
+                continue
+            run['seen'].add(key)
+            run['rows'] += 1
+            
+            values = tuple(
+                _text(record.get(name)) or None if name == 'announced_on' else _amount(record.get(name))
+                for name in VALUE_FIELDS
+            )
+            
+            found = current.get(key)
+            if found is not None and found[2] >= observed_at:
+                run['stale'] += 1
+                continue
+            if found is not None and found[1] == values:
+                run['unchanged'].append(found[0])
+                found[2] = observed_at
+                continue
+            
+            if found is None:
+                run['new'] += 1
+            else:
+                run['changed'] += 1
+                self.conn.execute("UPDATE prices SET is_current = 0 WHERE price_id = ?", (found[0],))
+            
+            cur = self.conn.execute(
+                f"INSERT INTO prices (carrier, device_id, plan_id, signup_type, term, {', '.join(VALUE_FIELDS)}, "
+                f"first_seen, last_seen) VALUES (?, ?, ?, ?, ?, {', '.join('?' * len(VALUE_FIELDS))}, ?, ?)",
+                (carrier, *key, *values, observed_at, observed_at)
+            )
+            current[key] = [cur.lastrowid, values, observed_at]
+
+    def _device_id(self, carrier, maker, name, capacity):
+        cache = self._devices[carrier]
+        key = (maker, name, capacity)
+        if key not in cache:
+            cache[key] = self.conn.execute(
+                "INSERT INTO devices (carrier, maker, name, capacity) VALUES (?, ?, ?, ?)",
+                (carrier, maker, name, capacity)
+            ).lastrowid
+        return cache[key]
+
+    def _plan_id(self, carrier, name, plan_type):
+        cache = self._plans[carrier]
+        key = (name, plan_type)
+        if key not in cache:
+            cache[key] = self.conn.execute(
+                "INSERT INTO plans (carrier, name, plan_type) VALUES (?, ?, ?)",
+                (carrier, name, plan_type)
+            ).lastrowid
+        return cache[key]
+
+    # ==========================================================
+    # 기존 결과 파일 가져오기
+    # ==========================================================
+    def import_file(self, path):
+        """
+        크롤러 결과 파일 1개 가져오기 (xlsx / csv / parquet)
+        - 통신사 / 관찰 시각은 파일명 규칙으로 판단 (parse_archive_name)
+        - 변동분 파일은 삭제('removed') 행을 빼고 추가 / 변경 행만 반영
+        - 반환: {통신사: finish_run 요약} (이미 가져온 파일이면 빈 dict)
+        """
+        from tables import read_table_file
+        
+        carrier, observed_at = parse_archive_name(path)
+        source = os.path.abspath(path)
+        
+        frame = read_table_file(path)
+        frame = frame.astype(object).where(frame.notna(), None)
+        if '변동유형' in frame.columns:
+            frame = frame[frame['변동유형'] != 'removed']
+        
+        if carrier is None:
+            groups = [(name, group) for name, group in frame.groupby('통신사', sort=False)]
+        else:
+            groups = [(carrier, frame)]
+        
+        summaries = {}
+        for name, group in groups:
+            if name not in CARRIER_FIELDS:
+                continue
+            run_id = self.begin_run(name, observed_at, source)
+            if run_id is None:
+                continue
+            self.append(run_id, group.to_dict('records'))
+            summaries[name] = self.finish_run(run_id)
+        return summaries
+
+    # ==========================================================
+    # 조회
+    # ==========================================================
+    def query(self, device=None, plan=None, carrier=None, signup_type=None, term=None,
+              since=None, until=None, limit=None):
+        """
+        조건에 맞는 가격 구간 목록 (키별 시간순)
+        - device / plan: 이름 일부 (대소문자 무시), carrier: 'SKT' / 'LGU+' 또는 목록
+        - since / until: 'YYYY-MM-DD' 또는 ISO 시각, 이 기간과 겹치는 구간만
+        - 반환: [{'carrier', 'maker', 'device', 'capacity', 'plan', 'plan_type', 'signup_type', 'term',
+                  금액 컬럼..., 'first_seen', 'last_seen'}, ...]
+        """
+        where, params = [], []
+        
+        if isinstance(carrier, str):
+            carrier = [carrier]
+        if carrier:
+            where.append(f"p.carrier IN ({','.join('?' * len(carrier))})")
+            params.extend(carrier)
+        
+        # 이름 검색은 작은 차원 테이블에서 ID를 먼저 찾고, 가격 구간은 ID 색인으로 조회
+        for column, table, pattern in (('device_id', 'devices', device), ('plan_id', 'plans', plan)):
+            if not pattern:
+                continue
+            ids = [row[0] for row in self.conn.execute(
+                f"SELECT {column} FROM {table} WHERE name LIKE ?", (f"%{pattern}%",)
+            )]
+            if not ids:
+                return []
+            where.append(f"p.{column} IN ({','.join('?' * len(ids))})")
+            params.extend(ids)
+        
+        if signup_type:
+            where.append("p.signup_type = ?")
+            params.append(signup_type)
+        if term:
+            where.append("p.term = ?")
+            params.append(term)
+        if since:
+            where.append("p.last_seen >= ?")
+            params.append(since)
+        if until:
+            where.append("p.first_seen <= ?")
+            params.append(f"{until}T23:59:59" if len(until) == 10 else until)
+        
+        sql = (
+            f"SELECT p.carrier, d.maker, d.name, d.capacity, l.name, l.plan_type, p.signup_type, p.term, "
+            f"{', '.join('p.' + name for name in VALUE_FIELDS)}, p.first_seen, p.last_seen "
+            f"FROM prices p JOIN devices d ON d.device_id = p.device_id JOIN plans l ON l.plan_id = p.plan_id"
+            + (f" WHERE {' AND '.join(where)}" if where else '')
+            + " ORDER BY p.carrier, d.name, d.capacity, l.name, p.signup_type, p.term, p.first_seen"
+            + (f" LIMIT {int(limit)}" if limit else '')
+        )
+        columns = ('carrier', 'maker', 'device', 'capacity', 'plan', 'plan_type', 'signup_type', 'term',
+                   *VALUE_FIELDS, 'first_seen', 'last_seen')
+        return [dict(zip(columns, row)) for row in self.conn.execute(sql, params)]
+
+    def movements(self, field='subsidy', **filters):
+        """
+        query 결과를 키별로 묶어 금액 흐름 요약
+        - 반환: [{'carrier', 'device', 'plan', 'signup_type', 'term', 'points': [(first_seen, 금액), ...],
+                  'start', 'end', 'delta'}, ...] (같은 금액이 이어진 구간은 하나로 합침)
+        """
+        series = []
+        for row in self.query(**filters):
+            key = (row['carrier'], row['device'], row['capacity'], row['plan'], row['plan_type'],
+                   row['signup_type'], row['term'])
+            if not series or series[-1]['key'] != key:
+                series.append({
+                    'key': key, 'carrier': row['carrier'],
+                    'device': ' '.join(filter(None, (row['device'], row['capacity']))),
+                    'plan': row['plan'], 'signup_type': row['signup_type'], 'term': row['term'], 'points': []
+                })
+            points = series[-1]['points']
+            if not points or points[-1][1] != row[field]:
+                points.append((row['first_seen'], row[field]))
+        
+        for item in series:
+            del item['key']
+            item['start'], item['end'] = item['points'][0][1], item['points'][-1][1]
+            item['delta'] = (item['end'] - item['start']
+                             if item['start'] is not None and item['end'] is not None else None)
+        return series
+
+    def stats(self):
+        """
+        통신사별 실행 수 / 단말 수 / 요금제 수 / 가격 구간 수 / 관찰 기간
+        """
+        stats = {}
+        for carrier, runs, first, last in self.conn.execute(
+            "SELECT carrier, COUNT(*), MIN(observed_at), MAX(observed_at) FROM runs GROUP BY carrier"
+        ):
+            stats[carrier] = {'runs': runs, 'first': first, 'last': last}
+        for table, name in (('devices', 'devices'), ('plans', 'plans'), ('prices', 'prices')):
+            for carrier, count in self.conn.execute(f"SELECT carrier, COUNT(*) FROM {table} GROUP BY carrier"):
+                stats.setdefault(carrier, {})[name] = count
+        return stats
+
+    def close(self):
+        # 실행 도중 멈춘 수집도 그때까지 관찰한 구간은 보존
+        for run_id in list(self._runs):
+            self.finish_run(run_id)
+        self.conn.commit()
+        self.conn.close()
+
+
+def _text(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ''
+    return str(value).strip()
+
+
+def _amount(value):
+    text = _text(value).replace(',', '').replace('원', '')
+    if not text:
+        return None
+    try:
+        return int(float(text))
+    except ValueError:
+        return None
+
+
+def parse_archive_name(path):
+    """
+    결과 파일 경로 → (통신사 또는 None('통신사' 컬럼 사용), 관찰 시각 datetime)
+    - 날짜가 파일명에 없으면 파티션 디렉토리(date=YYYY-MM-DD), 그것도 없으면 파일 수정 날짜
+    """
+    name = os.path.basename(path)
+    found = ARCHIVE_PATTERN.match(name)
+    if found is None:
+        raise ValueError(f"결과 파일명 규칙과 다름: {name}")
+
+    carrier = ARCHIVE_CARRIERS[found.group('prefix').split('_')[0]]
+
+    date = found.group('date')
+    if date is None:
+        partition = re.search(r'date=(\d{4})-(\d{2})-(\d{2})', path)
+        if partition:
+            date = ''.join(partition.groups())
+        else:
+            date = datetime.fromtimestamp(os.path.getmtime(path)).strftime('%Y%m%d')
+
+    return carrier, datetime.strptime(date + found.group('time'), '%Y%m%d%H%M%S')
+
+
+def archive_files(paths):
+    """
+    파일 / 디렉토리 목록 → 가져올 결과 파일 [(관찰 시각, 경로), ...] 시간순
+    (규칙에 맞지 않는 파일: 조기 스냅샷 / 중복 제거 표 / 색인 등은 제외)
+    """
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            candidates = [os.path.join(root, name) for root, _, names in os.walk(path) for name in names]
+        else:
+            candidates = [path]
+        
+        for candidate in candidates:
+            if ARCHIVE_PATTERN.match(os.path.basename(candidate)):
+                found.append((parse_archive_name(candidate)[1], candidate))
+
+    return sorted(found)
+
+
+# ==========================================================
+# 실행 진입점
+# ==========================================================
+if __name__ == "__main__":
+    import time
+    import argparse
+
+    parser = argparse.ArgumentParser(description="지원금 이력 저장소 조회 / 기존 결과 파일 가져오기")
+    parser.add_argument('--history-store', default='/app/output/subsidy_history.sqlite', help='이력 저장소 경로')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    importer = commands.add_parser('import', help='기존 결과 파일(xlsx / csv / parquet)을 시간순으로 가져오기')
+    importer.add_argument('paths', nargs='+', help='결과 파일 또는 디렉토리')
+
+    query = commands.add_parser('query', help='단말 / 요금제 / 가입유형 / 기간별 지원금 흐름')
+    query.add_argument('--device', help='단말명 일부 (예: S24)')
+    query.add_argument('--plan', help='요금제명 일부')
+    query.add_argument('--carriers', nargs='+', choices=['skt', 'lguplus'])
+    query.add_argument('--signup', help='가입유형 (예: 번호이동)')
+    query.add_argument('--term', help='약정 (예: 24개월)')
+    query.add_argument('--since', help='시작 날짜 (YYYY-MM-DD, 기본: 이번 달 1일)')
+    query.add_argument('--until', help='끝 날짜 (YYYY-MM-DD)')
+    query.add_argument('--field', choices=VALUE_FIELDS[:-1], default='subsidy', help='금액 컬럼')
+    query.add_argument('--changed-only', action='store_true', help='기간 중 금액이 바뀐 키만')
+    query.add_argument('--limit', type=int, default=50, help='출력할 키 수')
+
+    commands.add_parser('stats', help='통신사별 저장 현황')
+    args = parser.parse_args()
+
+    store = HistoryStore(args.history_store)
+
+    if args.command == 'import':
+        files = archive_files(args.paths)
+        print(f"📂 가져올 결과 파일: {len(files)}개")
+        for observed_at, path in files:
+            summaries = store.import_file(path)
+            if not summaries:
+                print(f"⏭️  {os.path.basename(path)}: 이미 가져온 파일")
+            for carrier, s in summaries.items():
+                print(f"✅ {os.path.basename(path)} [{carrier}] {observed_at:%Y-%m-%d %H:%M} | "
+                      f"행 {s['rows']:,} / 새 키 {s['new']:,} / 변동 {s['changed']:,}"
+                      + (f" / 이전 시각 건너뜀 {s['stale']:,}" if s['stale'] else ''))
+
+    elif args.command == 'query':
+        start = time.perf_counter()
+        series = store.movements(
+            field=args.field, device=args.device, plan=args.plan,
+            carrier=[CARRIER_NAMES[c] for c in args.carriers] if args.carriers else None,
+            signup_type=args.signup, term=args.term,
+            since=args.since or datetime.now().strftime('%Y-%m-01'), until=args.until
+        )
+        elapsed = (time.perf_counter() - start) * 1000
+        
+        if args.changed_only:
+            series = [item for item in series if len(item['points']) > 1]
+        
+        for item in series[:args.limit]:
+            flow = ' → '.join(
+                f"{'-' if amount is None else f'{amount:,}'} ({seen[5:10]})" for seen, amount in item['points']
+            )
+            delta = f" [{item['delta']:+,}]" if item['delta'] else ''
+            print(f"[{item['carrier']}] {item['device']} | {item['plan']} | {item['signup_type']} "
+                  f"{item['term']}: {flow}{delta}")
+        
+        if len(series) > args.limit:
+            print(f"... 외 {len(series) - args.limit:,}개 키")
+        print(f"\n🔎 키 {len(series):,}개 / 조회 {elapsed:.1f}ms")
+
+    else:
+        for carrier, s in store.stats().items():
+            print(f"📊 {carrier}: 실행 {s.get('runs', 0):,}회 ({s.get('first')} ~ {s.get('last')}) | "
+                  f"단말 {s.get('devices', 0):,} / 요금제 {s.get('plans', 0):,} / 가격 구간 {s.get('prices', 0):,}")
+
+    store.close()
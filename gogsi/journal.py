@@ -0,0 +1,81 @@
+# =========================
+# 체크포인트 저널 (완료 작업 기록 / 재개)
+# =========================
+import os
+import json
+from datetime import datetime
+
+
+class TaskJournal:
+    """
+    완료된 작업 키와 결과 행을 한 줄씩 덧붙이는 체크포인트 파일 (JSONL)
+    - 첫 줄은 헤더 {'carrier', 'started_at'}, 이후 {'key', 'rows'}
+    - 결과가 도착할 때마다 flush → 컨테이너가 죽어도 완료분은 파일에 남음
+    - 행은 증분 비교 전 원본 (재개 시 저장소 비교를 다시 거쳐 같은 변동분 생성)
+    - resume=True면 기존 기록을 불러와 completed에 보관하고 이어서 기록
+    """
+
+    def __init__(self, path, carrier, resume=False):
+        self.path = path
+        self.carrier = carrier
+        self.completed = {}
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        
+        if resume:
+            self._load()
+        
+        # 잘린 마지막 줄이 남지 않도록 유효한 기록만 다시 쓰고 이어서 기록
+        self._file = open(path, 'w', encoding='utf-8')
+        self._write({'carrier': carrier, 'started_at': self.started_at})
+        for key, rows in self.completed.items():
+            self._write({'key': key, 'rows': rows})
+        self._file.flush()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        
+        with open(self.path, encoding='utf-8') as f:
+            try:
+                header = json.loads(f.readline())
+            except ValueError:
+                return
+            
+            if header.get('carrier') != self.carrier:
+                print(f"⚠️  [{self.carrier}] 다른 통신사의 체크포인트라 무시: {self.path}")
+                return
+            
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # 프로세스가 죽으며 잘린 마지막 줄
+                    break
+                self.completed[entry['key']] = entry['rows']
+        
+        self.started_at = header.get('started_at', self.started_at)
+
+    def _write(self, entry):
+        self._file.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+
+    def pop(self, key):
+        """
+        재개 대상이면 기록된 행 반환 (없으면 None)
+        """
+        return self.completed.pop(key, None)
+
+    def append(self, key, rows):
+        self._write({'key': key, 'rows': rows})
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def discard(self):
+        """
+        실행이 끝까지 완료되면 체크포인트 삭제
+        """
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -1,446 +1,1323 @@
-# =========================
-# 필수 라이브러리 import
-# =========================
-import requests
-import json
-import time
-import random
-import pandas as pd
-from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-import urllib3
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-
-# SSL 인증서 경고 무시 (verify=False 사용 시 발생)
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-
-class LGUplusCrawler:
-    """
-    LG U+ 공시지원금 정보를 안정적으로 수집하는 크롤러
-    - Selenium으로 쿠키 획득 (Cloudflare 우회)
-    - requests.Session + Retry 전략
-    - ThreadPoolExecutor 병렬 처리
-    - 봇 탐지 회피를 위한 랜덤 딜레이 및 User-Agent 다양화
-    """
-
-    def __init__(self):
-        # =========================
-        # 기본 설정 값
-        # =========================
-        self.base_url = "https://www.lguplus.com"
-
-        # 출력 디렉토리 설정 (Docker 볼륨)
-        import os
-        self.output_dir = "/app/output"
-        os.makedirs(self.output_dir, exist_ok=True)
-
-        # 봇 탐지 회피용 User-Agent 목록
-        self.user_agents = [
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15'
-        ]
-        
-        # 가입 유형 코드 → 한글 매핑
-        self.signup_type_map = {
-            '1': '기기변경',
-            '2': '번호이동',
-            '3': '신규가입'
-        }
-        
-        # 쿠키 저장소
-        self.cookies = None
-
-    # ==========================================================
-    # 1단계: Selenium으로 쿠키 획득
-    # ==========================================================
-    def get_cookies_from_selenium(self):
-        """
-        Selenium으로 페이지 접속 후 쿠키 획득 (Cloudflare 우회)
-        """
-        print("\n🔐 쿠키 획득 중 (Selenium)...")
-        
-        options = Options()
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
-        options.add_argument(f'user-agent={random.choice(self.user_agents)}')
-        
-        # Docker 환경 감지
-        import os
-        is_docker = os.getenv('RUNNING_IN_DOCKER') == 'true'
-        
-        if is_docker:
-            options.add_argument('--headless=new')
-            options.add_argument('--ignore-certificate-errors')
-            options.add_argument('--ignore-ssl-errors')
-            options.add_argument('--disable-gpu')
-            options.add_argument('--window-size=1920,1080')
-            options.add_argument('--disable-extensions')
-            options.add_argument('--proxy-server="direct://"')
-            options.add_argument('--proxy-bypass-list=*')
-            options.add_argument('--start-maximized')
-            options.add_argument('--disable-blink-features=AutomationControlled')
-            options.add_experimental_option('excludeSwitches', ['enable-logging'])
-            options.binary_location = '/usr/bin/chromium'
-        else:
-            print("[Local] 환경에서 실행 중")
-        
-        try:
-            if is_docker:
-                from selenium.webdriver.chrome.service import Service
-                service = Service('/usr/bin/chromedriver')
-                driver = webdriver.Chrome(service=service, options=options)
-            else:
-                try:
-                    from selenium.webdriver.chrome.service import Service
-                    from webdriver_manager.chrome import ChromeDriverManager
-                    service = Service(ChromeDriverManager().install())
-                    driver = webdriver.Chrome(service=service, options=options)
-                except:
-                    driver = webdriver.Chrome(options=options)
-            
-            # LG U+ 페이지 접속
-            url = f'{self.base_url}/mobile/financing-model'
-            print(f"🌐 페이지 접속 중: {url}")
-            driver.get(url)
-            
-            # 초기 대기
-            time.sleep(5)
-            
-            # 페이지 타이틀 확인
-            print(f"📄 페이지 타이틀: {driver.title}")
-            
-            # Cloudflare 체크 대기
-            print("⏳ Cloudflare 우회 대기 중... (30초)")
-            time.sleep(30)
-            
-            # 쿠키 추출 전 재확인
-            print(f"📄 최종 페이지 타이틀: {driver.title}")
-            
-            # 쿠키 추출 및 필터링
-            cookies = driver.get_cookies()
-            print(f"🍪 전체 쿠키 개수: {len(cookies)}")
-            
-            cookie_dict = {}
-            for cookie in cookies:
-                try:
-                    cookie['value'].encode('latin-1')
-                    cookie_dict[cookie['name']] = cookie['value']
-                except UnicodeEncodeError:
-                    print(f"⚠️  쿠키 건너뜀 (인코딩 오류): {cookie['name']}")
-            
-            driver.quit()
-            
-            if cookie_dict:
-                print(f"✅ 쿠키 획득 완료: {len(cookie_dict)}개")
-                return cookie_dict
-            else:
-                print("⚠️  쿠키가 없습니다. Cloudflare가 차단했을 수 있습니다.")
-                return None
-            
-        except Exception as e:
-            print(f"❌ 쿠키 획득 실패: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
-
-
-    # ==========================================================
-    # 2단계: 요금제 코드 리스트 조회
-    # ==========================================================
-    def get_plan_codes(self):
-        """
-        요금제 카테고리별 코드 리스트 조회 (5G, LTE)
-        """
-        print("\n📋 요금제 코드 수집 중...")
-        
-        # Retry 전략 설정
-        retry_strategy = Retry(
-            total=5,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504]
-        )
-        
-        session = requests.Session()
-        adapter = HTTPAdapter(max_retries=retry_strategy, pool_connections=10, pool_maxsize=20)
-        session.mount("https://", adapter)
-        
-        session.cookies.update(self.cookies)
-        session.headers.update({
-            'User-Agent': random.choice(self.user_agents),
-            'Accept': 'application/json, text/plain, */*',
-            'Referer': f'{self.base_url}/mobile/financing-model'
-        })
-        
-        api_url = f'{self.base_url}/uhdc/fo/prdv/mdlbsufu/v1/mdlb-pp-list'
-        all_plans = []
-        
-        # 요금제 카테고리별 조회
-        categories = [
-            ('00', '5G'),
-            ('01', 'LTE')
-        ]
-        
-        for cat_code, cat_name in categories:
-            try:
-                params = {
-                    'hphnPpGrpKwrdCd': cat_code,
-                    '_': int(time.time() * 1000)  # 캐시 방지
-                }
-                response = session.get(api_url, params=params, verify=False, timeout=10)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    count = 0
-                    
-                    for group in data.get('dvicMdlbSufuPpList', []):
-                        for plan in group.get('dvicMdlbSufuPpDetlList', []):
-                            all_plans.append({
-                                'code': plan['urcMblPpCd'],
-                                'name': plan['urcMblPpNm'],
-                                'type': cat_name
-                            })
-                            count += 1
-                    
-                    print(f"  ✅ {cat_name}: {count}개")
-                else:
-                    print(f"  ❌ {cat_name} 실패: {response.status_code}")
-                
-                # 카테고리 간 딜레이
-                time.sleep(random.uniform(0.1, 0.3))
-                
-            except Exception as e:
-                print(f"  ❌ {cat_name} 에러: {e}")
-        
-        session.close()
-        print(f"✅ 총 {len(all_plans)}개 요금제 수집 완료\n")
-        
-        return all_plans
-
-    # ==========================================================
-    # 3단계: 공시지원금 상세 조회 (병렬 워커)
-    # ==========================================================
-    def fetch_subsidy_worker(self, task):
-        """
-        단일 요금제 + 가입유형 조합에 대해
-        공시지원금 데이터를 수집하는 워커 함수
-        """
-        plan = task['plan']
-        signup_code = task['signup_code']
-        signup_name = task['signup_name']
-        
-        # 봇 탐지 회피: 랜덤 딜레이
-        time.sleep(random.uniform(0.05, 0.2))
-        
-        # Retry 전략 설정
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504]
-        )
-        
-        session = requests.Session()
-        adapter = HTTPAdapter(max_retries=retry_strategy, pool_connections=5, pool_maxsize=10)
-        session.mount("https://", adapter)
-        
-        session.cookies.update(self.cookies)
-        session.headers.update({
-            'User-Agent': random.choice(self.user_agents),
-            'Accept': 'application/json, text/plain, */*',
-            'Referer': f'{self.base_url}/mobile/financing-model'
-        })
-        
-        api_url = f'{self.base_url}/uhdc/fo/prdv/mdlbsufu/v2/mdlb-sufu-list'
-        result_data = []
-        
-        try:
-            params = {
-                'onlnOrdrPsblEposDivsCd': 'Y',
-                'urcHphnEntrPsblKdCd': signup_code,
-                'urcMblPpCd': plan['code'],
-                'shwd': '',
-                'sortOrd': '01',
-                'urcWlcmAplyDivsCd': 'NONE',
-                'pageNo': '1',
-                'rowSize': '10',
-                '_': int(time.time() * 1000)
-            }
-            
-            response = session.get(api_url, params=params, verify=False, timeout=15)
-            
-            if response.status_code != 200:
-                return []
-            
-            data = response.json()
-            models = data.get('dvicMdlbSufuDtoList', [])
-            total_count = data.get('totalCnt', 0)
-            
-            all_models = models.copy()
-            
-            # 페이징 처리
-            if total_count > 10:
-                import math
-                total_pages = math.ceil(total_count / 10)
-                
-                for page in range(2, total_pages + 1):
-                    time.sleep(random.uniform(0.05, 0.15))
-                    
-                    params['pageNo'] = str(page)
-                    params['_'] = int(time.time() * 1000)
-                    
-                    resp = session.get(api_url, params=params, verify=False, timeout=15)
-                    if resp.status_code == 200:
-                        all_models.extend(resp.json().get('dvicMdlbSufuDtoList', []))
-            
-            # 데이터 저장
-            for model in all_models:
-                # 6개월 약정
-                result_data.append({
-                    '요금제명': plan['name'],
-                    '요금제유형': plan['type'],
-                    '가입유형': signup_name,
-                    '약정': '6개월',
-                    '모델명': model.get('urcTrmMdlNm'),
-                    '출고가': model.get('dlvrPrc'),
-                    '이통사지원금': model.get('sixPlanPuanSuptAmt'),
-                    '추가지원금': model.get('sixPlanAddSuptAmt'),
-                    '유통망지원금': model.get('dsnwSupportAmt'),
-                    '지원금총액': model.get('sixPlanSuptTamt')
-                })
-                
-                # 기본 약정
-                result_data.append({
-                    '요금제명': plan['name'],
-                    '요금제유형': plan['type'],
-                    '가입유형': signup_name,
-                    '약정': '기본',
-                    '모델명': model.get('urcTrmMdlNm'),
-                    '출고가': model.get('dlvrPrc'),
-                    '이통사지원금': model.get('basicPlanPuanSuptAmt'),
-                    '추가지원금': model.get('basicPlanAddSuptAmt'),
-                    '유통망지원금': model.get('dsnwSupportAmt'),
-                    '지원금총액': model.get('basicPlanSuptTamt')
-                })
-            
-            return result_data
-            
-        except Exception:
-            return []
-        finally:
-            session.close()
-
-    # ==========================================================
-    # 4단계: Excel 저장
-    # ==========================================================
-    def save_to_excel(self, data):
-        """
-        수집된 데이터를 Excel 파일로 저장
-        """
-        import os
-        print("\n💾 Excel 파일 저장 중...")
-
-        # pandas DataFrame으로 변환 및 저장
-        df = pd.DataFrame(data)
-        filename = f'lguplus_subsidy_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
-        # 출력 파일 경로를 /app/output 디렉토리로 설정
-        output_path = os.path.join(self.output_dir, filename)
-        df.to_excel(output_path, index=False)
-
-        print(f"✅ 파일 저장 완료: {filename}")
-        print(f"📂 저장 위치: {output_path}")
-        return filename
-
-    # ==========================================================
-    # 전체 실행 로직
-    # ==========================================================
-    def run(self, max_threads=5):
-        """
-        전체 크롤링 실행 함수
-        """
-        start_time = time.time()
-        
-        print("\n" + "🚀" * 40)
-        print("LG U+ 지원금 크롤러")
-        print("🚀" * 40)
-        
-        # 1단계: 쿠키 획득
-        self.cookies = self.get_cookies_from_selenium()
-        if not self.cookies:
-            print("\n❌ 쿠키 획득 실패")
-            return
-        
-        # 2단계: 요금제 코드 수집
-        plan_codes = self.get_plan_codes()
-        if not plan_codes:
-            print("\n❌ 요금제 코드 수집 실패")
-            return
-        
-        # 작업 목록 생성
-        all_tasks = []
-        for plan in plan_codes:
-            for signup_code, signup_name in self.signup_type_map.items():
-                all_tasks.append({
-                    'plan': plan,
-                    'signup_code': signup_code,
-                    'signup_name': signup_name
-                })
-        
-        total_tasks = len(all_tasks)
-        print(f"🔄 총 {total_tasks}개 작업 생성 완료")
-        print(f"⚙️  병렬 처리: {max_threads}개 스레드\n")
-        
-        final_data = []
-        
-        # =========================
-        # 3단계: 병렬 처리로 데이터 수집
-        # =========================
-        with ThreadPoolExecutor(max_workers=max_threads) as executor:
-            futures = {
-                executor.submit(self.fetch_subsidy_worker, task): task
-                for task in all_tasks
-            }
-            
-            for i, future in enumerate(as_completed(futures), 1):
-                res = future.result()
-                
-                if res:
-                    final_data.extend(res)
-                
-                if i % 50 == 0 or i == total_tasks:
-                    print(f"📊 진행률: {i}/{total_tasks} ({i/total_tasks*100:.1f}%) | 수집 데이터: {len(final_data):,}건")
-        
-        # =========================
-        # 4단계: 결과 저장
-        # =========================
-        if final_data:
-            filename = self.save_to_excel(final_data)
-            
-            elapsed_time = time.time() - start_time
-            minutes = int(elapsed_time // 60)
-            seconds = int(elapsed_time % 60)
-            
-            print(f"\n🎉 수집 성공!")
-            print(f"📂 파일명: {filename}")
-            print(f"📊 데이터: {len(final_data):,}건")
-            print(f"⏱️  실행 시간: {minutes}분 {seconds}초\n")
-        else:
-            print("\n❌ 수집된 데이터가 없습니다.")
-
-
-# ==========================================================
-# 실행 진입점
-# ==========================================================
-if __name__ == "__main__":
-    crawler = LGUplusCrawler()
-    
-    # 안정성을 위해 스레드 수 제한 (기본 5개)
-    crawler.run(max_threads=5)
\ No newline at end of file
+# =========================
+# 필수 라이브러리 import
+# =========================
+import requests
+import json
+import time
+import math
+import random
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import urllib3
+
+from carrier import CarrierPlugin
+from dead_letter import TaskFailure
+from metrics import RunMetrics
+from rate_limit import host_limiter
+from records import ColumnBuffer
+
+# SSL 인증서 경고 무시 (verify=False 사용 시 발생)
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+
+class ClearanceLost(TaskFailure):
+    """
+    Cloudflare 통과 쿠키가 더 이상 통하지 않음 (챌린지 / 차단 응답)
+    - generation: 해당 요청이 실어 보낸 쿠키 세대 (갱신 중복 방지용)
+    """
+
+    def __init__(self, generation, status_code=None):
+        super().__init__('clearance', f"Cloudflare 통과 쿠키 만료 (HTTP {status_code})")
+        self.generation = generation
+        self.status_code = status_code
+
+
+class LGUplusCrawler(CarrierPlugin):
+    """
+    LG U+ 공시지원금 정보를 안정적으로 수집하는 크롤러
+    - Selenium으로 쿠키 획득 (Cloudflare 우회) + 실행 간 쿠키 캐시 재사용
+    - 실행 중 통과 쿠키를 잃으면 조회를 멈추고 쿠키 갱신 후 해당 작업 재조회
+    - 스레드별 requests.Session 재사용 (keep-alive) + Retry 전략
+    - ThreadPoolExecutor 병렬 처리
+    - 봇 탐지 회피를 위한 호스트 단위 토큰 버킷 속도 제한 및 User-Agent 다양화
+    """
+
+    # 요금제 카테고리 (코드, 이름) - 카탈로그 그룹 단위
+    PLAN_CATEGORIES = (('00', '5G'), ('01', 'LTE'))
+
+    # rowSize 탐색 후보 (큰 값부터 시도, 서버가 거부하면 기본 10 사용)
+    ROW_SIZE_CANDIDATES = (100, 50, 30, 20)
+
+    # 증분 수집 시 단말 식별 컬럼 / 변동 기록 금액 컬럼
+    CARRIER = 'LGU+'
+    TERMS = ('6개월', '기본')
+    STORE_DEVICE_FIELDS = ('모델명',)
+    STORE_AMOUNT_FIELD = '이통사지원금'
+    TABLE_KEY_FIELDS = ('요금제명', '요금제유형', '가입유형', '약정')
+
+    # 결과 컬럼 (문자열은 사전 인코딩, 금액은 정수 컬럼)
+    COLUMNS = (
+        ('요금제명', 'str'), ('요금제유형', 'str'), ('가입유형', 'str'), ('약정', 'str'),
+        ('모델명', 'str'), ('출고가', 'int'), ('이통사지원금', 'int'), ('추가지원금', 'int'),
+        ('유통망지원금', 'int'), ('지원금총액', 'int')
+    )
+
+    def __init__(self, base_url="https://www.lguplus.com", output_dir="/app/output",
+                 paging='serial', page_concurrency=4, store=None,
+                 output_format='xlsx', partition=None, controller=None, http2=False,
+                 warm_browser=False):
+        # =========================
+        # 기본 설정 값
+        # =========================
+        self.base_url = base_url
+
+        # 출력 디렉토리 설정 (Docker 볼륨)
+        import os
+        self.output_dir = output_dir
+        os.makedirs(self.output_dir, exist_ok=True)
+        
+        # 저장 형식 (xlsx / csv / parquet), 파티션 미지정 시 parquet만 통신사/날짜별 분할
+        self.output_format = output_format
+        self.partition = (output_format == 'parquet') if partition is None else partition
+
+        # 봇 탐지 회피용 User-Agent 목록
+        self.user_agents = [
+            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
+            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15'
+        ]
+        
+        # 가입 유형 코드 → 한글 매핑
+        self.signup_type_map = {
+            '1': '기기변경',
+            '2': '번호이동',
+            '3': '신규가입'
+        }
+        
+        # 쿠키 저장소 + 실행 간 재사용 캐시 (출력 볼륨에 보관)
+        self.cookies = None
+        self.cookie_cache_path = os.path.join(self.output_dir, '.lguplus_cookie_cache.json')
+        self.cookie_cache_ttl = 3600
+        
+        # 실행 중 쿠키 갱신 (챌린지 응답 감지 → 전체 요청 일시 정지 → 갱신 → 재개)
+        # - 쿠키 세대: 갱신할 때마다 +1, 같은 만료를 여러 스레드가 감지해도 갱신은 1번
+        # - warm_browser=True: 헤드리스 브라우저 1개를 실행 내내 열어 두고 갱신에 재사용
+        self.warm_browser = warm_browser
+        self.max_cookie_refreshes = 5
+        self._browser = None
+        self._browser_thread = None
+        self._clearance_ok = threading.Event()
+        self._clearance_ok.set()
+        self._clearance_lock = threading.Lock()
+        self._cookie_generation = 0
+        self._cookie_refreshes = 0
+        self._clearance_failed = False
+        
+        # 요금제 카탈로그 캐시 (TTL 이내면 재사용)
+        self.catalog_cache_path = os.path.join(self.output_dir, '.lguplus_catalog_cache.json')
+        
+        # 체크포인트 저널 (완료 작업 + 행, --resume 시 이어서 수집)
+        self.journal_path = os.path.join(self.output_dir, '.lguplus_journal.jsonl')
+        
+        # 스레드별 세션 (실행 내내 keep-alive 커넥션 유지)
+        self._local = threading.local()
+        self._sessions = []
+        self._sessions_lock = threading.Lock()
+        
+        # HTTP/2 다중화 전송: 스레드별 세션 대신 모든 스레드가 공유하는 세션 1개
+        self.http2 = http2
+        self._h2_session = None
+        
+        # 페이징 모드: 'serial' (rowSize=10 순차) / 'concurrent' (rowSize 탐색 + 병렬)
+        # (페이지 요청도 호스트 공유 토큰 버킷을 거침)
+        self.paging = paging
+        self.page_concurrency = page_concurrency
+        self._page_executor = None
+        self._page_pool_lock = threading.Lock()
+        self._row_size = None
+        self._row_size_lock = threading.Lock()
+        
+        # 적응형 동시성 제어기 (rate_limit.AIMDController, 없으면 고정 스레드 수)
+        self.controller = controller
+        
+        # 증분 수집 저장소 (result_store.ResultStore, 없으면 전체 수집)
+        self.store = store
+        
+        # 실행 계측 (단계별 시간 / 엔드포인트 지연 / 재시도·오류 카운터)
+        self.metrics = RunMetrics(self.CARRIER)
+
+    # ==========================================================
+    # 1단계: 쿠키 획득 (캐시 → Selenium)
+    # ==========================================================
+    def get_cookies(self):
+        """
+        캐시된 쿠키가 유효하면 재사용, 아니면 Selenium으로 새로 획득
+        """
+        cached = self.load_cookie_cache()
+        if cached and self.validate_cookies(cached):
+            print(f"♻️  캐시 쿠키 재사용: {len(cached)}개")
+            return cached
+        
+        return self.get_cookies_from_selenium()
+
+    def load_cookie_cache(self):
+        """
+        쿠키 캐시 파일 로드 (만료된 캐시는 None)
+        - 브라우저가 준 만료 시각(expiry)과 캐시 TTL 중 빠른 쪽 기준
+        """
+        import os
+        
+        if not os.path.exists(self.cookie_cache_path):
+            return None
+        
+        try:
+            with open(self.cookie_cache_path, encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        now = time.time()
+        if now - cache.get('saved_at', 0) > self.cookie_cache_ttl:
+            return None
+        
+        cookie_dict = {}
+        for cookie in cache.get('cookies', []):
+            expiry = cookie.get('expiry')
+            if expiry is not None and expiry <= now:
+                # Cloudflare 통과 쿠키가 만료되면 캐시 전체 무효
+                if cookie['name'] == 'cf_clearance':
+                    return None
+                continue
+            cookie_dict[cookie['name']] = cookie['value']
+        
+        return cookie_dict or None
+
+    def save_cookie_cache(self, cookies):
+        """
+        Selenium 쿠키 목록(name/value/expiry)을 캐시 파일로 저장
+        """
+        cache = {
+            'saved_at': time.time(),
+            'cookies': [
+                {'name': c['name'], 'value': c['value'], 'expiry': c.get('expiry')}
+                for c in cookies
+            ]
+        }
+        try:
+            with open(self.cookie_cache_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, ensure_ascii=False)
+        except OSError as e:
+            print(f"⚠️  쿠키 캐시 저장 실패: {e}")
+
+    def validate_cookies(self, cookie_dict):
+        """
+        가벼운 요금제 목록 요청 1회로 쿠키 유효성 확인
+        """
+        limiter = host_limiter(self.base_url)
+        if limiter is not None:
+            limiter.acquire()
+        
+        try:
+            resp = requests.get(
+                f'{self.base_url}/uhdc/fo/prdv/mdlbsufu/v1/mdlb-pp-list',
+                params={'hphnPpGrpKwrdCd': '00', '_': int(time.time() * 1000)},
+                cookies=cookie_dict,
+                headers={
+                    **self.request_headers(),
+                    'Accept': 'application/json, text/plain, */*',
+                    'Referer': f'{self.base_url}/mobile/financing-model'
+                },
+                verify=False,
+                timeout=10
+            )
+            return resp.status_code == 200 and 'dvicMdlbSufuPpList' in resp.json()
+        except Exception as e:
+            self.metrics.exception('validate_cookies', e)
+            return False
+
+    def wait_for_clearance(self, driver, timeout=35, poll=0.5):
+        """
+        Cloudflare 통과 여부를 주기적으로 확인하고, 통과 즉시 반환
+        - cf_clearance 쿠키가 생기거나
+        - 챌린지 페이지가 아닌 상태로 로딩이 끝난 것이 2회 연속 확인되면 통과
+        """
+        challenge_titles = ('just a moment', '잠시만 기다', 'attention required')
+        deadline = time.time() + timeout
+        ready_streak = 0
+        
+        while time.time() < deadline:
+            try:
+                if any(c['name'] == 'cf_clearance' for c in driver.get_cookies()):
+                    return True
+                
+                title = (driver.title or '').lower()
+                state = driver.execute_script('return document.readyState')
+                if state == 'complete' and not any(t in title for t in challenge_titles):
+                    ready_streak += 1
+                    if ready_streak >= 2:
+                        return True
+                else:
+                    ready_streak = 0
+            except Exception:
+                ready_streak = 0
+            
+            time.sleep(poll)
+        
+        return False
+
+    def open_browser(self):
+        """
+        Chrome 드라이버 생성 (Docker: 헤드리스 chromium, 로컬: webdriver_manager)
+        """
+        # Selenium은 쿠키 캐시가 없거나 만료됐을 때만 필요 (모듈 로드 시간 절약)
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        
+        options = Options()
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument('--disable-blink-features=AutomationControlled')
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option('useAutomationExtension', False)
+        options.add_argument(f'user-agent={random.choice(self.user_agents)}')
+        
+        # Docker 환경 감지
+        import os
+        is_docker = os.getenv('RUNNING_IN_DOCKER') == 'true'
+        
+        if is_docker:
+            options.add_argument('--headless=new')
+            options.add_argument('--ignore-certificate-errors')
+            options.add_argument('--ignore-ssl-errors')
+            options.add_argument('--disable-gpu')
+            options.add_argument('--window-size=1920,1080')
+            options.add_argument('--disable-extensions')
+            options.add_argument('--proxy-server="direct://"')
+            options.add_argument('--proxy-bypass-list=*')
+            options.add_argument('--start-maximized')
+            options.add_argument('--disable-blink-features=AutomationControlled')
+            options.add_experimental_option('excludeSwitches', ['enable-logging'])
+            options.binary_location = '/usr/bin/chromium'
+        else:
+            print("[Local] 환경에서 실행 중")
+        
+        if is_docker:
+            from selenium.webdriver.chrome.service import Service
+            service = Service('/usr/bin/chromedriver')
+            return webdriver.Chrome(service=service, options=options)
+        
+        try:
+            from selenium.webdriver.chrome.service import Service
+            from webdriver_manager.chrome import ChromeDriverManager
+            service = Service(ChromeDriverManager().install())
+            return webdriver.Chrome(service=service, options=options)
+        except:
+            return webdriver.Chrome(options=options)
+
+    def read_clearance(self, driver):
+        """
+        드라이버로 LG U+ 페이지에 접속해 Cloudflare 통과 후 쿠키 dict 반환 (없으면 None)
+        """
+        # LG U+ 페이지 접속
+        url = f'{self.base_url}/mobile/financing-model'
+        print(f"🌐 페이지 접속 중: {url}")
+        driver.get(url)
+        
+        # 페이지 타이틀 확인
+        print(f"📄 페이지 타이틀: {driver.title}")
+        
+        # Cloudflare 체크 대기 (통과 즉시 종료, 최대 35초)
+        print("⏳ Cloudflare 우회 대기 중... (최대 35초)")
+        wait_start = time.time()
+        if self.wait_for_clearance(driver, timeout=35):
+            print(f"✅ Cloudflare 통과 ({time.time() - wait_start:.1f}초)")
+        else:
+            print("⚠️  Cloudflare 통과 확인 시간 초과")
+        
+        # 쿠키 추출 전 재확인
+        print(f"📄 최종 페이지 타이틀: {driver.title}")
+        
+        # 쿠키 추출 및 필터링
+        cookies = driver.get_cookies()
+        print(f"🍪 전체 쿠키 개수: {len(cookies)}")
+        
+        cookie_dict = {}
+        for cookie in cookies:
+            try:
+                cookie['value'].encode('latin-1')
+                cookie_dict[cookie['name']] = cookie['value']
+            except UnicodeEncodeError:
+                print(f"⚠️  쿠키 건너뜀 (인코딩 오류): {cookie['name']}")
+        
+        if cookie_dict:
+            print(f"✅ 쿠키 획득 완료: {len(cookie_dict)}개")
+            self.save_cookie_cache([c for c in cookies if c['name'] in cookie_dict])
+            return cookie_dict
+        else:
+            print("⚠️  쿠키가 없습니다. Cloudflare가 차단했을 수 있습니다.")
+            return None
+
+    def get_cookies_from_selenium(self):
+        """
+        Selenium으로 페이지 접속 후 쿠키 획득 (Cloudflare 우회)
+        - warm_browser 모드면 브라우저를 닫지 않고 실행 중 쿠키 갱신용으로 보관
+        """
+        print("\n🔐 쿠키 획득 중 (Selenium)...")
+        
+        driver = None
+        try:
+            driver = self.open_browser()
+            return self.read_clearance(driver)
+            
+        except Exception as e:
+            self.metrics.exception('selenium', e)
+            print(f"❌ 쿠키 획득 실패: {e}")
+            import traceback
+            traceback.print_exc()
+            return None
+        
+        finally:
+            if driver is not None:
+                if self.warm_browser and self._browser is None:
+                    self._browser = driver
+                else:
+                    driver.quit()
+
+    # ==========================================================
+    # 실행 중 쿠키 갱신 (Cloudflare 통과 쿠키 교체 / 만료 대응)
+    # ==========================================================
+    # 챌린지 / 차단 페이지 표시 (응답 본문 앞부분에서 확인)
+    CHALLENGE_MARKERS = (b'cf-chl', b'challenge-platform', b'cf-browser-verification',
+                         b'Just a moment', b'Attention Required')
+
+    def clearance_lost(self, resp):
+        """
+        Cloudflare 챌린지 / 차단 응답인지 확인
+        - cf-mitigated: challenge 헤더, 또는
+        - 403/503이거나 JSON 대신 HTML이 왔고 본문에 챌린지 페이지 표시가 있으면 만료로 판단
+        """
+        if resp.headers.get('cf-mitigated', '').lower() == 'challenge':
+            return True
+        
+        if resp.status_code not in (403, 503) and 'text/html' not in resp.headers.get('Content-Type', ''):
+            return False
+        
+        head = resp.content[:4096]
+        return any(marker in head for marker in self.CHALLENGE_MARKERS)
+
+    def start_warm_browser(self):
+        """
+        쿠키 갱신용 헤드리스 브라우저를 백그라운드에서 미리 띄움 (수집과 동시에 진행)
+        """
+        if not self.warm_browser or self._browser is not None or self._browser_thread is not None:
+            return
+        
+        def open_in_background():
+            try:
+                driver = self.open_browser()
+                driver.get(f'{self.base_url}/mobile/financing-model')
+                self._browser = driver
+                print(f"🌡️  [{self.CARRIER}] 쿠키 갱신용 브라우저 대기 중")
+            except Exception as e:
+                self.metrics.exception('warm_browser', e)
+                print(f"⚠️  [{self.CARRIER}] 쿠키 갱신용 브라우저 시작 실패 (만료 시 새로 띄움): {e}")
+        
+        self._browser_thread = threading.Thread(target=open_in_background, daemon=True)
+        self._browser_thread.start()
+
+    def stop_warm_browser(self):
+        """
+        쿠키 갱신용 브라우저 종료
+        """
+        if self._browser_thread is not None:
+            self._browser_thread.join()
+            self._browser_thread = None
+        
+        driver, self._browser = self._browser, None
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception as e:
+                self.metrics.exception('warm_browser', e)
+
+    def fetch_fresh_cookies(self):
+        """
+        새 통과 쿠키 획득 (대기 중인 브라우저 우선, 없거나 실패하면 새 브라우저)
+        """
+        if self._browser_thread is not None:
+            self._browser_thread.join()
+        
+        driver = self._browser
+        if driver is not None:
+            try:
+                # 만료된 쿠키를 지워야 챌린지를 새로 통과함
+                driver.delete_all_cookies()
+                return self.read_clearance(driver)
+            except Exception as e:
+                self.metrics.exception('warm_browser', e)
+                print(f"⚠️  대기 브라우저로 쿠키 갱신 실패, 새 브라우저로 재시도: {e}")
+                self.stop_warm_browser()
+        
+        return self.get_cookies_from_selenium()
+
+    def apply_cookies(self, cookies):
+        """
+        열려 있는 모든 세션의 쿠키를 교체 (새 세션은 self.cookies로 생성)
+        """
+        with self._sessions_lock:
+            sessions = list(self._sessions)
+        
+        for session in sessions:
+            if session is self._h2_session:
+                session.update_cookies(cookies)
+            else:
+                session.cookies.clear()
+                session.cookies.update(cookies)
+
+    def refresh_clearance(self, generation):
+        """
+        통과 쿠키 재획득 (갱신하는 동안 모든 요청이 대기)
+        - generation: 만료를 감지한 요청의 쿠키 세대 (이미 새 쿠키로 바뀌었으면 바로 True)
+        - 갱신 실패 / 실행당 갱신 한도 초과 시 False (이후 감지분도 모두 False)
+        """
+        with self._clearance_lock:
+            if generation != self._cookie_generation:
+                return True
+            if self._clearance_failed:
+                return False
+            if self._cookie_refreshes >= self.max_cookie_refreshes:
+                print(f"❌ [{self.CARRIER}] 쿠키 갱신 한도({self.max_cookie_refreshes}회) 초과 → 남은 작업은 실패 처리")
+                self._clearance_failed = True
+                return False
+            
+            self._clearance_ok.clear()
+            try:
+                print(f"\n🔐 [{self.CARRIER}] Cloudflare 통과 쿠키 만료 감지 → 조회 일시 정지 후 쿠키 갱신")
+                start = time.time()
+                self._cookie_refreshes += 1
+                with self.metrics.stage('cookie_refresh'):
+                    cookies = self.fetch_fresh_cookies()
+                
+                if not cookies:
+                    self.metrics.incr('cookie_refresh_failures')
+                    print(f"❌ [{self.CARRIER}] 쿠키 갱신 실패 → 남은 작업은 실패 처리")
+                    self._clearance_failed = True
+                    return False
+                
+                self.cookies = cookies
+                self.apply_cookies(cookies)
+                self._cookie_generation += 1
+                self.metrics.incr('cookie_refreshes')
+                print(f"✅ [{self.CARRIER}] 쿠키 갱신 완료 ({time.time() - start:.1f}초) → 조회 재개")
+                return True
+            finally:
+                self._clearance_ok.set()
+
+    def with_clearance(self, func, *args):
+        """
+        func(*args) 실행, 도중에 통과 쿠키를 잃으면 쿠키 갱신 후 작업 전체를 다시 실행
+        (갱신에 실패하면 ClearanceLost를 그대로 발생)
+        """
+        while True:
+            try:
+                return func(*args)
+            except ClearanceLost as e:
+                if not self.refresh_clearance(e.generation):
+                    self.metrics.incr('clearance_failed')
+                    raise
+                self.metrics.incr('clearance_requeued')
+
+    def clearance_report(self):
+        """
+        실행 중 쿠키 갱신 결과 출력 (갱신 / 재조회 / 실패 작업 수)
+        """
+        counts = {
+            name: sum(self.metrics.counters.get(name, {}).values())
+            for name in ('cookie_refreshes', 'clearance_requeued', 'clearance_failed')
+        }
+        if self._cookie_refreshes:
+            print(f"🔐 [{self.CARRIER}] 실행 중 쿠키 갱신 {counts['cookie_refreshes']}회 "
+                  f"(시도 {self._cookie_refreshes}회, 재조회 작업 {counts['clearance_requeued']:,}개)")
+        if counts['clearance_failed']:
+            print(f"❌ [{self.CARRIER}] 통과 쿠키를 잃어 수집하지 못한 작업 {counts['clearance_failed']:,}개 "
+                  f"(결과가 불완전합니다)")
+
+
+    # ==========================================================
+    # 공용 세션 관리 (스레드별 커넥션 재사용)
+    # ==========================================================
+    def get_session(self):
+        """
+        현재 스레드 전용 requests.Session 반환 (없으면 생성)
+        - 작업마다 세션을 새로 만들지 않아 TCP+TLS 핸드셰이크 절약
+        - Selenium 쿠키를 실어두고, User-Agent는 요청 헤더로 교체
+        - HTTP/2 모드: 모든 스레드가 같은 H2Session 사용 (커넥션 1~2개에 요청 다중화)
+        """
+        session = getattr(self._local, 'session', None)
+        if session is not None:
+            return session
+        
+        if self.http2:
+            session = self.get_h2_session()
+        if session is None:
+            session = self.new_session()
+            with self._sessions_lock:
+                self._sessions.append(session)
+        
+        self._local.session = session
+        return session
+
+    def retry_strategy(self):
+        """
+        Retry 전략 (적응형 모드는 429/5xx를 숨기지 않고 제어기가 재시도)
+        - 짧게만 재시도 (그래도 실패한 작업은 본 수집 뒤 dead-letter 재시도 단계에서)
+        - 재시도를 다 써도 마지막 응답을 돌려줌 (503 챌린지 페이지도 쿠키 만료로 판별하도록)
+        """
+        if self.controller is None:
+            return Retry(
+                total=self.inline_retries,
+                backoff_factor=self.inline_backoff,
+                status_forcelist=[429, 500, 502, 503, 504],
+                raise_on_status=False
+            )
+        return Retry(total=0, status_forcelist=[], raise_on_status=False)
+
+    def new_session(self):
+        """
+        쿠키 / 공통 헤더 / Retry를 적용한 requests.Session 생성
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(max_retries=self.retry_strategy(), pool_connections=5, pool_maxsize=10)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        
+        if self.cookies:
+            session.cookies.update(self.cookies)
+        session.headers.update({
+            'Accept': 'application/json, text/plain, */*',
+            'Referer': f'{self.base_url}/mobile/financing-model'
+        })
+        return session
+
+    def get_h2_session(self):
+        """
+        공유 HTTP/2 세션 (처음 요청한 스레드가 생성, httpx 미설치 시 None → HTTP/1.1로 전환)
+        """
+        with self._sessions_lock:
+            if self._h2_session is None and self.http2:
+                session = self.open_h2_session(self.retry_strategy(), self.new_session)
+                if session is None:
+                    self.http2 = False
+                    return None
+                
+                if self.cookies:
+                    session.cookies.update(self.cookies)
+                session.headers.update({
+                    'Accept': 'application/json, text/plain, */*',
+                    'Referer': f'{self.base_url}/mobile/financing-model'
+                })
+                self._h2_session = session
+                self._sessions.append(session)
+            return self._h2_session
+
+    def http_get(self, session, url, params, headers, timeout=15):
+        """
+        모든 GET 요청의 공통 경로
+        - 호스트 공유 토큰 버킷으로 속도 제한 (재시도 포함)
+        - 제어기가 있으면 동시성 슬롯 + 재시도 적용
+        - 쿠키 갱신 중이면 갱신이 끝날 때까지 대기, 챌린지 응답이면 ClearanceLost
+        """
+        limiter = host_limiter(self.base_url)
+        attempts = 0
+        generation = self._cookie_generation
+        
+        def send():
+            nonlocal attempts, generation
+            attempts += 1
+            if attempts > 1:
+                self.metrics.incr('retries')
+            
+            self._clearance_ok.wait()
+            generation = self._cookie_generation
+            if limiter is not None:
+                limiter.acquire()
+            start = time.perf_counter()
+            resp = session.get(url, params=params, headers=headers, verify=False, timeout=timeout)
+            self.metrics.observe_response(url, resp, time.perf_counter() - start)
+            # 재생 서버용 응답 녹화 (replay.FixtureRecorder)
+            if self.recorder is not None:
+                self.recorder.record(resp)
+            return resp
+        
+        if self.controller is None:
+            resp = send()
+        else:
+            resp = self.controller.call(send, retries=self.inline_retries, backoff_factor=self.inline_backoff)
+        
+        if self.clearance_lost(resp):
+            self.metrics.incr('clearance_lost')
+            raise ClearanceLost(generation, resp.status_code)
+        return resp
+
+    def request_headers(self):
+        """
+        요청 단위 헤더 (커넥션을 끊지 않고 User-Agent 교체)
+        """
+        return {'User-Agent': random.choice(self.user_agents)}
+
+    def connection_stats(self):
+        """
+        전체 세션의 요청 수 / 새 커넥션(핸드셰이크) 수 집계
+        """
+        requests_sent = 0
+        connections = 0
+        http2 = 0
+        
+        with self._sessions_lock:
+            sessions = list(self._sessions)
+        
+        for session in sessions:
+            if session is self._h2_session:
+                stats = session.connection_stats()
+                requests_sent += stats['requests']
+                connections += stats['connections']
+                http2 += stats['http2']
+                continue
+            
+            for adapter in session.adapters.values():
+                pools = adapter.poolmanager.pools
+                for key in pools.keys():
+                    pool = pools.get(key)
+                    if pool is None:
+                        continue
+                    requests_sent += pool.num_requests
+                    connections += pool.num_connections
+        
+        return {
+            'requests': requests_sent,
+            'connections': connections,
+            'handshakes_avoided': max(requests_sent - connections, 0),
+            'http2': http2
+        }
+
+    def close_sessions(self):
+        """
+        모든 스레드 세션 종료
+        """
+        with self._sessions_lock:
+            sessions, self._sessions = self._sessions, []
+        
+        for session in sessions:
+            session.close()
+        
+        self._local = threading.local()
+        self._h2_session = None
+
+    def prepare(self):
+        """
+        수집 전 쿠키 획득 (실패 시 False)
+        - warm_browser 모드면 쿠키 갱신용 브라우저를 백그라운드에서 띄움
+        """
+        with self.metrics.stage('cookies'):
+            self.cookies = self.get_cookies()
+        if self.cookies:
+            self.start_warm_browser()
+        return bool(self.cookies)
+
+    def close(self):
+        """
+        페이징 풀/세션/쿠키 갱신용 브라우저 종료 후 커넥션 재사용 통계 출력
+        """
+        self.stop_page_pool()
+        self.stop_warm_browser()
+        stats = self.connection_stats()
+        self.close_sessions()
+        http2 = f", HTTP/2 {stats['http2']:,}회" if stats['http2'] else ''
+        print(f"🔌 [{self.CARRIER}] 요청 {stats['requests']:,}회 / 새 커넥션 {stats['connections']:,}개 "
+              f"(핸드셰이크 {stats['handshakes_avoided']:,}회 절약{http2})")
+        self.clearance_report()
+
+    # ==========================================================
+    # 2단계: 요금제 코드 리스트 조회
+    # ==========================================================
+    def get_plan_codes(self):
+        """
+        요금제 카테고리별 코드 리스트 조회 (5G, LTE 병렬, 캐시 우선)
+        """
+        print("\n📋 요금제 코드 수집 중...")
+        
+        all_plans = self.discover_catalog()
+        
+        print(f"✅ 총 {len(all_plans)}개 요금제 수집 완료\n")
+        
+        return all_plans
+
+    def catalog_groups(self):
+        return list(self.PLAN_CATEGORIES)
+
+    def catalog_group_key(self, category):
+        return category[0]
+
+    def fetch_catalog_group(self, category):
+        """
+        요금제 카테고리 1개의 코드 리스트 조회 (실패 시 예외, 빈 목록은 요금제가 없는 카테고리)
+        """
+        cat_code, cat_name = category
+        api_url = f'{self.base_url}/uhdc/fo/prdv/mdlbsufu/v1/mdlb-pp-list'
+        plans = []
+        
+        try:
+            params = {
+                'hphnPpGrpKwrdCd': cat_code,
+                '_': int(time.time() * 1000)  # 캐시 방지
+            }
+            response = self.with_clearance(
+                self.http_get, self.get_session(), api_url, params, self.request_headers(), 10
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                
+                for group in data.get('dvicMdlbSufuPpList', []):
+                    for plan in group.get('dvicMdlbSufuPpDetlList', []):
+                        plans.append({
+                            'code': plan['urcMblPpCd'],
+                            'name': plan['urcMblPpNm'],
+                            'type': cat_name
+                        })
+                
+                print(f"  ✅ {cat_name}: {len(plans)}개")
+            else:
+                print(f"  ❌ {cat_name} 실패: {response.status_code}")
+                raise TaskFailure('http', response.status_code)
+            
+        except TaskFailure:
+            raise
+        except Exception as e:
+            self.metrics.exception('get_plan_codes', e)
+            print(f"  ❌ {cat_name} 에러: {e}")
+            raise
+        
+        return plans
+
+    # ==========================================================
+    # 3단계: 공시지원금 상세 조회 (병렬 워커)
+    # ==========================================================
+    def sufu_params(self, plan_code, signup_code, page_no=1, row_size=10):
+        """
+        mdlb-sufu-list 요청 파라미터 생성
+        """
+        return {
+            'onlnOrdrPsblEposDivsCd': 'Y',
+            'urcHphnEntrPsblKdCd': signup_code,
+            'urcMblPpCd': plan_code,
+            'shwd': '',
+            'sortOrd': '01',
+            'urcWlcmAplyDivsCd': 'NONE',
+            'pageNo': str(page_no),
+            'rowSize': str(row_size),
+            '_': int(time.time() * 1000)
+        }
+
+    def fetch_models_serial(self, session, headers, plan_code, signup_code):
+        """
+        rowSize=10으로 1페이지부터 마지막 페이지까지 순차 조회
+        (한 페이지라도 실패하면 TaskFailure, 일부 페이지만 저장하지 않음)
+        """
+        api_url = f'{self.base_url}/uhdc/fo/prdv/mdlbsufu/v2/mdlb-sufu-list'
+        params = self.sufu_params(plan_code, signup_code)
+        
+        response = self.http_get(session, api_url, params, headers)
+        
+        data = self.page_data(response)
+        models = data['dvicMdlbSufuDtoList']
+        total_count = data.get('totalCnt', 0)
+        
+        all_models = models.copy()
+        
+        # 페이징 처리
+        if total_count > 10:
+            total_pages = math.ceil(total_count / 10)
+            
+            for page in range(2, total_pages + 1):
+                params['pageNo'] = str(page)
+                params['_'] = int(time.time() * 1000)
+                
+                resp = self.http_get(session, api_url, params, headers)
+                all_models.extend(self.page_data(resp)['dvicMdlbSufuDtoList'])
+        
+        return all_models
+
+    def page_data(self, resp):
+        """
+        mdlb-sufu-list 응답 → JSON (200이 아니거나 모델 목록 키가 없으면 TaskFailure)
+        """
+        if resp.status_code != 200:
+            raise TaskFailure('http', resp.status_code)
+        
+        data = resp.json()
+        if 'dvicMdlbSufuDtoList' not in data:
+            raise TaskFailure('parse_miss', 'dvicMdlbSufuDtoList 없음')
+        return data
+
+    def _get_page(self, plan_code, signup_code, page_no, row_size):
+        """
+        단일 페이지 조회 (실패 시 TaskFailure)
+        """
+        api_url = f'{self.base_url}/uhdc/fo/prdv/mdlbsufu/v2/mdlb-sufu-list'
+        params = self.sufu_params(plan_code, signup_code, page_no=page_no, row_size=row_size)
+        
+        resp = self.http_get(self.get_session(), api_url, params, self.request_headers())
+        return self.page_data(resp)
+
+    def probe_row_size(self, plan_code, signup_code, total_count):
+        """
+        서버가 허용하는 최대 rowSize 탐색 (실행당 1회, 결과 캐시)
+        - 전체 개수가 후보 이상이고 요청한 rowSize만큼 정확히 돌려주면 허용된 것으로 판단
+          (전체 개수보다 큰 후보는 서버 상한을 확인할 수 없으므로 건너뜀)
+        - 반환: (rowSize, 해당 rowSize의 1페이지 응답 또는 None)
+        """
+        with self._row_size_lock:
+            if self._row_size is not None:
+                return self._row_size, None
+            
+            checked = False
+            for candidate in self.ROW_SIZE_CANDIDATES:
+                if total_count < candidate:
+                    continue
+                checked = True
+                try:
+                    data = self._get_page(plan_code, signup_code, 1, candidate)
+                except ClearanceLost:
+                    raise
+                except Exception as e:
+                    self.metrics.exception('probe_row_size', e)
+                    continue
+                if data.get('totalCnt', 0) != total_count:
+                    continue
+                
+                if len(data.get('dvicMdlbSufuDtoList', [])) == candidate:
+                    self._row_size = candidate
+                    print(f"📐 rowSize {candidate} 사용 (기본 10)")
+                    return candidate, data
+            
+            # 확인할 수 있는 후보가 없었으면 (모델 수가 모든 후보보다 적음) 다음 요금제에서 다시 탐색
+            if checked:
+                self._row_size = 10
+            return 10, None
+
+    def fetch_models_concurrent(self, plan_code, signup_code):
+        """
+        rowSize 탐색 후 나머지 페이지를 공유 풀에서 병렬 조회
+        - 페이지 순서대로 병합하므로 순차 조회 결과와 동일
+        (한 페이지라도 실패하거나 병합한 모델 수가 전체 개수와 다르면 TaskFailure)
+        """
+        with self._row_size_lock:
+            known = self._row_size
+        row_size = known or 10
+        first = self._get_page(plan_code, signup_code, 1, row_size)
+        
+        total_count = first.get('totalCnt', 0)
+        
+        # 아직 rowSize를 모르면 첫 다중 페이지 요금제에서 탐색
+        if known is None and total_count > row_size:
+            row_size, probed = self.probe_row_size(plan_code, signup_code, total_count)
+            if probed is not None:
+                first = probed
+            elif row_size != 10:
+                first = self._get_page(plan_code, signup_code, 1, row_size)
+        
+        all_models = list(first.get('dvicMdlbSufuDtoList', []))
+        total_pages = math.ceil(total_count / row_size)
+        
+        if total_pages > 1:
+            futures = [
+                self._page_executor.submit(self._get_page, plan_code, signup_code, page, row_size)
+                for page in range(2, total_pages + 1)
+            ]
+            for future in futures:
+                try:
+                    data = future.result()
+                except Exception as e:
+                    # 남은 페이지 요청은 취소하고 작업 전체를 실패 처리
+                    # (쿠키 만료는 with_clearance가 바로 재조회, 그 밖의 실패는 dead-letter 재시도)
+                    self.metrics.exception('page', e)
+                    for rest in futures:
+                        rest.cancel()
+                    raise
+                all_models.extend(data['dvicMdlbSufuDtoList'])
+        
+        # 서버가 rowSize를 잘라 보내면 마지막 페이지까지 받아도 모자람 → 짧은 목록 대신 실패
+        if len(all_models) != total_count:
+            raise TaskFailure('parse_miss', f"모델 {len(all_models)}/{total_count}개 (rowSize {row_size})")
+        
+        return all_models
+
+    def build_rows(self, plan, signup_name, all_models):
+        """
+        모델 목록 → 약정별(6개월/기본) 행 목록
+        """
+        result_data = []
+        
+        for model in all_models:
+            # 6개월 약정
+            result_data.append({
+                '요금제명': plan['name'],
+                '요금제유형': plan['type'],
+                '가입유형': signup_name,
+                '약정': '6개월',
+                '모델명': model.get('urcTrmMdlNm'),
+                '출고가': model.get('dlvrPrc'),
+                '이통사지원금': model.get('sixPlanPuanSuptAmt'),
+                '추가지원금': model.get('sixPlanAddSuptAmt'),
+                '유통망지원금': model.get('dsnwSupportAmt'),
+                '지원금총액': model.get('sixPlanSuptTamt')
+            })
+            
+            # 기본 약정
+            result_data.append({
+                '요금제명': plan['name'],
+                '요금제유형': plan['type'],
+                '가입유형': signup_name,
+                '약정': '기본',
+                '모델명': model.get('urcTrmMdlNm'),
+                '출고가': model.get('dlvrPrc'),
+                '이통사지원금': model.get('basicPlanPuanSuptAmt'),
+                '추가지원금': model.get('basicPlanAddSuptAmt'),
+                '유통망지원금': model.get('dsnwSupportAmt'),
+                '지원금총액': model.get('basicPlanSuptTamt')
+            })
+        
+        return result_data
+
+    def start_page_pool(self):
+        """
+        병렬 페이징용 공유 스레드 풀 시작
+        """
+        with self._page_pool_lock:
+            if self.paging == 'concurrent' and self._page_executor is None:
+                self._page_executor = ThreadPoolExecutor(max_workers=self.page_concurrency)
+
+    def stop_page_pool(self):
+        """
+        병렬 페이징용 공유 스레드 풀 종료
+        """
+        with self._page_pool_lock:
+            executor, self._page_executor = self._page_executor, None
+        
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def fetch(self, task):
+        """
+        요금제 + 가입유형의 전체 모델 목록 조회 (실패 시 TaskFailure 등 예외)
+        - 도중에 통과 쿠키를 잃으면 쿠키 갱신 후 첫 페이지부터 다시 조회
+        """
+        return self.with_clearance(self.fetch_models, task)
+
+    def fetch_models(self, task):
+        """
+        작업 1개의 모델 목록 (페이징 모드별)
+        """
+        if self.paging == 'concurrent':
+            self.start_page_pool()
+            return self.fetch_models_concurrent(task['plan']['code'], task['signup_code'])
+        
+        # 스레드 세션 재사용 (keep-alive), User-Agent만 작업마다 교체
+        return self.fetch_models_serial(
+            self.get_session(), self.request_headers(), task['plan']['code'], task['signup_code']
+        )
+
+    def parse(self, task, payload):
+        return self.build_rows(task['plan'], task['signup_name'], payload)
+
+    def fetch_subsidy_worker(self, task):
+        """
+        단일 요금제 + 가입유형 조합에 대해
+        공시지원금 데이터를 수집하는 워커 함수
+        """
+        return self.fetch_rows(task)
+
+    # ==========================================================
+    # 증분 수집 (직전 실행 대비 변동분만 유지)
+    # ==========================================================
+    def task_keys(self, task):
+        """
+        저장소 키 목록 (요금제 코드, 가입유형, 약정) - 약정별 1개씩
+        """
+        return [(str(task['plan']['code']), str(task['signup_code']), term) for term in self.TERMS]
+
+    def store_keys(self, task):
+        return self.task_keys(task)
+
+    def split_for_store(self, task, rows):
+        """
+        결과 행을 약정별로 분배
+        """
+        return [
+            (key, [r for r in rows if r['약정'] == key[2]])
+            for key in self.task_keys(task)
+        ]
+
+    # ==========================================================
+    # 4단계: 결과 저장 (스트리밍)
+    # ==========================================================
+    def open_writer(self):
+        """
+        실행 설정(형식/파티션/증분 여부)에 맞는 스트리밍 저장기 생성
+        """
+        prefix = 'lguplus_subsidy_delta' if self.store is not None else 'lguplus_subsidy'
+        if not self.partition:
+            prefix = f'{prefix}_{datetime.now().strftime("%Y%m%d_%H%M%S")}'
+        return self.open_output(prefix)
+
+    def save_to_excel(self, data):
+        """
+        수집된 데이터(dict 목록 또는 ColumnBuffer)를 한 번에 파일로 저장
+        (증분 모드는 변동분 파일)
+        """
+        print("\n💾 파일 저장 중...")
+        
+        writer = self.open_writer()
+        if isinstance(data, ColumnBuffer):
+            writer.write_buffer(data)
+        else:
+            writer.write_rows(data)
+        return self.close_writer(writer)
+
+    def close_writer(self, writer):
+        """
+        저장기 마무리 후 저장 위치 출력, 파일명 반환 (저장할 행이 없으면 None)
+        """
+        import os
+        with self.metrics.stage('write'):
+            output_path = writer.close()
+        if output_path is None:
+            return None
+        
+        filename = os.path.relpath(output_path, self.output_dir)
+        print(f"✅ 파일 저장 완료: {filename}")
+        print(f"📂 저장 위치: {output_path}")
+        return filename
+
+    # ==========================================================
+    # 작업 목록 생성 / 병렬 수집
+    # ==========================================================
+    def build_tasks(self, plan_codes):
+        """
+        요금제 × 가입유형 전체 조합 생성
+        """
+        all_tasks = []
+        for plan in plan_codes:
+            for signup_code, signup_name in self.signup_type_map.items():
+                all_tasks.append({
+                    'plan': plan,
+                    'signup_code': signup_code,
+                    'signup_name': signup_name
+                })
+        return all_tasks
+
+    def collect(self, all_tasks, max_threads=5, writer=None):
+        """
+        전체 작업을 단계별 파이프라인(작업 생성 → 조회 → 파싱 → 저장)으로 수집
+        - all_tasks는 목록 또는 TaskStream (스트림이면 전체 개수는 진행 중에 늘어남)
+        - 결과는 records.ColumnBuffer (writer가 있으면 행을 바로 저장기로 보내고 빈 버퍼 반환)
+        """
+        final_data = ColumnBuffer(self.record_columns())
+        
+        results = self.iter_results(all_tasks, max_threads=max_threads)
+        for i, (task, res) in enumerate(results, 1):
+            self.record_early(all_tasks, task, res)
+            self.record_history(task, res)
+            if self.store is not None:
+                res = self.record_incremental(task, res)
+            
+            if res and writer is not None:
+                with self.metrics.stage('write'):
+                    writer.write_rows(res)
+            elif res:
+                final_data.append_dicts(res)
+            
+            total_tasks = len(all_tasks)
+            if i % 50 == 0 or (i == total_tasks and getattr(all_tasks, 'complete', True)):
+                collected = writer.rows_written if writer is not None else len(final_data)
+                print(f"📊 진행률: {i}/{total_tasks} ({i/total_tasks*100:.1f}%) | 수집 데이터: {collected:,}건{self.controller_status()}"
+                      f"{self.pipeline_status()}")
+        
+        return final_data
+
+    # ==========================================================
+    # 전체 실행 로직
+    # ==========================================================
+    def run(self, max_threads=5, resume=False):
+        """
+        전체 크롤링 실행 함수
+        - resume=True: 직전에 중단된 실행의 체크포인트에서 완료 작업은 건너뜀
+        """
+        start_time = time.time()
+        
+        print("\n" + "🚀" * 40)
+        print("LG U+ 지원금 크롤러")
+        print("🚀" * 40)
+        
+        self.metrics = RunMetrics(self.CARRIER)
+        
+        # 1단계: 쿠키 획득
+        if not self.prepare():
+            print("\n❌ 쿠키 획득 실패")
+            self.save_metrics()
+            return
+        
+        # 2단계: 요금제 코드 수집 (카테고리 병렬) → 도착하는 카테고리부터 작업 생성
+        print("\n📋 요금제 코드 수집 중 (도착하는 대로 조회 시작)...")
+        all_tasks = self.task_stream()
+        
+        if self.controller is not None:
+            print(f"⚙️  적응형 동시성: 시작 {self.controller.limit}, 최대 {self.controller.max_limit}\n")
+        else:
+            print(f"⚙️  병렬 처리: {max_threads}개 스레드\n")
+        
+        # 수집과 동시에 파일로 저장 (행 목록을 메모리에 쌓지 않음)
+        writer = self.open_writer()
+        self.start_page_pool()
+        self.open_journal(resume)
+        self.begin_incremental()
+        
+        # =========================
+        # 3단계: 병렬 처리로 데이터 수집
+        # =========================
+        self.collect(all_tasks, max_threads=max_threads, writer=writer)
+        self.stop_page_pool()
+        
+        if not all_tasks.tasks:
+            print("\n❌ 요금제 코드 수집 실패")
+            self.close()
+            self.close_journal(completed=False)
+            writer.close()
+            self.save_metrics()
+            return
+        print(f"🔄 총 {len(all_tasks)}개 작업 처리 완료")
+        
+        # 증분 비교 마무리: 카탈로그에서 빠진 키의 삭제분 추가
+        self.end_incremental(all_tasks.tasks, writer)
+        
+        # 커넥션 재사용 통계
+        self.close()
+        
+        # =========================
+        # 4단계: 결과 저장 마무리
+        # =========================
+        filename = self.close_writer(writer)
+        self.close_journal(completed=True)
+        if filename:
+            elapsed_time = time.time() - start_time
+            minutes = int(elapsed_time // 60)
+            seconds = int(elapsed_time % 60)
+            
+            print(f"\n🎉 수집 성공!")
+            print(f"📂 파일명: {filename}")
+            print(f"📊 데이터: {writer.rows_written:,}건")
+            print(f"⏱️  실행 시간: {minutes}분 {seconds}초\n")
+        elif self.store is not None:
+            print("\n✅ 직전 실행 대비 변동 없음")
+        else:
+            print("\n❌ 수집된 데이터가 없습니다.")
+        
+        # 실행 계측 저장 (단계별 시간 / 엔드포인트 지연 / 카운터)
+        self.save_metrics()
+
+
+# ==========================================================
+# 실행 진입점
+# ==========================================================
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="LG U+ 공시지원금 크롤러")
+    parser.add_argument('--threads', type=int, default=5)
+    parser.add_argument('--paging', choices=['serial', 'concurrent'], default='serial')
+    parser.add_argument('--page-concurrency', type=int, default=4)
+    parser.add_argument('--incremental', action='store_true', help='직전 실행 대비 변동분만 저장')
+    parser.add_argument('--store', default='/app/output/subsidy_store.sqlite', help='증분 저장소 경로')
+    parser.add_argument('--history', action='store_true', help='지원금 이력 저장소에도 누적 (history_store.py로 조회)')
+    parser.add_argument('--history-store', default='/app/output/subsidy_history.sqlite', help='이력 저장소 경로')
+    parser.add_argument('--format', choices=['xlsx', 'csv', 'parquet'], default='xlsx', help='저장 형식')
+    parser.add_argument('--partition', action=argparse.BooleanOptionalAction, default=None,
+                        help='통신사/날짜별 디렉토리 분할 (기본: parquet만)')
+    parser.add_argument('--adaptive', action='store_true', help='지연/429 기반 적응형 동시성 (AIMD)')
+    parser.add_argument('--max-concurrency', type=int, default=16, help='적응형 동시성 상한')
+    parser.add_argument('--rate', type=float, help='초당 요청 수 상한 (기본: rate_limit.DEFAULT_HOST_LIMITS)')
+    parser.add_argument('--burst', type=int, help='순간 최대 요청 수 (기본: rate_limit.DEFAULT_HOST_LIMITS)')
+    parser.add_argument('--jitter', type=float, help='요청 간 무작위 추가 대기 상한 (초, 기본: rate_limit.DEFAULT_HOST_LIMITS)')
+    parser.add_argument('--catalog-ttl', type=int, default=6 * 3600,
+                        help='요금제 카탈로그 캐시 유효 시간 (초, 0이면 매번 조회)')
+    parser.add_argument('--openmetrics', action='store_true', help='실행 계측을 OpenMetrics 파일로도 저장')
+    parser.add_argument('--resume', action='store_true', help='중단된 실행의 체크포인트에서 이어서 수집')
+    parser.add_argument('--dedup', action='store_true', help='같은 지원금 표는 1번만 저장 (고유 표 + 색인 파일)')
+    parser.add_argument('--retry-passes', type=int, default=2,
+                        help='실패 작업 재시도 횟수 (본 수집 후 백오프 + 낮은 동시성, 0이면 재시도 없음)')
+    parser.add_argument('--http2', action='store_true', help='HTTP/2 다중화 전송 (httpx[http2], 커넥션 1~2개 공유, 미지원 시 HTTP/1.1)')
+    parser.add_argument('--warm-browser', action='store_true',
+                        help='쿠키 갱신용 헤드리스 브라우저를 실행 내내 유지 (통과 쿠키 만료 시 바로 갱신)')
+    parser.add_argument('--schedule', action='store_true',
+                        help='변동 이력 기반 순서 (핫 키 우선 + 조기 스냅샷, 콜드 키 생략, --incremental 필요)')
+    parser.add_argument('--cold-revisit', type=float, default=24, help='콜드 키 재방문 간격 (시간)')
+    args = parser.parse_args()
+    
+    if (args.rate, args.burst, args.jitter) != (None, None, None):
+        from rate_limit import override_host
+        override_host('www.lguplus.com', args.rate, args.burst, args.jitter)
+    
+    controller = None
+    if args.adaptive:
+        from rate_limit import AIMDController
+        controller = AIMDController(initial=args.threads, max_limit=args.max_concurrency)
+    
+    store = None
+    if args.incremental:
+        from result_store import ResultStore
+        store = ResultStore(args.store)
+    
+    history = None
+    if args.history:
+        from history_store import HistoryStore
+        history = HistoryStore(args.history_store)
+    
+    scheduler = None
+    if args.schedule:
+        if store is None:
+            print("⚠️  --schedule은 --incremental과 함께 사용해야 합니다 (변동 이력 없음, 스케줄링 생략)")
+        else:
+            from scheduler import ChangeScheduler
+            scheduler = ChangeScheduler(store, cold_revisit=args.cold_revisit * 3600)
+    
+    crawler = LGUplusCrawler(
+        paging=args.paging,
+        page_concurrency=args.page_concurrency,
+        store=store,
+        output_format=args.format,
+        partition=args.partition,
+        controller=controller,
+        http2=args.http2,
+        warm_browser=args.warm_browser
+    )
+    crawler.catalog_cache_ttl = args.catalog_ttl
+    crawler.openmetrics = args.openmetrics
+    crawler.dedup_output = args.dedup
+    crawler.scheduler = scheduler
+    crawler.history = history
+    crawler.retry_passes = args.retry_passes
+    
+    # 안정성을 위해 스레드 수 제한 (기본 5개)
+    crawler.run(max_threads=args.threads, resume=args.resume)
+    
+    if store is not None:
+        store.close()
+    
+    if history is not None:
+        history.close()
\ No newline at end of file
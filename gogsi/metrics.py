@@ -0,0 +1,201 @@
+# =========================
+# 실행 단위 계측 (단계별 시간 / 엔드포인트 지연 / 카운터)
+# =========================
+import os
+import json
+import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlparse
+
+# 지연 히스토그램 버킷 상한 (초)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# 라벨이 붙는 카운터 → OpenMetrics 라벨 이름
+COUNTER_LABELS = {
+    'http_errors': 'status',
+    'exceptions': 'where',
+    'dead_letter': 'kind'
+}
+
+
+def endpoint_name(url):
+    """
+    URL → 엔드포인트 이름 (경로 마지막 구간, 예: notice / mdlb-sufu-list)
+    """
+    path = urlparse(url).path.rstrip('/')
+    return path.rsplit('/', 1)[-1] or '/'
+
+
+class RunMetrics:
+    """
+    크롤러 실행 1회의 계측값 (여러 스레드에서 동시에 기록해도 안전)
+    - stages: 단계별 누적 시간 (fetch/parse 등 작업 단위 단계는 스레드 합산 시간)
+    - latency: 엔드포인트별 요청 지연 히스토그램
+    - counters: 요청 / 재시도 / 200 외 응답 / 빈 parseObject / 삼킨 예외
+    """
+
+    def __init__(self, carrier):
+        self.carrier = carrier
+        self.started_at = time.time()
+        self.stages = {}
+        self.latency = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    # ==========================================================
+    # 기록
+    # ==========================================================
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(name, time.perf_counter() - start)
+
+    def add_stage(self, name, seconds):
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def incr(self, name, value=1, label=''):
+        with self._lock:
+            counter = self.counters.setdefault(name, {})
+            counter[label] = counter.get(label, 0) + value
+
+    def observe(self, endpoint, seconds):
+        with self._lock:
+            hist = self.latency.get(endpoint)
+            if hist is None:
+                hist = self.latency[endpoint] = {
+                    'buckets': [0] * (len(LATENCY_BUCKETS) + 1), 'sum': 0.0, 'count': 0
+                }
+            hist['buckets'][bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            hist['sum'] += seconds
+            hist['count'] += 1
+
+    def observe_response(self, url, resp, seconds):
+        """
+        requests 응답 1건 기록 (지연, 200 외 상태, urllib3 내부 재시도)
+        """
+        self.observe(endpoint_name(url), seconds)
+        self.incr('requests')
+        
+        if resp.status_code != 200:
+            self.incr('http_errors', label=str(resp.status_code))
+        
+        retries = getattr(resp.raw, 'retries', None)
+        if retries is not None and retries.history:
+            self.incr('retries', len(retries.history))
+
+    def exception(self, where, error):
+        """
+        처리하고 넘어간 예외 기록 (위치:예외 타입)
+        """
+        self.incr('exceptions', label=f"{where}:{type(error).__name__}")
+
+    # ==========================================================
+    # 출력
+    # ==========================================================
+    def summary(self):
+        """
+        JSON 직렬화용 요약 (지연은 버킷별 누적 개수 + 평균)
+        """
+        with self._lock:
+            latency = {}
+            for endpoint, hist in self.latency.items():
+                cumulative, buckets = 0, {}
+                for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), hist['buckets']):
+                    cumulative += count
+                    buckets[str(bound)] = cumulative
+                latency[endpoint] = {
+                    'count': hist['count'],
+                    'sum': round(hist['sum'], 4),
+                    'mean': round(hist['sum'] / hist['count'], 4) if hist['count'] else 0.0,
+                    'buckets': buckets
+                }
+            
+            return {
+                'carrier': self.carrier,
+                'started_at': datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+                'stages': {k: round(v, 4) for k, v in self.stages.items()},
+                'latency': latency,
+                'counters': {
+                    name: (values.get('', 0) if list(values) == [''] else dict(values))
+                    for name, values in self.counters.items()
+                }
+            }
+
+    def openmetrics(self):
+        """
+        OpenMetrics 텍스트 형식 (# EOF로 끝남)
+        """
+        carrier = f'carrier="{self.carrier}"'
+        lines = []
+        
+        with self._lock:
+            lines.append('# TYPE gogsi_run_start_timestamp_seconds gauge')
+            lines.append(f'gogsi_run_start_timestamp_seconds{{{carrier}}} {self.started_at:.3f}')
+            
+            lines.append('# TYPE gogsi_stage_seconds gauge')
+            lines.append('# UNIT gogsi_stage_seconds seconds')
+            for name, seconds in self.stages.items():
+                lines.append(f'gogsi_stage_seconds{{{carrier},stage="{name}"}} {seconds:.6f}')
+            
+            lines.append('# TYPE gogsi_request_duration_seconds histogram')
+            lines.append('# UNIT gogsi_request_duration_seconds seconds')
+            for endpoint, hist in self.latency.items():
+                labels = f'{carrier},endpoint="{endpoint}"'
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), hist['buckets']):
+                    cumulative += count
+                    lines.append(f'gogsi_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'gogsi_request_duration_seconds_sum{{{labels}}} {hist["sum"]:.6f}')
+                lines.append(f'gogsi_request_duration_seconds_count{{{labels}}} {hist["count"]}')
+            
+            for name, values in self.counters.items():
+                lines.append(f'# TYPE gogsi_{name} counter')
+                label_name = COUNTER_LABELS.get(name)
+                for label, value in values.items():
+                    labels = carrier
+                    if label_name and label:
+                        labels += f',{label_name}="{label}"'
+                    lines.append(f'gogsi_{name}_total{{{labels}}} {value}')
+        
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+    def save(self, output_dir, openmetrics=False):
+        """
+        {output_dir}/metrics/{통신사}_{YYYYMMDD_HHMMSS}.json (+ .prom) 저장, JSON 경로 반환
+        """
+        directory = os.path.join(output_dir, 'metrics')
+        os.makedirs(directory, exist_ok=True)
+        
+        stamp = datetime.fromtimestamp(self.started_at).strftime('%Y%m%d_%H%M%S')
+        base = os.path.join(directory, f"{self.carrier.lower().replace('+', 'plus')}_{stamp}")
+        
+        with open(f"{base}.json", 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+        
+        if openmetrics:
+            with open(f"{base}.prom", 'w', encoding='utf-8') as f:
+                f.write(self.openmetrics())
+        
+        return f"{base}.json"
+
+    def report(self):
+        """
+        단계별 시간 / 주요 카운터 한 줄 요약
+        """
+        with self._lock:
+            stages = ', '.join(f"{k} {v:.1f}s" for k, v in self.stages.items())
+            counts = {name: sum(values.values()) for name, values in self.counters.items()}
+        
+        return (f"⏱️  [{self.carrier}] {stages} | 요청 {counts.get('requests', 0):,} / "
+                f"재시도 {counts.get('retries', 0):,} / 오류응답 {counts.get('http_errors', 0):,} / "
+                f"빈 parseObject {counts.get('empty_parse', 0):,} / 예외 {counts.get('exceptions', 0):,} / "
+                f"실패 작업 {counts.get('dead_letter', 0):,} (복구 {counts.get('dead_letter_recovered', 0):,}, "
+                f"누락 {counts.get('dead_letter_lost', 0):,})")
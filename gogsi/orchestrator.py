@@ -0,0 +1,327 @@
+# =========================
+# 필수 라이브러리 import
+# =========================
+import os
+import time
+import queue
+import threading
+from datetime import datetime
+
+from metrics import RunMetrics
+from tables import DedupWriter
+from writers import open_writer
+
+
+class CarrierTagWriter:
+    """
+    통신사별 행에 '통신사' 컬럼을 붙여 통합 저장기로 전달
+    (증분 마무리 등 플러그인이 저장기에 직접 쓰는 경로도 같은 형식 유지)
+    """
+
+    def __init__(self, writer, carrier):
+        self.writer = writer
+        self.carrier = carrier
+
+    def write_rows(self, rows):
+        for row in rows:
+            row['통신사'] = self.carrier
+        self.writer.write_rows(rows)
+
+
+class MultiCarrierOrchestrator:
+    """
+    여러 통신사 크롤러(carrier.CarrierPlugin)를 한 프로세스에서 동시에 실행
+    - 통신사마다 수집 스레드 1개 (쿠키 → 카탈로그 → 단계별 파이프라인, 카탈로그 도착 순서대로 조회 시작)
+    - 결과는 큐 하나로 모아 메인 스레드에서 증분 비교 후 통합 파일 1개로 저장
+    - 호스트별 속도 제한은 rate_limit 토큰 버킷이 통신사마다 따로 적용
+    """
+
+    def __init__(self, plugins, output_dir="/app/output", output_format='xlsx', partition=None,
+                 max_threads=5, resume=False, dedup=False):
+        self.plugins = list(plugins)
+        self.max_threads = max_threads
+        
+        # 통신사별 체크포인트에서 이어서 수집
+        self.resume = resume
+        
+        # 통합 파일을 고유 표 + 색인으로 나눠 저장
+        self.dedup = dedup
+        
+        self.output_dir = output_dir
+        os.makedirs(self.output_dir, exist_ok=True)
+        
+        # 저장 형식 (xlsx / csv / parquet), 파티션 미지정 시 parquet만 날짜별 분할
+        self.output_format = output_format
+        self.partition = (output_format == 'parquet') if partition is None else partition
+        
+        # 하나라도 증분 저장소가 있으면 통합 파일도 변동분 형식
+        self.incremental = any(p.store is not None for p in self.plugins)
+        
+        # 수집 스레드 → 메인 스레드 결과 큐 (저장이 밀리면 수집 스레드가 put에서 대기해 메모리 상한 유지)
+        self._results = queue.Queue(maxsize=2 * max_threads * max(len(self.plugins), 1))
+
+    # ==========================================================
+    # 통합 저장
+    # ==========================================================
+    def record_columns(self):
+        """
+        통합 컬럼: '통신사' + 통신사별 컬럼 합집합 (등장 순서 유지)
+        """
+        columns = [('통신사', 'str')]
+        seen = {'통신사'}
+        
+        for plugin in self.plugins:
+            for name, kind in plugin.COLUMNS:
+                if name not in seen:
+                    seen.add(name)
+                    columns.append((name, kind))
+        
+        if self.incremental:
+            columns.append(('변동유형', 'str'))
+        return tuple(columns)
+
+    def open_writer(self):
+        prefix = "subsidy_all_delta" if self.incremental else "subsidy_all"
+        if not self.partition:
+            prefix = f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        if self.dedup:
+            return DedupWriter(self.output_format, self.output_dir, prefix, 'ALL', self.partition,
+                               self.record_columns(), self.table_key_fields())
+        return open_writer(self.output_format, self.output_dir, prefix, 'ALL', self.partition,
+                           schema=self.record_columns())
+
+    def table_key_fields(self):
+        """
+        통합 표 키 컬럼: '통신사' + 통신사별 키 컬럼 합집합
+        """
+        fields = ['통신사']
+        for plugin in self.plugins:
+            fields.extend(f for f in plugin.TABLE_KEY_FIELDS if f not in fields)
+        return tuple(fields)
+
+    # ==========================================================
+    # 통신사별 수집 스레드
+    # ==========================================================
+    def produce(self, plugin):
+        """
+        통신사 1곳 전체 수집 → 결과 큐
+        - ('rows', plugin, task, rows, stream): 작업 1건 결과
+        - ('done', plugin, all_tasks): 수집 종료 (실패 시 all_tasks=None)
+        """
+        all_tasks = None
+        
+        try:
+            if not plugin.prepare():
+                print(f"❌ [{plugin.CARRIER}] 수집 준비 실패")
+                return
+            
+            stream = plugin.task_stream()
+            for task, rows in plugin.iter_results(stream, max_threads=self.max_threads):
+                self._results.put(('rows', plugin, task, rows, stream))
+            all_tasks = stream.tasks
+        
+        except Exception as e:
+            print(f"❌ [{plugin.CARRIER}] 수집 중단: {e}")
+            all_tasks = None
+        
+        finally:
+            try:
+                plugin.close()
+            finally:
+                self._results.put(('done', plugin, all_tasks))
+
+    # ==========================================================
+    # 전체 실행 로직
+    # ==========================================================
+    def run(self):
+        """
+        전체 통신사 동시 수집 후 통합 파일 저장, 저장된 행 수 반환
+        """
+        start_time = time.time()
+        
+        print("\n" + "🚀" * 40)
+        print(f"통합 지원금 크롤러 ({', '.join(p.CARRIER for p in self.plugins)})")
+        print("🚀" * 40 + "\n")
+        
+        writer = self.open_writer()
+        
+        # 증분 저장소는 메인 스레드에서만 사용 (sqlite 커넥션 공유 방지)
+        for plugin in self.plugins:
+            plugin.metrics = RunMetrics(plugin.CARRIER)
+            plugin.open_journal(self.resume)
+            plugin.begin_incremental()
+        
+        done = {p.CARRIER: 0 for p in self.plugins}
+        collected = {p.CARRIER: 0 for p in self.plugins}
+        
+        threads = [
+            threading.Thread(target=self.produce, args=(plugin,), daemon=True)
+            for plugin in self.plugins
+        ]
+        for t in threads:
+            t.start()
+        
+        remaining = len(threads)
+        while remaining:
+            message = self._results.get()
+            kind, plugin = message[0], message[1]
+            carrier = plugin.CARRIER
+            
+            if kind == 'rows':
+                task, rows, stream = message[2], message[3], message[4]
+                plugin.record_early(stream, task, rows)
+                plugin.record_history(task, rows)
+                if plugin.store is not None:
+                    rows = plugin.record_incremental(task, rows)
+                
+                if rows:
+                    with plugin.metrics.stage('write'):
+                        CarrierTagWriter(writer, carrier).write_rows(rows)
+                    collected[carrier] += len(rows)
+                
+                done[carrier] += 1
+                i, total = done[carrier], len(stream)
+                if i % 100 == 0 or (i == total and stream.complete):
+                    print(f"📊 [{carrier}] 진행률: {i}/{total} ({i/total*100:.1f}%) | "
+                          f"수집 데이터: {collected[carrier]:,}건{plugin.controller_status()}"
+                          f"{plugin.pipeline_status()}")
+            
+            else:
+                # 카탈로그를 못 받은 통신사는 삭제 판정 없이 직전 스냅샷 유지
+                all_tasks = message[2]
+                if all_tasks:
+                    print(f"✅ [{carrier}] 총 {len(all_tasks)}개의 조회 조합 처리됨")
+                    plugin.end_incremental(all_tasks, CarrierTagWriter(writer, carrier))
+                plugin.close_journal(completed=all_tasks is not None)
+                plugin.metrics.add_stage('total', time.time() - start_time)
+                remaining -= 1
+        
+        for t in threads:
+            t.join()
+        
+        # =========================
+        # 결과 저장 마무리
+        # =========================
+        output_path = writer.close()
+        elapsed_time = time.time() - start_time
+        
+        # 통신사별 실행 계측 저장 (통합 파일 마무리 시간은 전체 실행 시간에만 포함)
+        for plugin in self.plugins:
+            print(plugin.metrics.report())
+            path = plugin.metrics.save(self.output_dir, plugin.openmetrics)
+            print(f"📈 계측 저장: {os.path.relpath(path, self.output_dir)}")
+        
+        if output_path:
+            print(f"\n🎉 수집 성공!")
+            print(f"📂 파일명: {os.path.relpath(output_path, self.output_dir)}")
+            for carrier, count in collected.items():
+                print(f"📊 {carrier}: {count:,}건")
+            print(f"⏱️  실행 시간: {int(elapsed_time // 60)}분 {int(elapsed_time % 60)}초\n")
+        
+        elif self.incremental:
+            print("\n✅ 직전 실행 대비 변동 없음")
+        
+        else:
+            print("\n❌ 수집된 데이터가 없습니다.")
+        
+        return writer.rows_written
+
+
+# ==========================================================
+# 실행 진입점
+# ==========================================================
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="통신사 통합 공시지원금 크롤러 (단일 프로세스)")
+    parser.add_argument('--carriers', nargs='+', choices=['skt', 'lguplus'], default=['skt', 'lguplus'])
+    parser.add_argument('--threads', type=int, default=5, help='통신사별 스레드 수')
+    parser.add_argument('--paging', choices=['serial', 'concurrent'], default='serial', help='LG U+ 페이징 모드')
+    parser.add_argument('--page-concurrency', type=int, default=4)
+    parser.add_argument('--incremental', action='store_true', help='직전 실행 대비 변동분만 저장')
+    parser.add_argument('--store', default='/app/output/subsidy_store.sqlite', help='증분 저장소 경로')
+    parser.add_argument('--history', action='store_true', help='지원금 이력 저장소에도 누적 (history_store.py로 조회)')
+    parser.add_argument('--history-store', default='/app/output/subsidy_history.sqlite', help='이력 저장소 경로')
+    parser.add_argument('--format', choices=['xlsx', 'csv', 'parquet'], default='xlsx', help='저장 형식')
+    parser.add_argument('--partition', action=argparse.BooleanOptionalAction, default=None,
+                        help='날짜별 디렉토리 분할 (기본: parquet만)')
+    parser.add_argument('--adaptive', action='store_true', help='지연/429 기반 적응형 동시성 (AIMD, 통신사별)')
+    parser.add_argument('--rate', type=float, help='통신사별 초당 요청 수 상한 (기본: rate_limit.DEFAULT_HOST_LIMITS)')
+    parser.add_argument('--burst', type=int, help='통신사별 순간 최대 요청 수 (기본: rate_limit.DEFAULT_HOST_LIMITS)')
+    parser.add_argument('--jitter', type=float, help='요청 간 무작위 추가 대기 상한 (초, 기본: rate_limit.DEFAULT_HOST_LIMITS)')
+    parser.add_argument('--catalog-ttl', type=int, default=6 * 3600,
+                        help='요금제 카탈로그 캐시 유효 시간 (초, 0이면 매번 조회)')
+    parser.add_argument('--openmetrics', action='store_true', help='실행 계측을 OpenMetrics 파일로도 저장')
+    parser.add_argument('--resume', action='store_true', help='중단된 실행의 체크포인트에서 이어서 수집')
+    parser.add_argument('--dedup', action='store_true', help='같은 지원금 표는 1번만 저장 (고유 표 + 색인 파일)')
+    parser.add_argument('--schedule', action='store_true',
+                        help='변동 이력 기반 순서 (핫 키 우선 + 조기 스냅샷, 콜드 키 생략, --incremental 필요)')
+    parser.add_argument('--cold-revisit', type=float, default=24, help='콜드 키 재방문 간격 (시간)')
+    parser.add_argument('--retry-passes', type=int, default=2,
+                        help='실패 작업 재시도 횟수 (본 수집 후 백오프 + 낮은 동시성, 0이면 재시도 없음)')
+    parser.add_argument('--http2', action='store_true', help='HTTP/2 다중화 전송 (httpx[http2], 통신사별 커넥션 1~2개 공유, 미지원 시 HTTP/1.1)')
+    parser.add_argument('--warm-browser', action='store_true',
+                        help='LG U+ 쿠키 갱신용 헤드리스 브라우저를 실행 내내 유지 (통과 쿠키 만료 시 바로 갱신)')
+    parser.add_argument('--parse-processes', type=int, default=0,
+                        help='통신사별 파싱 프로세스 수 (0: 끔, 현재 SKT /notice만 지원)')
+    args = parser.parse_args()
+
+    # 지정한 값만 통신사 호스트 기본 속도 제한에 덮어씀 (토큰 버킷은 호스트별로 따로)
+    if (args.rate, args.burst, args.jitter) != (None, None, None):
+        from rate_limit import override_host
+        hosts = {'skt': 'shop.tworld.co.kr', 'lguplus': 'www.lguplus.com'}
+        for carrier in args.carriers:
+            override_host(hosts[carrier], args.rate, args.burst, args.jitter)
+
+    def make_controller(max_limit):
+        if not args.adaptive:
+            return None
+        from rate_limit import AIMDController
+        return AIMDController(initial=args.threads, max_limit=max_limit)
+
+    store = None
+    if args.incremental:
+        from result_store import ResultStore
+        store = ResultStore(args.store)
+
+    history = None
+    if args.history:
+        from history_store import HistoryStore
+        history = HistoryStore(args.history_store)
+
+    scheduler = None
+    if args.schedule:
+        if store is None:
+            print("⚠️  --schedule은 --incremental과 함께 사용해야 합니다 (변동 이력 없음, 스케줄링 생략)")
+        else:
+            from scheduler import ChangeScheduler
+            scheduler = ChangeScheduler(store, cold_revisit=args.cold_revisit * 3600)
+
+    plugins = []
+    if 'skt' in args.carriers:
+        from skt_crawler import SKTStableCrawler
+        plugins.append(SKTStableCrawler(store=store, output_format=args.format,
+                                        controller=make_controller(32), http2=args.http2))
+    if 'lguplus' in args.carriers:
+        from lguplus_crawler import LGUplusCrawler
+        plugins.append(LGUplusCrawler(paging=args.paging, page_concurrency=args.page_concurrency,
+                                      store=store, output_format=args.format,
+                                      controller=make_controller(16), http2=args.http2,
+                                      warm_browser=args.warm_browser))
+    
+    for plugin in plugins:
+        plugin.catalog_cache_ttl = args.catalog_ttl
+        plugin.openmetrics = args.openmetrics
+        plugin.parse_processes = args.parse_processes
+        plugin.retry_passes = args.retry_passes
+        plugin.scheduler = scheduler
+        plugin.history = history
+
+    MultiCarrierOrchestrator(plugins, output_format=args.format, partition=args.partition,
+                             max_threads=args.threads, resume=args.resume, dedup=args.dedup).run()
+
+    if store is not None:
+        store.close()
+
+    if history is not None:
+        history.close()
@@ -0,0 +1,205 @@
+# =========================
+# 단계별 수집 파이프라인 (작업 생성 → 조회 → 파싱 → 저장)
+# =========================
+import queue
+import threading
+
+# 단계 종료 표시 (큐에 넣어 다음 단계 작업자에게 전달)
+_END = object()
+
+
+class Pipeline:
+    """
+    작업 생성 / 조회 / 파싱 단계를 크기 제한 큐로 연결하고, 결과를 (task, rows, skipped)로 반환
+    - 작업 생성: 스레드 1개가 작업 목록(TaskStream 등)을 필요한 만큼만 꺼냄
+    - 조회: fetch_workers개 스레드, 파싱: parse_workers개 스레드
+    - 저장: 반환된 결과를 소비하는 호출 스레드
+    - 큐가 차면 앞 단계가 기다림 (저장이 느리면 조회/작업 생성도 멈춰 메모리 일정)
+    - skip(task)가 행 목록을 돌려주면 조회/파싱 없이 바로 결과로 보냄 (체크포인트 재개)
+    - fetch / parse가 예외를 내면 전체를 중단하고 소비 스레드에서 그 예외를 다시 발생
+    """
+
+    def __init__(self, tasks, fetch, parse, fetch_workers=5, parse_workers=1, queue_size=None,
+                 skip=None):
+        self.tasks = tasks
+        self.fetch = fetch
+        self.parse = parse
+        self.fetch_workers = max(1, fetch_workers)
+        self.parse_workers = max(1, parse_workers)
+        self.skip = skip
+        
+        # 큐 크기 기본값: 조회 스레드 수의 2배 (스레드가 쉬지 않을 만큼만 미리 채움)
+        self.queue_size = queue_size or self.fetch_workers * 2
+        self._fetch_queue = queue.Queue(self.queue_size)
+        self._parse_queue = queue.Queue(self.queue_size)
+        self._output = queue.Queue(self.queue_size)
+        
+        # 단계별 처리 건수 (generated / skipped / fetched / parsed)
+        self.counts = {'generated': 0, 'skipped': 0, 'fetched': 0, 'parsed': 0}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._error = None
+        self._threads = []
+
+    # ==========================================================
+    # 큐 입출력 (중단 시 대기 해제)
+    # ==========================================================
+    def _put(self, q, item):
+        while not self._stopped.is_set():
+            try:
+                q.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q):
+        while not self._stopped.is_set():
+            try:
+                return q.get(timeout=0.2)
+            except queue.Empty:
+                continue
+        return _END
+
+    def _count(self, name):
+        with self._lock:
+            self.counts[name] += 1
+
+    def _fail(self, error):
+        """
+        작업자 예외 기록 (첫 예외만 보관) 후 전체 중단 → 소비 스레드가 __iter__에서 다시 발생
+        """
+        with self._lock:
+            if self._error is None:
+                self._error = error
+        self._stopped.set()
+
+    # ==========================================================
+    # 단계별 작업자
+    # ==========================================================
+    def _generate(self):
+        try:
+            for task in self.tasks:
+                self._count('generated')
+                
+                rows = self.skip(task) if self.skip is not None else None
+                if rows is not None:
+                    self._count('skipped')
+                    if not self._put(self._output, (task, rows, True)):
+                        return
+                    continue
+                
+                if not self._put(self._fetch_queue, task):
+                    return
+        except Exception as e:
+            # 카탈로그 조회 실패 등은 소비 스레드에서 다시 발생
+            self._error = e
+        finally:
+            for _ in range(self.fetch_workers):
+                self._put(self._fetch_queue, _END)
+
+    def _fetch_worker(self, remaining):
+        try:
+            while True:
+                task = self._get(self._fetch_queue)
+                if task is _END:
+                    break
+                payload = self.fetch(task)
+                self._count('fetched')
+                if not self._put(self._parse_queue, (task, payload)):
+                    return
+        except Exception as e:
+            self._fail(e)
+        finally:
+            # 예외로 끝나도 마지막 조회 스레드가 파싱 단계 종료 표시
+            if remaining.release_last():
+                for _ in range(self.parse_workers):
+                    self._put(self._parse_queue, _END)
+
+    def _parse_worker(self, remaining):
+        try:
+            while True:
+                item = self._get(self._parse_queue)
+                if item is _END:
+                    break
+                task, payload = item
+                rows = self.parse(task, payload)
+                self._count('parsed')
+                if not self._put(self._output, (task, rows, False)):
+                    return
+        except Exception as e:
+            self._fail(e)
+        finally:
+            if remaining.release_last():
+                self._put(self._output, _END)
+
+    # ==========================================================
+    # 실행 / 상태
+    # ==========================================================
+    def __iter__(self):
+        self._start()
+        try:
+            while True:
+                item = self._get(self._output)
+                if item is _END:
+                    break
+                yield item
+            
+            if self._error is not None:
+                raise self._error
+        finally:
+            self.close()
+
+    def _start(self):
+        fetch_left = _Countdown(self.fetch_workers)
+        parse_left = _Countdown(self.parse_workers)
+        
+        self._threads = [threading.Thread(target=self._generate, daemon=True)]
+        self._threads += [
+            threading.Thread(target=self._fetch_worker, args=(fetch_left,), daemon=True)
+            for _ in range(self.fetch_workers)
+        ]
+        self._threads += [
+            threading.Thread(target=self._parse_worker, args=(parse_left,), daemon=True)
+            for _ in range(self.parse_workers)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def close(self):
+        """
+        남은 작업자 중단 (소비를 도중에 멈춘 경우에도 스레드가 큐에서 풀려나도록)
+        """
+        self._stopped.set()
+        for t in self._threads:
+            t.join()
+        self._threads = []
+
+    def status(self):
+        """
+        단계별 진행 상태 한 줄 (처리 건수 + 다음 단계 대기열)
+        """
+        with self._lock:
+            counts = dict(self.counts)
+        
+        text = (f"생성 {counts['generated']:,} → 조회 {counts['fetched']:,} "
+                f"(대기 {self._fetch_queue.qsize()}/{self.queue_size}) → 파싱 {counts['parsed']:,} "
+                f"(대기 {self._parse_queue.qsize()}/{self.queue_size}) → 저장 대기 {self._output.qsize()}")
+        if counts['skipped']:
+            text += f" | 재개 {counts['skipped']:,}"
+        return text
+
+
+class _Countdown:
+    """
+    같은 단계 작업자 중 마지막으로 끝난 스레드 판별
+    """
+
+    def __init__(self, count):
+        self.count = count
+        self._lock = threading.Lock()
+
+    def release_last(self):
+        with self._lock:
+            self.count -= 1
+            return self.count == 0
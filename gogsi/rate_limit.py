@@ -0,0 +1,255 @@
+# =========================
+# 요청 속도 / 동시성 제어 (토큰 버킷, AIMD)
+# =========================
+import time
+import random
+import asyncio
+import threading
+from collections import deque
+from urllib.parse import urlparse
+
+
+# 호스트별 기본 요청 속도: (초당 요청 수, 버스트, 지터 초)
+DEFAULT_HOST_LIMITS = {
+    'shop.tworld.co.kr': (10.0, 5, 0.05),
+    'www.lguplus.com': (8.0, 4, 0.05),
+}
+
+
+class TokenBucket:
+    """
+    스레드 안전 토큰 버킷
+    - rate: 초당 요청 수
+    - burst: 순간 최대 허용 요청 수
+    - jitter: 토큰을 얻은 뒤 추가로 기다리는 무작위 시간 상한 (초)
+    """
+
+    def __init__(self, rate, burst=1, jitter=0.0):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.jitter = jitter
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """
+        토큰 1개를 예약하고, 사용 가능해질 때까지 기다려야 하는 시간(초) 반환
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+        
+        if self.jitter:
+            wait += random.uniform(0, self.jitter)
+        return wait
+
+    def acquire(self):
+        """
+        토큰을 얻을 때까지 대기 (스레드용)
+        """
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """
+        토큰을 얻을 때까지 대기 (asyncio용)
+        """
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+# ==========================================================
+# 호스트별 공유 속도 제한기
+# ==========================================================
+_host_limiters = {}
+_host_lock = threading.Lock()
+
+
+def configure_host(host, rate, burst=1, jitter=0.0):
+    """
+    호스트 속도 제한 설정 (rate가 None/0이면 제한 없음)
+    """
+    with _host_lock:
+        _host_limiters[host] = TokenBucket(rate, burst, jitter) if rate else None
+
+
+def override_host(host, rate=None, burst=None, jitter=None):
+    """
+    호스트 기본 속도 제한(DEFAULT_HOST_LIMITS)에서 지정한 값만 바꿔 설정 (CLI --rate / --burst / --jitter)
+    - None인 항목은 기본값 유지 (예: --burst만 주면 기본 속도에 버스트만 변경)
+    """
+    default_rate, default_burst, default_jitter = DEFAULT_HOST_LIMITS.get(host, (None, 1, 0.0))
+    configure_host(
+        host,
+        default_rate if rate is None else rate,
+        default_burst if burst is None else burst,
+        default_jitter if jitter is None else jitter
+    )
+
+
+def host_limiter(url):
+    """
+    URL(또는 host)에 해당하는 공유 토큰 버킷 (제한 없는 호스트는 None)
+    - 같은 호스트로 가는 모든 요청(카탈로그 포함)이 하나의 버킷을 공유
+    """
+    host = urlparse(url).netloc if '://' in url else url
+    with _host_lock:
+        if host not in _host_limiters:
+            config = DEFAULT_HOST_LIMITS.get(host)
+            _host_limiters[host] = TokenBucket(*config) if config else None
+        return _host_limiters[host]
+
+
+class AIMDController:
+    """
+    지연 시간과 429/5xx/타임아웃 신호로 동시 요청 수를 조절하는 AIMD 제어기
+    - 창(window)만큼 정상 응답이 모이고 지연이 기준 이내면 limit += increase
+    - 429/5xx/타임아웃/연결 오류가 나면 limit *= decrease (cooldown 동안 1회만)
+    - 스레드는 acquire()/release(), asyncio는 acquire_async()/release_async() 사용
+    """
+
+    THROTTLE_STATUS = (429, 500, 502, 503, 504)
+
+    def __init__(self, initial=5, min_limit=1, max_limit=32, increase=1, decrease=0.5,
+                 window=20, latency_tolerance=2.0, cooldown=1.0):
+        self.limit = max(min_limit, min(initial, max_limit))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.window = window
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+        
+        self.in_flight = 0
+        self.baseline = None          # 관측된 최소 수준 지연 (EWMA)
+        self._latencies = []
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        self._async_cond = None
+        
+        self.counts = {'ok': 0, 'throttle': 0, 'timeout': 0, 'error': 0}
+        self.decisions = deque(maxlen=100)
+        self.last_decision = '시작'
+
+    # ==========================================================
+    # 동시성 슬롯 (스레드)
+    # ==========================================================
+    def acquire(self):
+        with self._cond:
+            self._cond.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+    def release(self, latency, outcome):
+        with self._cond:
+            self.in_flight -= 1
+            self._record(latency, outcome)
+            self._cond.notify_all()
+
+    # ==========================================================
+    # 동시성 슬롯 (asyncio, 단일 이벤트 루프 기준)
+    # ==========================================================
+    async def acquire_async(self):
+        if self._async_cond is None:
+            self._async_cond = asyncio.Condition()
+        async with self._async_cond:
+            await self._async_cond.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+    async def release_async(self, latency, outcome):
+        async with self._async_cond:
+            self.in_flight -= 1
+            with self._cond:
+                self._record(latency, outcome)
+            self._async_cond.notify_all()
+
+    # ==========================================================
+    # 응답 분류 / 한도 조정
+    # ==========================================================
+    @classmethod
+    def classify(cls, status=None, error=None):
+        """
+        응답 상태 코드 또는 예외 → 'ok' / 'throttle' / 'timeout' / 'error'
+        """
+        if error is not None:
+            return 'timeout' if 'timeout' in type(error).__name__.lower() else 'error'
+        if status in cls.THROTTLE_STATUS:
+            return 'throttle'
+        return 'ok'
+
+    def _decide(self, new_limit, reason):
+        old = self.limit
+        self.limit = new_limit
+        self.last_decision = f"{old}→{new_limit} {reason}"
+        self.decisions.append((time.time(), old, new_limit, reason))
+
+    def _record(self, latency, outcome):
+        # 호출 측에서 self._cond 잠금을 잡은 상태
+        self.counts[outcome] += 1
+        now = time.monotonic()
+        
+        if outcome != 'ok':
+            self._latencies = []
+            if now - self._last_decrease >= self.cooldown:
+                self._last_decrease = now
+                new_limit = max(self.min_limit, int(self.limit * self.decrease))
+                self._decide(new_limit, f"↓ {outcome}")
+            return
+        
+        # 기준 지연: 더 빠른 응답에는 바로, 느린 응답에는 천천히 따라감
+        if self.baseline is None or latency < self.baseline:
+            self.baseline = latency
+        else:
+            self.baseline = self.baseline * 0.99 + latency * 0.01
+        
+        self._latencies.append(latency)
+        if len(self._latencies) < self.window:
+            return
+        
+        avg = sum(self._latencies) / len(self._latencies)
+        self._latencies = []
+        
+        if avg > self.baseline * self.latency_tolerance:
+            new_limit = max(self.min_limit, self.limit - self.increase)
+            if new_limit != self.limit:
+                self._decide(new_limit, f"↓ 지연 {avg * 1000:.0f}ms")
+        elif self.limit < self.max_limit and self.in_flight + 1 >= self.limit:
+            # 한도를 다 쓰고 있을 때만 증가 (놀고 있는 한도는 늘리지 않음)
+            self._decide(min(self.max_limit, self.limit + self.increase), "↑ 정상")
+
+    def call(self, func, retries=5, backoff_factor=1.5):
+        """
+        슬롯을 잡고 func()를 호출해 응답/예외를 제어기에 반영 (스레드용)
+        - 429/5xx/예외는 슬롯을 놓은 뒤 지수 백오프 후 재시도
+        - 재시도를 다 쓰면 마지막 응답을 반환하거나 마지막 예외를 다시 발생
+        """
+        for attempt in range(retries + 1):
+            self.acquire()
+            start = time.monotonic()
+            resp, error = None, None
+            try:
+                resp = func()
+            except Exception as e:
+                error = e
+            outcome = self.classify(getattr(resp, 'status_code', None), error)
+            self.release(time.monotonic() - start, outcome)
+            
+            if outcome == 'ok' or attempt == retries:
+                if error is not None:
+                    raise error
+                return resp
+            
+            time.sleep(backoff_factor * (2 ** attempt) * random.uniform(0.5, 1.0))
+
+    def status(self):
+        """
+        진행률 출력용 현재 상태 문자열
+        """
+        return f"동시성 {self.limit}/{self.max_limit} ({self.last_decision})"
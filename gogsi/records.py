@@ -0,0 +1,176 @@
+# =========================
+# 컬럼 단위 행 저장소 (문자열 사전 인코딩 + 정수 배열)
+# =========================
+import numbers
+from array import array
+from decimal import Decimal
+
+
+class ColumnBuffer:
+    """
+    수집 행을 dict 목록 대신 컬럼별 버퍼에 보관
+    - 'str' 컬럼: 고유 문자열 목록 + 정수 코드 배열 (사전 인코딩)
+    - 'int' 컬럼: int64 배열 + null 여부 바이트 배열
+    - to_arrow() / to_pandas()로 중간 dict 목록 없이 테이블 생성
+    - invalid: 정수로 변환할 수 없어 null로 저장한 금액 값의 컬럼별 건수
+    """
+
+    def __init__(self, columns):
+        # columns: [(컬럼명, 'str' | 'int'), ...]
+        self.columns = [name for name, _ in columns]
+        self.kinds = [kind for _, kind in columns]
+        self._data = []
+        self._dicts = []
+        self._nulls = []
+        
+        for kind in self.kinds:
+            if kind == 'str':
+                self._data.append(array('i'))
+                self._dicts.append({None: -1})
+            elif kind == 'int':
+                self._data.append(array('q'))
+                self._dicts.append(None)
+            else:
+                raise ValueError(f"지원하지 않는 컬럼 형식: {kind}")
+            self._nulls.append(bytearray())
+        
+        self._length = 0
+        self.invalid = {}
+
+    def __len__(self):
+        return self._length
+
+    @staticmethod
+    def _to_int(value):
+        """
+        금액 값 → 정수 (None / 빈 문자열 / NaN은 null, 변환할 수 없으면 ValueError)
+        - 정수값인 float / Decimal(JSON 숫자, pandas에서 읽은 1155000.0 등)도 정수로
+        - 문자열은 쉼표 제거 후 변환 ("1,155,000" / "1155000.0")
+        """
+        if value is None or value == '':
+            return None
+        if isinstance(value, numbers.Integral):
+            return int(value)
+        
+        try:
+            number = Decimal(value.replace(',', '').strip()) if isinstance(value, str) else value
+            if number != number:
+                # NaN (pandas 결측값)
+                return None
+            if number == int(number):
+                return int(number)
+        except (ArithmeticError, TypeError, ValueError):
+            pass
+        raise ValueError(f"정수 금액으로 변환할 수 없는 값: {value!r}")
+
+    def _count_invalid(self, i, value):
+        """
+        변환할 수 없는 금액 집계 (컬럼별 첫 값은 출력, null로 저장하되 흔적은 남김)
+        """
+        name = self.columns[i]
+        count = self.invalid.get(name, 0)
+        if not count:
+            print(f"⚠️  금액 변환 실패 [{name}]: {value!r} → null로 저장 (이후 건수는 invalid에 집계)")
+        self.invalid[name] = count + 1
+
+    def append(self, values):
+        """
+        컬럼 순서대로 값 1행 추가
+        """
+        for i, value in enumerate(values):
+            if self.kinds[i] == 'str':
+                codes = self._dicts[i]
+                key = value if value is None or isinstance(value, str) else str(value)
+                code = codes.get(key)
+                if code is None:
+                    code = len(codes) - 1
+                    codes[key] = code
+                self._data[i].append(code)
+                self._nulls[i].append(key is None)
+            else:
+                try:
+                    number = self._to_int(value)
+                except ValueError:
+                    number = None
+                    self._count_invalid(i, value)
+                self._data[i].append(0 if number is None else number)
+                self._nulls[i].append(number is None)
+        self._length += 1
+
+    def append_dicts(self, rows):
+        """
+        dict 행 목록 추가 (없는 컬럼은 null)
+        """
+        for row in rows:
+            self.append([row.get(c) for c in self.columns])
+
+    def _categories(self, i):
+        # 코드 순서대로 정렬된 고유 문자열 목록 (None 제외)
+        return [v for v, code in sorted(self._dicts[i].items(), key=lambda kv: kv[1]) if code >= 0]
+
+    def iter_dicts(self):
+        """
+        dict 행으로 하나씩 복원 (xlsx / csv 저장기용)
+        """
+        categories = [self._categories(i) if kind == 'str' else None for i, kind in enumerate(self.kinds)]
+        
+        for r in range(self._length):
+            row = {}
+            for i, name in enumerate(self.columns):
+                if self._nulls[i][r]:
+                    row[name] = None
+                elif categories[i] is not None:
+                    row[name] = categories[i][self._data[i][r]]
+                else:
+                    row[name] = self._data[i][r]
+            yield row
+
+    def to_arrow(self):
+        """
+        pyarrow.Table 생성 (문자열 컬럼은 DictionaryArray)
+        """
+        import numpy as np
+        import pyarrow as pa
+        
+        arrays = []
+        for i, kind in enumerate(self.kinds):
+            nulls = np.frombuffer(bytes(self._nulls[i]), dtype=np.bool_)
+            mask = nulls if nulls.any() else None
+            if kind == 'str':
+                indices = pa.array(np.frombuffer(self._data[i], dtype=np.int32), mask=mask)
+                arrays.append(pa.DictionaryArray.from_arrays(
+                    indices, pa.array(self._categories(i), type=pa.string())
+                ))
+            else:
+                arrays.append(pa.array(np.frombuffer(self._data[i], dtype=np.int64), mask=mask))
+        
+        return pa.Table.from_arrays(arrays, names=self.columns)
+
+    def to_pandas(self):
+        """
+        pandas.DataFrame 생성 (문자열은 Categorical, 금액은 Int64)
+        """
+        import numpy as np
+        import pandas as pd
+        
+        frame = {}
+        for i, (name, kind) in enumerate(zip(self.columns, self.kinds)):
+            nulls = np.frombuffer(bytes(self._nulls[i]), dtype=np.bool_)
+            if kind == 'str':
+                codes = np.frombuffer(self._data[i], dtype=np.int32).copy()
+                codes[nulls] = -1
+                frame[name] = pd.Categorical.from_codes(codes, categories=self._categories(i))
+            else:
+                values = np.frombuffer(self._data[i], dtype=np.int64)
+                frame[name] = pd.arrays.IntegerArray(values.copy(), nulls.copy())
+        
+        return pd.DataFrame(frame)
+
+    def clear(self):
+        """
+        행만 비우고 문자열 사전은 유지 (다음 배치에서 재사용)
+        """
+        for i in range(len(self.kinds)):
+            self._data[i] = array(self._data[i].typecode)
+            self._nulls[i] = bytearray()
+        self._length = 0
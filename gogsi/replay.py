@@ -0,0 +1,293 @@
+# =========================
+# 응답 녹화 / 오프라인 재생 서버
+# =========================
+import json
+import gzip
+import time
+import base64
+import random
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+# 매 요청마다 바뀌는 파라미터 (캐시 방지 타임스탬프) - 조회 키에서 제외
+VOLATILE_PARAMS = ('_',)
+
+# 페이징 파라미터 - mdlb-sufu-list는 전체 모델 목록으로 합쳐 두고 요청마다 다시 자름
+PAGING_PARAMS = ('pageNo', 'rowSize')
+SUFU_LIST_PATH = '/uhdc/fo/prdv/mdlbsufu/v2/mdlb-sufu-list'
+
+
+def fixture_key(path, params, exclude=VOLATILE_PARAMS):
+    """
+    (경로, 정렬된 파라미터) 조회 키
+    """
+    return path, tuple(sorted((k, v) for k, v in params.items() if k not in exclude))
+
+
+def _single_params(query):
+    return {k: v[0] for k, v in parse_qs(query, keep_blank_values=True).items()}
+
+
+class FixtureRecorder:
+    """
+    크롤러 응답을 gzip JSONL 파일로 녹화
+    - 크롤러의 recorder 속성에 연결하면 http_get 응답(200)마다 1줄 기록
+    - 여러 스레드에서 동시에 호출해도 안전
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+        self._file = gzip.open(path, 'wt', encoding='utf-8')
+
+    def record(self, resp):
+        if resp.status_code != 200:
+            return
+        
+        parsed = urlparse(resp.url)
+        entry = {
+            'path': parsed.path,
+            'params': _single_params(parsed.query),
+            'content_type': resp.headers.get('Content-Type', 'application/octet-stream'),
+            'body': base64.b64encode(resp.content).decode('ascii')
+        }
+        line = json.dumps(entry, ensure_ascii=False)
+        
+        with self._lock:
+            self._file.write(line + '\n')
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def load_fixtures(path):
+    """
+    녹화 파일 → 재생용 응답 표
+    - 일반 엔드포인트: {조회 키: (content_type, body)}
+    - mdlb-sufu-list: 같은 요금제/가입유형의 페이지를 전체 모델 목록 1개로 병합
+      (rowSize별로 이어 붙여 가장 긴 목록 사용, 재생 시 요청한 pageNo/rowSize로 다시 자름)
+    """
+    responses = {}
+    pages = {}
+
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            entry = json.loads(line)
+            body = base64.b64decode(entry['body'])
+            params = entry['params']
+            
+            if entry['path'] == SUFU_LIST_PATH:
+                key = fixture_key(entry['path'], params, VOLATILE_PARAMS + PAGING_PARAMS)
+                row_size = int(params.get('rowSize', 10))
+                page_no = int(params.get('pageNo', 1))
+                pages.setdefault(key, {}).setdefault(row_size, {})[page_no] = json.loads(body)
+            else:
+                responses[fixture_key(entry['path'], params)] = (entry['content_type'], body)
+
+    sufu_lists = {}
+    for key, by_row_size in pages.items():
+        best = None
+        for row_size, by_page in by_row_size.items():
+            models = []
+            for page_no in sorted(by_page):
+                models.extend(by_page[page_no].get('dvicMdlbSufuDtoList', []))
+            if best is None or len(models) > len(best):
+                best = models
+        sufu_lists[key] = best
+
+    return responses, sufu_lists
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """
+    녹화된 응답을 돌려주는 재생 핸들러 (keep-alive 지원)
+    - SKT: /api/wireless/subscription/category, /api/wireless/subscription/list, /notice
+    - LG U+: mdlb-pp-list, mdlb-sufu-list (pageNo / rowSize 페이징)
+    - 지연/지터, 확률적 429, 동시 요청 상한 초과 시 429 주입
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    # 서버 단위 설정 (start_replay_server에서 주입)
+    responses = {}
+    sufu_lists = {}
+    latency = 0.0
+    jitter = 0.0
+    throttle_rate = 0.0        # 요청마다 이 확률로 429 응답
+    max_in_flight = 0          # 0보다 크면 동시 요청이 이 값을 넘을 때 429 응답
+    max_row_size = 100
+
+    # 서버 단위 집계 (served / throttled / missing)
+    in_flight = 0
+    stats = None
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=b'', content_type='application/json'):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            over = self.max_in_flight and cls.in_flight > self.max_in_flight
+        
+        try:
+            # 원격 서버 응답 지연 흉내 (지연 구간도 동시 요청으로 집계)
+            delay = self.latency + random.uniform(0, self.jitter)
+            if delay > 0:
+                time.sleep(delay)
+            
+            if over or (self.throttle_rate and random.random() < self.throttle_rate):
+                self._count('throttled')
+                self._send(429)
+                return
+            
+            parsed = urlparse(self.path)
+            params = _single_params(parsed.query)
+            
+            if parsed.path == SUFU_LIST_PATH:
+                found = self._sufu_page(parsed.path, params)
+            else:
+                found = self.responses.get(fixture_key(parsed.path, params))
+            
+            if found is None:
+                self._count('missing')
+                self._send(404)
+                return
+            
+            content_type, body = found
+            self._count('served')
+            self._send(200, body, content_type)
+        
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def _sufu_page(self, path, params):
+        models = self.sufu_lists.get(fixture_key(path, params, VOLATILE_PARAMS + PAGING_PARAMS))
+        if models is None:
+            return None
+        
+        # 실제 API처럼 rowSize 상한 적용
+        row_size = min(int(params.get('rowSize', 10)), self.max_row_size)
+        start = (int(params.get('pageNo', 1)) - 1) * row_size
+        payload = {'dvicMdlbSufuDtoList': models[start:start + row_size], 'totalCnt': len(models)}
+        return 'application/json', json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
+    def _count(self, name):
+        with self.lock:
+            self.stats[name] = self.stats.get(name, 0) + 1
+
+
+def start_replay_server(fixture_path, latency=0.0, jitter=0.0, throttle_rate=0.0, max_in_flight=0,
+                        max_row_size=100, port=0):
+    """
+    재생 서버를 백그라운드 스레드로 시작하고 (server, base_url) 반환
+    - 집계는 server.RequestHandlerClass.stats
+    """
+    responses, sufu_lists = load_fixtures(fixture_path)
+    handler = type('Handler', (ReplayHandler,), {
+        'responses': responses,
+        'sufu_lists': sufu_lists,
+        'latency': latency,
+        'jitter': jitter,
+        'throttle_rate': throttle_rate,
+        'max_in_flight': max_in_flight,
+        'max_row_size': max_row_size,
+        'in_flight': 0,
+        'stats': {},
+        'lock': threading.Lock()
+    })
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def record_live(plugin, path, limit=0, max_threads=5):
+    """
+    실제 사이트를 조회하며 응답 녹화 (limit > 0이면 작업 수 제한)
+    """
+    from itertools import islice
+    from carrier import TaskStream
+
+    recorder = FixtureRecorder(path)
+    plugin.recorder = recorder
+
+    try:
+        if not plugin.prepare():
+            print(f"❌ [{plugin.CARRIER}] 수집 준비 실패")
+            return 0
+        
+        tasks = TaskStream(plugin)
+        if limit:
+            tasks = islice(tasks, limit)
+        for _ in plugin.iter_results(tasks, max_threads=max_threads):
+            pass
+    finally:
+        plugin.close()
+        plugin.recorder = None
+        recorder.close()
+
+    print(f"📼 [{plugin.CARRIER}] {recorder.count:,}개 응답 녹화: {path}")
+    return recorder.count
+
+
+# ==========================================================
+# 실행 진입점
+# ==========================================================
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="응답 녹화 / 오프라인 재생 서버")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    rec = sub.add_parser('record', help='실제 사이트 응답 녹화')
+    rec.add_argument('carrier', choices=['skt', 'lguplus'])
+    rec.add_argument('--out', required=True, help='녹화 파일 (.jsonl.gz)')
+    rec.add_argument('--limit', type=int, default=0, help='녹화할 조회 작업 수 (0: 전체)')
+    rec.add_argument('--threads', type=int, default=5)
+
+    serve = sub.add_parser('serve', help='녹화 파일 재생 서버 실행')
+    serve.add_argument('fixtures', help='녹화 파일 (.jsonl.gz)')
+    serve.add_argument('--port', type=int, default=8080)
+    serve.add_argument('--latency', type=float, default=0.0, help='응답 지연 (초)')
+    serve.add_argument('--jitter', type=float, default=0.0, help='응답 지연 무작위 추가분 상한 (초)')
+    serve.add_argument('--throttle-rate', type=float, default=0.0, help='429 응답 확률')
+    serve.add_argument('--max-in-flight', type=int, default=0, help='동시 요청 상한 (초과 시 429, 0: 끔)')
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        if args.carrier == 'skt':
+            from skt_crawler import SKTStableCrawler
+            plugin = SKTStableCrawler()
+        else:
+            from lguplus_crawler import LGUplusCrawler
+            plugin = LGUplusCrawler()
+        
+        # 카탈로그 응답도 녹화되도록 캐시 미사용
+        plugin.catalog_cache_path = None
+        record_live(plugin, args.out, limit=args.limit, max_threads=args.threads)
+
+    else:
+        server, base_url = start_replay_server(
+            args.fixtures, latency=args.latency, jitter=args.jitter,
+            throttle_rate=args.throttle_rate, max_in_flight=args.max_in_flight, port=args.port
+        )
+        print(f"▶️  재생 서버: {base_url} (Ctrl+C 종료)")
+        try:
+            while True:
+                time.sleep(60)
+        except KeyboardInterrupt:
+            server.shutdown()
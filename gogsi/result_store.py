@@ -0,0 +1,326 @@
+# =========================
+# 증분 수집용 결과 저장소 (SQLite)
+# =========================
+import json
+import sqlite3
+from datetime import datetime
+
+from tables import table_hash, split_tables
+
+
+class ResultStore:
+    """
+    (통신사, 요금제 ID, 가입유형, 약정) 단위로 직전 수집 결과를 보관하고
+    이번 수집 결과와 비교해 변동분만 돌려주는 저장소
+    - payload_hash가 같으면 변동 없음 (비교 생략)
+    - 단말 단위로 추가 / 삭제 / 변경 내역을 changes 테이블에 기록
+    - 키 컬럼(key_fields)을 주면 키 컬럼을 뺀 표를 tables에 1번만 저장하고
+      snapshots에는 표 해시 + 키 컬럼 값만 보관 (같은 표 쌍의 단말 비교는 실행 중 1번만 계산)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id      INTEGER PRIMARY KEY AUTOINCREMENT,
+                carrier     TEXT NOT NULL,
+                started_at  TEXT NOT NULL,
+                finished_at TEXT
+            );
+            CREATE TABLE IF NOT EXISTS snapshots (
+                carrier      TEXT NOT NULL,
+                plan_id      TEXT NOT NULL,
+                signup_type  TEXT NOT NULL,
+                term         TEXT NOT NULL,
+                payload_hash TEXT NOT NULL,
+                rows_json    TEXT NOT NULL,
+                last_run_id  INTEGER NOT NULL,
+                updated_at   TEXT NOT NULL,
+                PRIMARY KEY (carrier, plan_id, signup_type, term)
+            );
+            CREATE TABLE IF NOT EXISTS changes (
+                run_id      INTEGER NOT NULL,
+                carrier     TEXT NOT NULL,
+                plan_id     TEXT NOT NULL,
+                signup_type TEXT NOT NULL,
+                term        TEXT NOT NULL,
+                device      TEXT NOT NULL,
+                change_type TEXT NOT NULL,
+                old_amount  INTEGER,
+                new_amount  INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS idx_changes_run ON changes (run_id, carrier);
+            CREATE TABLE IF NOT EXISTS tables (
+                table_hash TEXT PRIMARY KEY,
+                rows_json  TEXT NOT NULL
+            );
+        """)
+        
+        # 표 중복 제거 이전에 만든 저장소: snapshots.table_hash 추가
+        # (table_hash가 있으면 rows_json은 키 컬럼 값 dict, 없으면 기존처럼 전체 행 목록)
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(snapshots)")]
+        if 'table_hash' not in columns:
+            self.conn.execute("ALTER TABLE snapshots ADD COLUMN table_hash TEXT")
+        self.conn.commit()
+        
+        # 표 행 캐시 {table_hash: 행 목록} / 표 쌍 비교 결과 캐시 {(이전, 이번): 단말 변동}
+        self._tables = {}
+        self._diffs = {}
+
+    # ==========================================================
+    # 실행 단위 관리
+    # ==========================================================
+    def begin_run(self, carrier):
+        """
+        새 수집 실행 기록 후 run_id 반환
+        """
+        cur = self.conn.execute(
+            "INSERT INTO runs (carrier, started_at) VALUES (?, ?)",
+            (carrier, datetime.now().isoformat(timespec='seconds'))
+        )
+        self.conn.commit()
+        return cur.lastrowid
+
+    def finish_run(self, run_id, carrier, task_keys, device_fields, amount_field, key_fields=None,
+                   catalog_complete=True):
+        """
+        실행 종료 처리
+        - 이번 작업 목록에 아예 없는 키(카탈로그에서 빠진 요금제)는 삭제로 기록
+        - catalog_complete=False(카탈로그 그룹 일부 조회 실패)면 빠진 키가 실제 삭제인지 알 수 없으므로
+          삭제 판정 없이 스냅샷 유지
+        - 반환: 삭제된 행 목록 ('변동유형' = 'removed')
+        """
+        task_keys = set(task_keys)
+        removed_rows = []
+        
+        stale = [
+            key for key in self.conn.execute(
+                "SELECT plan_id, signup_type, term FROM snapshots WHERE carrier = ?",
+                (carrier,)
+            ).fetchall()
+            if key not in task_keys
+        ] if catalog_complete else []
+        
+        for plan_id, signup_type, term in stale:
+            removed_rows.extend(
+                self.apply(run_id, carrier, plan_id, signup_type, term, [], device_fields, amount_field,
+                           key_fields)
+            )
+            self.conn.execute(
+                "DELETE FROM snapshots WHERE carrier = ? AND plan_id = ? AND signup_type = ? AND term = ?",
+                (carrier, plan_id, signup_type, term)
+            )
+        
+        # 더 이상 어떤 스냅샷도 가리키지 않는 표 정리
+        self.conn.execute(
+            "DELETE FROM tables WHERE table_hash NOT IN "
+            "(SELECT table_hash FROM snapshots WHERE table_hash IS NOT NULL)"
+        )
+        self._tables.clear()
+        self._diffs.clear()
+        
+        self.conn.execute(
+            "UPDATE runs SET finished_at = ? WHERE run_id = ?",
+            (datetime.now().isoformat(timespec='seconds'), run_id)
+        )
+        self.conn.commit()
+        return removed_rows
+
+    # ==========================================================
+    # 결과 비교 및 저장
+    # ==========================================================
+    @staticmethod
+    def payload_hash(rows):
+        """
+        행 순서와 무관한 결과 해시
+        """
+        return table_hash(rows)
+
+    def apply(self, run_id, carrier, plan_id, signup_type, term, rows, device_fields, amount_field,
+              key_fields=None):
+        """
+        한 키의 수집 결과를 직전 결과와 비교해 저장
+        - key_fields: 표 중복 제거용 키 컬럼 (한 키의 행은 키 컬럼 값이 모두 같아야 함)
+        - 반환: 변동 행 목록 (각 행에 '변동유형' = added / changed / removed)
+        """
+        plan_id, signup_type, term = str(plan_id), str(signup_type), str(term)
+        digest = self.payload_hash(rows)
+        
+        prev = self.conn.execute(
+            "SELECT payload_hash, rows_json, table_hash FROM snapshots "
+            "WHERE carrier = ? AND plan_id = ? AND signup_type = ? AND term = ?",
+            (carrier, plan_id, signup_type, term)
+        ).fetchone()
+        
+        if prev and prev[0] == digest:
+            # 변동 없음: 마지막 확인 실행만 갱신
+            self.conn.execute(
+                "UPDATE snapshots SET last_run_id = ? "
+                "WHERE carrier = ? AND plan_id = ? AND signup_type = ? AND term = ?",
+                (run_id, carrier, plan_id, signup_type, term)
+            )
+            return []
+        
+        # 키 컬럼 값 + 키 컬럼을 뺀 표 (키 컬럼 값이 섞여 있으면 중복 제거 없이 전체 행 저장)
+        keys, table, digest_table = None, None, None
+        if key_fields:
+            split = split_tables(rows, key_fields)
+            if len(split) == 1:
+                keys, table = split[0]
+                digest_table = table_hash(table)
+        
+        prev_keys, prev_table, prev_rows = None, None, []
+        if prev and prev[2]:
+            prev_keys, prev_table = json.loads(prev[1]), self.load_table(prev[2])
+            prev_rows = [{**prev_keys, **r} for r in prev_table]
+        elif prev:
+            prev_rows = json.loads(prev[1])
+        
+        # 이전/이번 모두 키 컬럼 값이 같은 표 쌍이면 단말 비교 결과 재사용
+        if table is not None and prev_table is not None and keys == prev_keys:
+            pair = (prev[2], digest_table)
+            diff = self._diffs.get(pair)
+            if diff is None:
+                diff = self._diffs[pair] = self.compare(prev_table, table, device_fields, amount_field)
+            changes = diff
+            delta = [{**keys, **row, '변동유형': change_type} for _, change_type, _, _, row in diff]
+        else:
+            changes = self.compare(prev_rows, rows, device_fields, amount_field)
+            delta = [{**row, '변동유형': change_type} for _, change_type, _, _, row in changes]
+        
+        self.conn.executemany(
+            "INSERT INTO changes (run_id, carrier, plan_id, signup_type, term, device, "
+            "change_type, old_amount, new_amount) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (run_id, carrier, plan_id, signup_type, term, device, change_type, old_amt, new_amt)
+                for device, change_type, old_amt, new_amt, _ in changes
+            ]
+        )
+        
+        if table is not None:
+            self.save_table(digest_table, table)
+            stored_json = json.dumps(keys, ensure_ascii=False, default=str)
+        else:
+            stored_json = json.dumps(rows, ensure_ascii=False, default=str)
+        
+        self.conn.execute(
+            "INSERT OR REPLACE INTO snapshots (carrier, plan_id, signup_type, term, payload_hash, "
+            "rows_json, last_run_id, updated_at, table_hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (carrier, plan_id, signup_type, term, digest, stored_json, run_id,
+             datetime.now().isoformat(timespec='seconds'), digest_table)
+        )
+        return delta
+
+    @staticmethod
+    def compare(old_rows, new_rows, device_fields, amount_field):
+        """
+        단말 단위 비교 → [(단말, 변동유형, 이전 금액, 이번 금액, 출력 행), ...]
+        """
+        def device_of(row):
+            return ' '.join(str(row.get(f) or '') for f in device_fields).strip()
+        
+        old = {device_of(r): r for r in old_rows}
+        new = {device_of(r): r for r in new_rows}
+        
+        changes = []
+        for device, row in new.items():
+            before = old.get(device)
+            if before is None:
+                changes.append((device, 'added', None, row.get(amount_field), row))
+            elif before != row:
+                changes.append((device, 'changed', before.get(amount_field), row.get(amount_field), row))
+        
+        for device, row in old.items():
+            if device not in new:
+                changes.append((device, 'removed', row.get(amount_field), None, row))
+        
+        return changes
+
+    # ==========================================================
+    # 중복 제거 표
+    # ==========================================================
+    def load_table(self, digest):
+        table = self._tables.get(digest)
+        if table is None:
+            found = self.conn.execute(
+                "SELECT rows_json FROM tables WHERE table_hash = ?", (digest,)
+            ).fetchone()
+            if found is None:
+                return []
+            table = self._tables[digest] = json.loads(found[0])
+        return table
+
+    def save_table(self, digest, table):
+        if digest in self._tables:
+            return
+        self.conn.execute(
+            "INSERT OR IGNORE INTO tables (table_hash, rows_json) VALUES (?, ?)",
+            (digest, json.dumps(table, ensure_ascii=False, default=str))
+        )
+        self._tables[digest] = table
+
+    def commit(self):
+        self.conn.commit()
+
+    def change_summary(self, run_id):
+        """
+        실행별 변동 건수 {'added': n, 'changed': n, 'removed': n}
+        """
+        summary = {'added': 0, 'changed': 0, 'removed': 0}
+        for change_type, count in self.conn.execute(
+            "SELECT change_type, COUNT(*) FROM changes WHERE run_id = ? GROUP BY change_type",
+            (run_id,)
+        ):
+            summary[change_type] = count
+        return summary
+
+    def key_history(self, carrier, window=10):
+        """
+        최근 완료 실행 window개 기준 키별 변동 이력
+        - 반환: {(요금제 ID, 가입유형, 약정): (관찰 실행 수, 변동이 있었던 실행 수, 마지막 확인 시각)}
+        - 처음 수집된 실행(전체가 추가로 기록됨)은 관찰/변동 횟수에서 제외
+        - 마지막 확인 시각: 그 키를 마지막으로 조회한 실행의 시작 시각 (ISO 문자열)
+        """
+        recent = [row[0] for row in self.conn.execute(
+            "SELECT run_id FROM runs WHERE carrier = ? AND finished_at IS NOT NULL "
+            "ORDER BY run_id DESC LIMIT ?",
+            (carrier, window)
+        )]
+        
+        first_seen = {
+            (plan_id, signup_type, term): first_run
+            for plan_id, signup_type, term, first_run in self.conn.execute(
+                "SELECT plan_id, signup_type, term, MIN(run_id) FROM changes "
+                "WHERE carrier = ? GROUP BY plan_id, signup_type, term",
+                (carrier,)
+            )
+        }
+        
+        changed = {}
+        if recent:
+            marks = ','.join('?' * len(recent))
+            for plan_id, signup_type, term, run_id in self.conn.execute(
+                f"SELECT DISTINCT plan_id, signup_type, term, run_id FROM changes "
+                f"WHERE carrier = ? AND run_id IN ({marks})",
+                (carrier, *recent)
+            ):
+                key = (plan_id, signup_type, term)
+                if run_id > first_seen.get(key, 0):
+                    changed[key] = changed.get(key, 0) + 1
+        
+        history = {}
+        for plan_id, signup_type, term, started_at in self.conn.execute(
+            "SELECT s.plan_id, s.signup_type, s.term, r.started_at FROM snapshots s "
+            "JOIN runs r ON r.run_id = s.last_run_id WHERE s.carrier = ?",
+            (carrier,)
+        ):
+            key = (plan_id, signup_type, term)
+            observed = sum(1 for run_id in recent if run_id > first_seen.get(key, 0))
+            history[key] = (observed, changed.get(key, 0), started_at)
+        
+        return history
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
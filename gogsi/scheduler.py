@@ -0,0 +1,122 @@
+# =========================
+# 변동 빈도 기반 작업 스케줄링 (핫 키 우선 / 콜드 키 재방문 간격)
+# =========================
+import zlib
+from datetime import datetime
+
+
+class ChangeScheduler:
+    """
+    증분 저장소(result_store.ResultStore)의 키별 변동 이력으로 작업 순서와 생략 여부 결정
+    - 새 키 / 최근 window개 실행 중 변동이 있던 키: 핫 (변동 비율 높은 순으로 먼저 조회)
+    - min_history번 이상 관찰했는데 변동이 한 번도 없는 키: 콜드
+      (마지막 확인 후 cold_revisit초가 지나지 않았으면 이번 실행에서 생략)
+    - 나머지: 웜 (카탈로그 순서대로 핫 다음에 조회)
+    """
+
+    def __init__(self, store, window=10, min_history=3, cold_revisit=24 * 3600):
+        self.store = store
+        self.window = window
+        self.min_history = min_history
+        self.cold_revisit = cold_revisit
+        self._history = {}
+
+    def load(self, carrier):
+        """
+        통신사 변동 이력 미리 읽기 (저장소 커넥션을 만든 스레드에서 호출, 수집 스레드는 캐시만 사용)
+        """
+        self._history[carrier] = self.store.key_history(carrier, self.window)
+
+    def revisit_after(self, key):
+        """
+        키별 콜드 재방문 간격 (같은 실행에서 확인한 콜드 키가 한꺼번에 만료되지 않도록 최대 50% 분산)
+        """
+        spread = zlib.crc32('|'.join(key).encode('utf-8')) % 1000 / 1000
+        return self.cold_revisit * (1 + spread / 2)
+
+    def classify(self, keys, history, now):
+        """
+        작업 1건의 저장소 키 목록 → ('hot' | 'warm' | 'cold' | 'skip', 변동 비율)
+        """
+        rate, tier = 0.0, 'cold'
+        
+        for key in keys:
+            found = history.get(key)
+            if found is None:
+                return 'hot', 1.0
+            
+            observed, changed, verified_at = found
+            if changed:
+                rate = max(rate, changed / observed)
+                tier = 'hot'
+            elif observed < self.min_history and tier == 'cold':
+                tier = 'warm'
+        
+        if tier == 'cold':
+            oldest = min(datetime.fromisoformat(history[key][2]) for key in keys)
+            if (now - oldest).total_seconds() < min(self.revisit_after(key) for key in keys):
+                return 'skip', 0.0
+        return tier, rate
+
+    def plan(self, plugin, tasks):
+        """
+        전체 작업 → (조회 순서대로 정렬된 작업, 핫 작업 키 집합, 티어별 건수)
+        """
+        if plugin.CARRIER not in self._history:
+            self.load(plugin.CARRIER)
+        history = self._history.pop(plugin.CARRIER)
+        now = datetime.now()
+        
+        tiers = {'hot': [], 'warm': [], 'cold': [], 'skip': []}
+        for order, task in enumerate(tasks):
+            tier, rate = self.classify(plugin.store_keys(task), history, now)
+            tiers[tier].append((-rate, order, task))
+        
+        tiers['hot'].sort(key=lambda item: item[:2])
+        ordered = [item[2] for tier in ('hot', 'warm', 'cold') for item in tiers[tier]]
+        hot = {plugin.journal_key(item[2]) for item in tiers['hot']}
+        return ordered, hot, {tier: len(items) for tier, items in tiers.items()}
+
+
+class ScheduledStream:
+    """
+    TaskStream을 감싸 스케줄러 순서대로 작업을 내보내는 작업 목록
+    - 카탈로그를 모두 받은 뒤 정렬 (카탈로그는 캐시/병렬 조회라 금방 끝남)
+    - tasks: 생략한 콜드 작업 포함 전체 (증분 마무리 때 삭제로 판정되지 않도록)
+    - len(): 이번 실행에서 실제로 조회할 작업 수, hot: 핫 작업 키 집합 (조기 스냅샷용)
+    - complete / failed_groups: 감싼 TaskStream과 같음 (실패한 카탈로그 그룹이 있으면 미완료)
+    """
+
+    def __init__(self, stream, scheduler):
+        self.stream = stream
+        self.plugin = stream.plugin
+        self.scheduler = scheduler
+        self.hot = set()
+        self.scheduled = 0
+        self.complete = False
+
+    @property
+    def tasks(self):
+        return self.stream.tasks
+
+    @property
+    def failed_groups(self):
+        return self.stream.failed_groups
+
+    def __iter__(self):
+        ordered, hot, counts = self.scheduler.plan(self.plugin, list(self.stream))
+        self.scheduled = len(ordered)
+        
+        # 전부 핫이면(첫 실행 등) 조기 스냅샷은 본 결과 파일과 같으므로 생략
+        self.hot = hot if len(hot) < len(ordered) else set()
+        
+        if counts['skip']:
+            self.plugin.metrics.incr('scheduled_skips', counts['skip'])
+        print(f"🗓️  [{self.plugin.CARRIER}] 스케줄: 핫 {counts['hot']:,} → 웜 {counts['warm']:,} → "
+              f"콜드 {counts['cold']:,} (재방문 전이라 생략 {counts['skip']:,})")
+        
+        yield from ordered
+        self.complete = self.stream.complete
+
+    def __len__(self):
+        return self.scheduled
@@ -1,277 +1,889 @@
-# =========================
-# 필수 라이브러리 import
-# =========================
-import requests
-import json
-import time
-import re
-import random
-from datetime import datetime
-import pandas as pd
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-import urllib3
-
-# SSL 인증서 경고 무시 (verify=False 사용 시 발생)
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-
-class SKTStableCrawler:
-    """
-    SKT T월드 공시지원금 정보를 안정적으로 수집하는 크롤러
-    - requests.Session + Retry 전략
-    - ThreadPoolExecutor 병렬 처리
-    - 서버 탐지 방지를 위한 랜덤 딜레이 적용
-    """
-
-    def __init__(self):
-        # =========================
-        # 기본 설정 값
-        # =========================
-        self.base_url = "https://shop.tworld.co.kr"
-        
-        import os
-        self.output_dir = "/app/output"
-        os.makedirs(self.output_dir, exist_ok=True)
-        
-        # 요청 헤더 (브라우저 흉내)
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
-            'Accept': 'application/json, text/javascript, */*; q=0.01',
-            'Referer': 'https://shop.tworld.co.kr/wireline/plan/list'
-        }
-        
-        # 가입 유형 코드 → 한글 매핑
-        self.scrb_type_map = {
-            '31': '기기변경',
-            '32': '번호이동',
-            '33': '신규가입'
-        }
-        
-        # =========================
-        # requests 세션 + 재시도 전략
-        # =========================
-        self.session = requests.Session()
-        
-        # 네트워크 오류/서버 오류 발생 시 자동 재시도 설정
-        retry_strategy = Retry(
-            total=5,                  # 최대 재시도 횟수
-            backoff_factor=1.5,       # 재시도 간 대기 시간 (지수 증가)
-            status_forcelist=[429, 500, 502, 503, 504]  # 재시도 대상 HTTP 코드
-        )
-        
-        # 커넥션 풀 + Retry 적용
-        adapter = HTTPAdapter(
-            max_retries=retry_strategy,
-            pool_connections=10,
-            pool_maxsize=20
-        )
-        self.session.mount("https://", adapter)
-
-    # ==========================================================
-    # 1단계: 요금제 카테고리 조회
-    # ==========================================================
-    def get_categories(self):
-        """
-        요금제 대분류 카테고리 조회
-        """
-        url = f"{self.base_url}/api/wireless/subscription/category"
-        
-        try:
-            resp = self.session.get(
-                url,
-                params={'categoryId': '20010001'},
-                headers=self.headers,
-                verify=False,
-                timeout=10
-            )
-            resp.raise_for_status()
-            
-            # 실제 데이터는 content 키에 있음
-            return resp.json().get('content', [])
-            
-        except Exception as e:
-            print(f"❌ 카테고리 로드 실패: {e}")
-            return []
-
-    # ==========================================================
-    # 2단계: 카테고리별 요금제 목록 조회
-    # ==========================================================
-    def get_subscriptions(self, cat_id):
-        """
-        특정 카테고리 ID에 속한 요금제 목록 조회
-        """
-        url = f"{self.base_url}/api/wireless/subscription/list"
-        
-        params = {
-            'type': 1,
-            'upCategoryId': '300100400001',
-            'categoryId': cat_id,
-            '_': int(time.time() * 1000)  # 캐시 방지용 타임스탬프
-        }
-        
-        try:
-            resp = self.session.get(
-                url,
-                params=params,
-                headers=self.headers,
-                verify=False,
-                timeout=10
-            )
-            return resp.json().get('content', [])
-            
-        except Exception:
-            return []
-
-    # ==========================================================
-    # 3단계: 공시지원금 상세 조회 (병렬 워커)
-    # ==========================================================
-    def fetch_subsidy_worker(self, task):
-        """
-        단일 요금제 + 가입유형 + 약정기간 조합에 대해
-        공시지원금 데이터를 수집하는 워커 함수
-        """
-        sub_id = task['id']
-        sub_nm = task['nm']
-        s_type = task['type']
-        month = task['month']
-        
-        # 서버 부하 / 탐지 방지를 위한 랜덤 딜레이
-        time.sleep(random.uniform(0.05, 0.15))
-        
-        url = f"{self.base_url}/notice"
-        params = {
-            'prodId': sub_id,
-            'scrbType': s_type,
-            'saleMonth': month
-        }
-        
-        try:
-            resp = self.session.get(
-                url,
-                params=params,
-                headers=self.headers,
-                verify=False,
-                timeout=15
-            )
-            
-            if resp.status_code != 200:
-                return []
-
-            # HTML 내 JS 코드에서 parseObject([...]) 부분 추출
-            match = re.search(
-                r'parseObject\(\s*(\[.*?\])\s*\);',
-                resp.text,
-                re.DOTALL
-            )
-            
-            if not match:
-                return []
-
-            # JSON 문자열 → 파이썬 객체 변환
-            raw_data = json.loads(match.group(1))
-            extracted = []
-            
-            # 단말별 데이터 정리
-            for item in raw_data:
-                extracted.append({
-                    '제조사': item.get('companyNm'),
-                    '단말명': item.get('productNm'),
-                    '용량': item.get('productMem'),
-                    '요금제명': sub_nm,
-                    '가입유형': self.scrb_type_map.get(s_type),
-                    '약정기간': f"{month}개월",
-                    '출고가': item.get('factoryPrice', 0),
-                    '공시지원금': item.get('telecomSaleAmt', 0),
-                    '추가지원금': item.get('selDsnetSupmAmt', 0),
-                    '실구매가': item.get('price', 0),
-                    '공시일': item.get('effStaDt')
-                })
-            
-            return extracted
-            
-        except Exception:
-            # 실패해도 전체 프로세스는 계속 진행
-            return []
-
-    # ==========================================================
-    # 전체 실행 로직
-    # ==========================================================
-    def run(self, max_threads=5):
-        """
-        전체 크롤링 실행 함수
-        """
-        print("\n" + "🚀" * 40)
-        print("SKT T월드 지원금 크롤러")
-        print("🚀" * 40)
-        
-        print("\n🔍 1, 2단계: 요금제 목록 구성 중...")
-        
-        categories = self.get_categories()
-        all_tasks = []
-        
-        # 모든 조합 생성
-        for cat in categories:
-            subs = self.get_subscriptions(cat['categoryId'])
-            
-            for s in subs:
-                for t in ['31', '32', '33']:   # 가입 유형
-                    for m in ['12', '24']:     # 약정 기간
-                        all_tasks.append({
-                            'id': s['subscriptionId'],
-                            'nm': s['subscriptionNm'],
-                            'type': t,
-                            'month': m
-                        })
-
-        total_tasks = len(all_tasks)
-        print(f"✅ 총 {total_tasks}개의 조회 조합 생성됨")
-        print(f"⚙️  병렬 처리: {max_threads}개 스레드\n")
-
-        final_data = []
-        
-        # =========================
-        # 3단계: 병렬 처리로 데이터 수집
-        # =========================
-        with ThreadPoolExecutor(max_workers=max_threads) as executor:
-            futures = {
-                executor.submit(self.fetch_subsidy_worker, task): task
-                for task in all_tasks
-            }
-            
-            for i, future in enumerate(as_completed(futures), 1):
-                res = future.result()
-                
-                if res:
-                    final_data.extend(res)
-                
-                if i % 100 == 0 or i == total_tasks:
-                    print(f"📊 진행률: {i}/{total_tasks} ({i/total_tasks*100:.1f}%) 완료")
-
-        # =========================
-        # 4단계: 결과 저장
-        # =========================
-        if final_data:
-            import os
-            df = pd.DataFrame(final_data)
-            fname = f"skt_subsidy_final_{datetime.now().strftime('%H%M%S')}.xlsx"
-            output_path = os.path.join(self.output_dir, fname)
-            df.to_excel(output_path, index=False)
-            
-            print(f"\n🎉 수집 성공!")
-            print(f"📂 파일명: {fname}")
-            print(f"📊 데이터: {len(final_data):,}건\n")
-
-        else:
-            print("\n❌ 수집된 데이터가 없습니다. 사이트 구조를 확인하세요.")
-
-
-# ==========================================================
-# 실행 진입점
-# ==========================================================
-if __name__ == "__main__":
-    crawler = SKTStableCrawler()
-    
-    # 안정성을 위해 스레드 수 제한 (기본 5개)
-    crawler.run(max_threads=5)
\ No newline at end of file
+# =========================
+# 필수 라이브러리 import
+# =========================
+import requests
+import json
+import time
+import re
+import asyncio
+from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import urllib3
+
+from carrier import CarrierPlugin
+from dead_letter import DeadLetterQueue, TaskFailure
+from metrics import RunMetrics
+from rate_limit import host_limiter
+from records import ColumnBuffer
+
+# 빠른 JSON 백엔드 (설치되어 있으면 사용, bytes를 바로 파싱)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# SSL 인증서 경고 무시 (verify=False 사용 시 발생)
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+
+# ==========================================================
+# parseObject([...]) 추출기 (바이트 단위 스캔)
+# ==========================================================
+_PARSE_OBJECT_MARKER = b'parseObject('
+_JSON_WS = b' \t\r\n'
+
+
+def find_parse_object(body):
+    """
+    응답 바이트에서 parseObject( [ ... ] ); 의 배열 구간 (start, end) 반환
+    - 기존 정규식(parse_subsidy_html)과 같은 구간을 찾되
+      문서 전체를 디코딩하거나 역추적 정규식을 돌리지 않음
+    - 없으면 None
+    """
+    pos = body.find(_PARSE_OBJECT_MARKER)
+    
+    while pos != -1:
+        start = pos + len(_PARSE_OBJECT_MARKER)
+        while start < len(body) and body[start] in _JSON_WS:
+            start += 1
+        
+        if body[start:start + 1] == b'[':
+            # 배열 이후 처음 나오는 ']' + 공백 + ');' 가 끝
+            close = body.find(b');', start)
+            while close != -1:
+                end = close
+                while end > start and body[end - 1] in _JSON_WS:
+                    end -= 1
+                if body[end - 1:end] == b']':
+                    return start, end
+                close = body.find(b');', close + 2)
+            return None
+        
+        pos = body.find(_PARSE_OBJECT_MARKER, pos + 1)
+    
+    return None
+
+
+def extract_parse_object(body, encoding='utf-8'):
+    """
+    응답 바이트에서 parseObject 배열만 잘라 JSON 파싱 (없으면 None)
+    """
+    span = find_parse_object(body)
+    if span is None:
+        return None
+    
+    payload = body[span[0]:span[1]]
+    if encoding.lower().replace('-', '') != 'utf8':
+        payload = payload.decode(encoding).encode('utf-8')
+    return _json_loads(payload)
+
+
+def notice_rows(raw_data, task, scrb_type_map):
+    """
+    parseObject 단말 목록 → 행 목록
+    """
+    extracted = []
+    
+    sub_nm = task['nm']
+    s_type = task['type']
+    month = task['month']
+    
+    # 단말별 데이터 정리
+    for item in raw_data:
+        extracted.append({
+            '제조사': item.get('companyNm'),
+            '단말명': item.get('productNm'),
+            '용량': item.get('productMem'),
+            '요금제명': sub_nm,
+            '가입유형': scrb_type_map.get(s_type),
+            '약정기간': f"{month}개월",
+            '출고가': item.get('factoryPrice', 0),
+            '공시지원금': item.get('telecomSaleAmt', 0),
+            '추가지원금': item.get('selDsnetSupmAmt', 0),
+            '실구매가': item.get('price', 0),
+            '공시일': item.get('effStaDt')
+        })
+    
+    return extracted
+
+
+def parse_notice(task, payload, scrb_type_map):
+    """
+    /notice (응답 바이트, 문자셋) → 행 목록, parseObject가 없으면 None (빈 배열은 빈 목록)
+    - 파싱 프로세스 풀에서 실행되는 모듈 함수 (크롤러 인스턴스 없이 동작)
+    """
+    body, encoding = payload
+    raw_data = extract_parse_object(body, encoding)
+    if raw_data is None:
+        return None
+    return notice_rows(raw_data, task, scrb_type_map)
+
+
+def response_charset(content_type):
+    """
+    Content-Type 헤더의 charset (명시되지 않았으면 utf-8)
+    """
+    for part in (content_type or '').split(';'):
+        key, _, value = part.strip().partition('=')
+        if key.lower() == 'charset' and value:
+            return value.strip('"\' ')
+    return 'utf-8'
+
+
+class SKTStableCrawler(CarrierPlugin):
+    """
+    SKT T월드 공시지원금 정보를 안정적으로 수집하는 크롤러
+    - requests.Session + Retry 전략
+    - ThreadPoolExecutor 병렬 처리 (run) / asyncio 엔진 (run_async)
+    - 서버 탐지 방지를 위한 호스트 단위 토큰 버킷 속도 제한
+    """
+
+    # 재시도 대상 HTTP 코드 (스레드/비동기 엔진 공통)
+    RETRY_STATUS = (429, 500, 502, 503, 504)
+
+    # 증분 수집 시 단말 식별 컬럼 / 변동 기록 금액 컬럼
+    CARRIER = 'SKT'
+    STORE_DEVICE_FIELDS = ('단말명', '용량')
+    STORE_AMOUNT_FIELD = '공시지원금'
+    TABLE_KEY_FIELDS = ('요금제명', '가입유형', '약정기간')
+
+    # 결과 컬럼 (문자열은 사전 인코딩, 금액은 정수 컬럼)
+    COLUMNS = (
+        ('제조사', 'str'), ('단말명', 'str'), ('용량', 'str'), ('요금제명', 'str'),
+        ('가입유형', 'str'), ('약정기간', 'str'), ('출고가', 'int'), ('공시지원금', 'int'),
+        ('추가지원금', 'int'), ('실구매가', 'int'), ('공시일', 'str')
+    )
+
+    def __init__(self, base_url="https://shop.tworld.co.kr", output_dir="/app/output", store=None,
+                 output_format='xlsx', partition=None, controller=None, http2=False):
+        # =========================
+        # 기본 설정 값
+        # =========================
+        self.base_url = base_url
+        
+        import os
+        self.output_dir = output_dir
+        os.makedirs(self.output_dir, exist_ok=True)
+        
+        # 요금제 카탈로그 캐시 (카테고리 구성이 같고 TTL 이내면 재사용)
+        self.catalog_cache_path = os.path.join(self.output_dir, '.skt_catalog_cache.json')
+        
+        # 체크포인트 저널 (완료 작업 + 행, --resume 시 이어서 수집)
+        self.journal_path = os.path.join(self.output_dir, '.skt_journal.jsonl')
+        
+        # 저장 형식 (xlsx / csv / parquet), 파티션 미지정 시 parquet만 통신사/날짜별 분할
+        self.output_format = output_format
+        self.partition = (output_format == 'parquet') if partition is None else partition
+        
+        # 요청 헤더 (브라우저 흉내)
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+            'Accept': 'application/json, text/javascript, */*; q=0.01',
+            'Referer': 'https://shop.tworld.co.kr/wireline/plan/list'
+        }
+        
+        # 가입 유형 코드 → 한글 매핑
+        self.scrb_type_map = {
+            '31': '기기변경',
+            '32': '번호이동',
+            '33': '신규가입'
+        }
+        
+        # =========================
+        # requests 세션 + 재시도 전략
+        # =========================
+        self.session = requests.Session()
+        
+        # 적응형 동시성 제어기 (rate_limit.AIMDController, 없으면 고정 스레드 수)
+        self.controller = controller
+        
+        if controller is None:
+            # 네트워크 오류/서버 오류 발생 시 자동 재시도 설정
+            # (짧게만 재시도하고, 그래도 실패한 작업은 본 수집 뒤 dead-letter 재시도 단계에서)
+            retry_strategy = Retry(
+                total=self.inline_retries,            # 최대 재시도 횟수
+                backoff_factor=self.inline_backoff,   # 재시도 간 대기 시간 (지수 증가)
+                status_forcelist=list(self.RETRY_STATUS),  # 재시도 대상 HTTP 코드
+                raise_on_status=False                 # 재시도를 다 쓰면 마지막 응답 반환 (상태 코드로 실패 분류)
+            )
+        else:
+            # 429/5xx를 urllib3 안에서 숨기지 않고 제어기가 보고 재시도
+            retry_strategy = Retry(total=0, status_forcelist=[], raise_on_status=False)
+        
+        # 커넥션 풀 + Retry 적용
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=10,
+            pool_maxsize=max(20, controller.max_limit if controller else 0)
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
+        # HTTP/2 다중화 전송: 모든 스레드가 세션 1개를 공유 (위 requests 세션은 HTTP/1.1 대체용)
+        if http2:
+            http1_session = self.session
+            h2_session = self.open_h2_session(retry_strategy, lambda: http1_session)
+            if h2_session is not None:
+                self.session = h2_session
+                self.http2 = True
+        
+        # 증분 수집 저장소 (result_store.ResultStore, 없으면 전체 수집)
+        self.store = store
+        
+        # 실행 계측 (단계별 시간 / 엔드포인트 지연 / 재시도·오류 카운터)
+        self.metrics = RunMetrics(self.CARRIER)
+
+    # ==========================================================
+    # 공용 요청 함수
+    # ==========================================================
+    def http_get(self, url, params=None, timeout=15):
+        """
+        모든 GET 요청의 공통 경로
+        - 호스트 공유 토큰 버킷으로 속도 제한 (재시도 포함)
+        - 제어기가 있으면 동시성 슬롯 + 재시도 적용
+        """
+        limiter = host_limiter(self.base_url)
+        attempts = 0
+        
+        def send():
+            nonlocal attempts
+            attempts += 1
+            if attempts > 1:
+                self.metrics.incr('retries')
+            
+            if limiter is not None:
+                limiter.acquire()
+            start = time.perf_counter()
+            resp = self.session.get(
+                url,
+                params=params,
+                headers=self.headers,
+                verify=False,
+                timeout=timeout
+            )
+            self.metrics.observe_response(url, resp, time.perf_counter() - start)
+            # 재생 서버용 응답 녹화 (replay.FixtureRecorder)
+            if self.recorder is not None:
+                self.recorder.record(resp)
+            return resp
+        
+        if self.controller is None:
+            return send()
+        return self.controller.call(send, retries=self.inline_retries, backoff_factor=self.inline_backoff)
+
+    def close(self):
+        """
+        HTTP/2 세션이면 다중화 통계 출력 후 종료 (requests 세션은 실행 내내 재사용)
+        """
+        if not self.http2:
+            return
+        
+        stats = self.session.connection_stats()
+        self.session.close()
+        print(f"🔌 [{self.CARRIER}] 요청 {stats['requests']:,}회 / 새 커넥션 {stats['connections']:,}개 "
+              f"(HTTP/2 {stats['http2']:,}회, HTTP/1.1 대체 {stats['fallbacks']:,}회)")
+
+    # ==========================================================
+    # 1단계: 요금제 카테고리 조회
+    # ==========================================================
+    def get_categories(self):
+        """
+        요금제 대분류 카테고리 조회 (실패 시 예외)
+        """
+        url = f"{self.base_url}/api/wireless/subscription/category"
+        
+        try:
+            resp = self.http_get(url, params={'categoryId': '20010001'}, timeout=10)
+            resp.raise_for_status()
+            
+            # 실제 데이터는 content 키에 있음
+            return resp.json().get('content', [])
+            
+        except Exception as e:
+            self.metrics.exception('get_categories', e)
+            print(f"❌ 카테고리 로드 실패: {e}")
+            raise
+
+    # ==========================================================
+    # 2단계: 카테고리별 요금제 목록 조회
+    # ==========================================================
+    def get_subscriptions(self, cat_id):
+        """
+        특정 카테고리 ID에 속한 요금제 목록 조회
+        (200이 아니면 TaskFailure, 빈 목록은 요금제가 없는 카테고리)
+        """
+        url = f"{self.base_url}/api/wireless/subscription/list"
+        
+        params = {
+            'type': 1,
+            'upCategoryId': '300100400001',
+            'categoryId': cat_id,
+            '_': int(time.time() * 1000)  # 캐시 방지용 타임스탬프
+        }
+        
+        try:
+            resp = self.http_get(url, params=params, timeout=10)
+            if resp.status_code != 200:
+                raise TaskFailure('http', resp.status_code)
+            return resp.json().get('content', [])
+            
+        except Exception as e:
+            self.metrics.exception('get_subscriptions', e)
+            raise
+
+    # ==========================================================
+    # 3단계: 공시지원금 상세 조회 (병렬 워커)
+    # ==========================================================
+    def notice_params(self, task):
+        """
+        /notice 요청 파라미터 생성 (스레드/비동기 엔진 공통)
+        """
+        return {
+            'prodId': task['id'],
+            'scrbType': task['type'],
+            'saleMonth': task['month']
+        }
+
+    def parse_subsidy_html(self, html, task):
+        """
+        /notice HTML(문자열)에서 정규식으로 parseObject([...]) 데이터를 추출
+        (기존 방식, 벤치마크 기준선으로 유지)
+        """
+        # HTML 내 JS 코드에서 parseObject([...]) 부분 추출
+        match = re.search(
+            r'parseObject\(\s*(\[.*?\])\s*\);',
+            html,
+            re.DOTALL
+        )
+        
+        if not match:
+            return []
+
+        # JSON 문자열 → 파이썬 객체 변환
+        return self.build_rows(json.loads(match.group(1)), task)
+
+    def parse_subsidy_body(self, body, task, encoding='utf-8'):
+        """
+        /notice 응답 바이트에서 parseObject 배열 구간만 디코딩해 행 목록으로 변환
+        """
+        rows = parse_notice(task, (body, encoding), self.scrb_type_map)
+        
+        if rows is None:
+            # parseObject 자체가 없음 (차단 / 오류 페이지 또는 페이지 구조 변경) → 실패로 재시도
+            raise TaskFailure('parse_miss', 'parseObject 없음')
+        if not rows:
+            # 빈 parseObject 배열 (단말 없는 요금제)
+            self.metrics.incr('empty_parse')
+        
+        return rows
+
+    def build_rows(self, raw_data, task):
+        """
+        parseObject 단말 목록 → 행 목록
+        """
+        return notice_rows(raw_data, task, self.scrb_type_map)
+
+    def fetch(self, task):
+        """
+        /notice 조회 → (응답 바이트, 문자셋), 200이 아니면 TaskFailure
+        """
+        url = f"{self.base_url}/notice"
+        resp = self.http_get(url, params=self.notice_params(task), timeout=15)
+        
+        if resp.status_code != 200:
+            raise TaskFailure('http', resp.status_code)
+        return resp.content, response_charset(resp.headers.get('Content-Type'))
+
+    def parse(self, task, payload):
+        body, encoding = payload
+        return self.parse_subsidy_body(body, task, encoding)
+
+    def process_parser(self):
+        return parse_notice, (self.scrb_type_map,)
+
+    def fetch_subsidy_worker(self, task):
+        """
+        단일 요금제 + 가입유형 + 약정기간 조합에 대해
+        공시지원금 데이터를 수집하는 워커 함수
+        """
+        return self.fetch_rows(task)
+
+    # ==========================================================
+    # 3단계 (비동기): asyncio + aiohttp 단일 커넥션 풀
+    # ==========================================================
+    async def fetch_subsidy_async(self, client, task, retries=None, backoff_factor=None):
+        """
+        fetch_subsidy_worker의 비동기 버전
+        - 하나의 aiohttp 세션(커넥션 풀)을 모든 작업이 공유
+        - 동시 요청 수는 세션 커넥터의 limit으로 전역 제한
+        - 호스트 토큰 버킷으로 속도 제한, 재시도 대상 코드에서만 지수 백오프 (기본: inline_retries / inline_backoff)
+        - 제어기가 있으면 요청마다 슬롯을 잡고 지연/상태 코드를 반영
+        - 끝내 실패하면 dead-letter 큐에 기록하고 빈 목록
+        """
+        import aiohttp
+        
+        retries = self.inline_retries if retries is None else retries
+        backoff_factor = self.inline_backoff if backoff_factor is None else backoff_factor
+        
+        url = f"{self.base_url}/notice"
+        limiter = host_limiter(self.base_url)
+        
+        for attempt in range(retries + 1):
+            if limiter is not None:
+                await limiter.acquire_async()
+            if self.controller is not None:
+                await self.controller.acquire_async()
+            if attempt > 0:
+                self.metrics.incr('retries')
+            
+            start = time.monotonic()
+            status, error, body, encoding = None, None, None, None
+            try:
+                async with client.get(
+                    url,
+                    params=self.notice_params(task),
+                    headers=self.headers,
+                    ssl=False,
+                    timeout=aiohttp.ClientTimeout(total=15)
+                ) as resp:
+                    status = resp.status
+                    if status == 200:
+                        body = await resp.read()
+                        encoding = response_charset(resp.headers.get('Content-Type'))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = e
+                self.metrics.exception('fetch_async', e)
+            finally:
+                elapsed = time.monotonic() - start
+                self.metrics.add_stage('fetch', elapsed)
+                if status is not None:
+                    self.metrics.observe('notice', elapsed)
+                    self.metrics.incr('requests')
+                    if status != 200:
+                        self.metrics.incr('http_errors', label=str(status))
+                if self.controller is not None:
+                    await self.controller.release_async(
+                        elapsed, self.controller.classify(status, error)
+                    )
+            
+            if body is not None:
+                try:
+                    with self.metrics.stage('parse'):
+                        if self._parse_pool is not None:
+                            rows = await asyncio.wrap_future(self.parse_in_pool(task, (body, encoding)))
+                            return self.pool_rows(rows)
+                        return self.parse_subsidy_body(body, task, encoding)
+                except Exception as e:
+                    self.metrics.exception('parse', e)
+                    # 파싱 실패는 바로 재시도하지 않고 재시도 단계로
+                    self.dead_letter_task(task, 'parse', e)
+                    return []
+            
+            if (error is not None or status in self.RETRY_STATUS) and attempt < retries:
+                await asyncio.sleep(backoff_factor * (2 ** attempt))
+                continue
+            
+            self.dead_letter_task(task, 'fetch', error if error is not None else TaskFailure('http', status))
+            return []
+        
+        return []
+
+    async def collect_async(self, all_tasks, concurrency=20, writer=None):
+        """
+        전체 작업을 asyncio로 수집 (동시 요청 수 concurrency로 제한)
+        - 작업 생성 → 조회 작업자(concurrency개) → 저장을 크기 제한 큐로 연결 (메모리 일정)
+        - all_tasks는 목록 또는 TaskStream (카탈로그 조회는 이벤트 루프 밖 스레드에서 진행)
+        - 결과는 records.ColumnBuffer (writer가 있으면 행을 바로 저장기로 보내고 빈 버퍼 반환)
+        """
+        import aiohttp
+        
+        final_data = ColumnBuffer(self.record_columns())
+        
+        # 커넥터 limit = 전역 동시성 상한 (keep-alive 커넥션 재사용)
+        # (적응형 모드는 제어기 최대 한도까지 열어두고 제어기가 실제 동시성 결정)
+        if self.controller is not None:
+            concurrency = self.controller.max_limit
+        connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=concurrency)
+        
+        queue_size = self.queue_size or concurrency * 2
+        task_queue = asyncio.Queue(queue_size)
+        results = asyncio.Queue(queue_size)
+        self.dead_letter = DeadLetterQueue(self.journal_key)
+        
+        # 파싱 프로세스 풀 (설정된 경우, 이벤트 루프는 응답 전달/결과 수신만)
+        self.start_parse_pool()
+        try:
+            async with aiohttp.ClientSession(connector=connector) as client:
+                async def generate():
+                    # 조회 대기열이 차면 작업 생성(카탈로그 소비)도 멈춤
+                    tasks = iter(all_tasks)
+                    try:
+                        while True:
+                            task = await asyncio.to_thread(next, tasks, None)
+                            if task is None:
+                                break
+                            await task_queue.put(task)
+                    finally:
+                        for _ in range(concurrency):
+                            await task_queue.put(None)
+                
+                # 워커에서 난 예외 (종료 표시 None을 받은 결과 루프가 확인 후 다시 발생)
+                errors = []
+                
+                async def worker():
+                    try:
+                        while True:
+                            task = await task_queue.get()
+                            if task is None:
+                                break
+                            
+                            # 체크포인트에 있는 작업은 조회 생략
+                            rows = self.resumed_rows(task)
+                            if rows is None:
+                                rows = await self.fetch_subsidy_async(client, task)
+                                # 실패 작업은 본 수집이 끝난 뒤 재시도 결과로 저장
+                                if self.dead_letter.holds(task):
+                                    continue
+                                self.journal_result(task, rows)
+                            await results.put((task, rows))
+                    except Exception as e:
+                        errors.append(e)
+                        raise
+                    finally:
+                        # 예외로 끝나도 종료 표시는 반드시 보냄 (결과 루프가 영원히 기다리지 않도록)
+                        await results.put(None)
+                
+                stages = [asyncio.ensure_future(generate())]
+                stages += [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+                
+                i, running = 0, concurrency
+                
+                def store_result(task, res):
+                    nonlocal i
+                    i += 1
+                    
+                    self.record_early(all_tasks, task, res)
+                    self.record_history(task, res)
+                    if self.store is not None:
+                        res = self.record_incremental(task, res)
+                    
+                    if res and writer is not None:
+                        with self.metrics.stage('write'):
+                            writer.write_rows(res)
+                    elif res:
+                        final_data.append_dicts(res)
+                    
+                    total_tasks = len(all_tasks)
+                    if i % 100 == 0 or (i == total_tasks and getattr(all_tasks, 'complete', True)):
+                        print(f"📊 진행률: {i}/{total_tasks} ({i/total_tasks*100:.1f}%) 완료{self.controller_status()}"
+                              f"\n   ↳ 조회 대기 {task_queue.qsize()}/{queue_size} → 저장 대기 {results.qsize()}/{queue_size}")
+                
+                try:
+                    while running:
+                        item = await results.get()
+                        if item is None:
+                            running -= 1
+                            # 워커 예외는 남은 워커를 기다리지 않고 바로 다시 발생 (나머지 단계는 finally에서 취소)
+                            if errors:
+                                raise errors[0]
+                            continue
+                        store_result(*item)
+                    
+                    # 작업 생성 중 예외(카탈로그 조회 실패 등)는 여기서 다시 발생
+                    await asyncio.gather(*stages)
+                finally:
+                    for stage in stages:
+                        stage.cancel()
+                    await asyncio.gather(*stages, return_exceptions=True)
+                
+                # 실패 작업 재시도 (스레드 경로, 낮은 동시성 + 백오프)
+                for task, res in await asyncio.to_thread(list, self.retry_failed(concurrency)):
+                    store_result(task, res)
+        finally:
+            self.stop_parse_pool()
+        
+        return final_data
+
+    # ==========================================================
+    # 작업 목록 생성
+    # ==========================================================
+    def catalog_groups(self):
+        return self.get_categories()
+
+    def catalog_group_key(self, cat):
+        return str(cat['categoryId'])
+
+    def fetch_catalog_group(self, cat):
+        return self.get_subscriptions(cat['categoryId'])
+
+    def build_tasks(self, catalog=None):
+        """
+        요금제 → 가입유형 × 약정기간 전체 조합 생성
+        (catalog 미지정 시 카탈로그부터 조회)
+        """
+        if catalog is None:
+            catalog = self.discover_catalog()
+        
+        all_tasks = []
+        
+        # 모든 조합 생성
+        for s in catalog:
+            for t in ['31', '32', '33']:   # 가입 유형
+                for m in ['12', '24']:     # 약정 기간
+                    all_tasks.append({
+                        'id': s['subscriptionId'],
+                        'nm': s['subscriptionNm'],
+                        'type': t,
+                        'month': m
+                    })
+        
+        return all_tasks
+
+    def collect(self, all_tasks, max_threads=5, writer=None):
+        """
+        전체 작업을 단계별 파이프라인(작업 생성 → 조회 → 파싱 → 저장)으로 수집
+        - all_tasks는 목록 또는 TaskStream (스트림이면 전체 개수는 진행 중에 늘어남)
+        - 결과는 records.ColumnBuffer (writer가 있으면 행을 바로 저장기로 보내고 빈 버퍼 반환)
+        """
+        final_data = ColumnBuffer(self.record_columns())
+        
+        results = self.iter_results(all_tasks, max_threads=max_threads)
+        for i, (task, res) in enumerate(results, 1):
+            self.record_early(all_tasks, task, res)
+            self.record_history(task, res)
+            if self.store is not None:
+                res = self.record_incremental(task, res)
+            
+            if res and writer is not None:
+                with self.metrics.stage('write'):
+                    writer.write_rows(res)
+            elif res:
+                final_data.append_dicts(res)
+            
+            total_tasks = len(all_tasks)
+            if i % 100 == 0 or (i == total_tasks and getattr(all_tasks, 'complete', True)):
+                print(f"📊 진행률: {i}/{total_tasks} ({i/total_tasks*100:.1f}%) 완료{self.controller_status()}"
+                      f"{self.pipeline_status()}")
+        
+        return final_data
+
+    # ==========================================================
+    # 증분 수집 (직전 실행 대비 변동분만 유지)
+    # ==========================================================
+    def task_key(self, task):
+        """
+        저장소 키 (요금제 ID, 가입유형, 약정기간)
+        """
+        return (str(task['id']), str(task['type']), str(task['month']))
+
+    def store_keys(self, task):
+        return [self.task_key(task)]
+
+    # ==========================================================
+    # 4단계: 결과 저장 (스트리밍)
+    # ==========================================================
+    def open_writer(self):
+        """
+        실행 설정(형식/파티션/증분 여부)에 맞는 스트리밍 저장기 생성
+        """
+        prefix = "skt_subsidy_delta" if self.store is not None else "skt_subsidy_final"
+        if not self.partition:
+            prefix = f"{prefix}_{datetime.now().strftime('%H%M%S')}"
+        return self.open_output(prefix)
+
+    def save_results(self, final_data):
+        """
+        수집 결과(ColumnBuffer)를 한 번에 저장 (collect 결과 저장용)
+        """
+        writer = self.open_writer()
+        writer.write_buffer(final_data)
+        return self.finish_output(writer)
+
+    def finish_output(self, writer):
+        """
+        저장기 마무리 후 결과 출력, 저장된 행 수 반환
+        """
+        import os
+        with self.metrics.stage('write'):
+            output_path = writer.close()
+        
+        if output_path:
+            print(f"\n🎉 수집 성공!")
+            print(f"📂 파일명: {os.path.relpath(output_path, self.output_dir)}")
+            print(f"📊 데이터: {writer.rows_written:,}건\n")
+
+        elif self.store is not None:
+            print("\n✅ 직전 실행 대비 변동 없음")
+
+        else:
+            print("\n❌ 수집된 데이터가 없습니다. 사이트 구조를 확인하세요.")
+        
+        return writer.rows_written
+
+    # ==========================================================
+    # 전체 실행 로직
+    # ==========================================================
+    def run(self, max_threads=5, resume=False):
+        """
+        전체 크롤링 실행 함수 (스레드 엔진)
+        - 수집 중 행을 바로 파일로 저장하고, 저장된 행 수 반환
+        - resume=True: 직전에 중단된 실행의 체크포인트에서 완료 작업은 건너뜀
+        """
+        print("\n" + "🚀" * 40)
+        print("SKT T월드 지원금 크롤러")
+        print("🚀" * 40)
+        
+        self.metrics = RunMetrics(self.CARRIER)
+        
+        print("\n🔍 1, 2단계: 요금제 목록 구성 중 (카테고리 병렬, 도착하는 대로 조회 시작)...")
+        
+        if self.parse_processes > 0:
+            print(f"⚙️  파싱 프로세스: {self.parse_processes}개")
+        if self.controller is not None:
+            print(f"⚙️  적응형 동시성: 시작 {self.controller.limit}, 최대 {self.controller.max_limit}\n")
+        else:
+            print(f"⚙️  병렬 처리: {max_threads}개 스레드\n")
+
+        # =========================
+        # 3단계: 병렬 처리로 데이터 수집 (2단계 카탈로그 조회, 4단계 저장과 동시 진행)
+        # =========================
+        all_tasks = self.task_stream()
+        writer = self.open_writer()
+        self.open_journal(resume)
+        self.begin_incremental()
+        self.collect(all_tasks, max_threads=max_threads, writer=writer)
+        print(f"✅ 총 {len(all_tasks)}개의 조회 조합 처리됨")
+        
+        # 카탈로그를 전혀 못 받았으면 삭제 판정 없이 직전 스냅샷 유지
+        if all_tasks.tasks:
+            self.end_incremental(all_tasks.tasks, writer)
+        self.close()
+
+        # =========================
+        # 4단계: 결과 저장 마무리 + 실행 계측 저장
+        # =========================
+        rows_written = self.finish_output(writer)
+        self.close_journal(completed=True)
+        self.save_metrics()
+        return rows_written
+
+    def run_async(self, concurrency=20, resume=False):
+        """
+        전체 크롤링 실행 함수 (asyncio 엔진)
+        - 스레드 엔진과 동일한 행을 저장하고, 저장된 행 수 반환
+        """
+        print("\n" + "🚀" * 40)
+        print("SKT T월드 지원금 크롤러 (async)")
+        print("🚀" * 40)
+        
+        self.metrics = RunMetrics(self.CARRIER)
+        
+        print("\n🔍 1, 2단계: 요금제 목록 구성 중 (카테고리 병렬, 도착하는 대로 조회 시작)...")
+        if self.parse_processes > 0:
+            print(f"⚙️  파싱 프로세스: {self.parse_processes}개")
+        print(f"⚙️  비동기 처리: 동시 요청 {concurrency}개\n")
+
+        all_tasks = self.task_stream()
+        writer = self.open_writer()
+        self.open_journal(resume)
+        self.begin_incremental()
+        asyncio.run(self.collect_async(all_tasks, concurrency=concurrency, writer=writer))
+        print(f"✅ 총 {len(all_tasks)}개의 조회 조합 처리됨")
+        
+        if all_tasks.tasks:
+            self.end_incremental(all_tasks.tasks, writer)
+        self.close()
+
+        rows_written = self.finish_output(writer)
+        self.close_journal(completed=True)
+        self.save_metrics()
+        return rows_written
+
+
+# ==========================================================
+# 실행 진입점
+# ==========================================================
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="SKT T월드 공시지원금 크롤러")
+    parser.add_argument('--engine', choices=['thread', 'async'], default='thread')
+    parser.add_argument('--threads', type=int, default=5)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--incremental', action='store_true', help='직전 실행 대비 변동분만 저장')
+    parser.add_argument('--store', default='/app/output/subsidy_store.sqlite', help='증분 저장소 경로')
+    parser.add_argument('--history', action='store_true', help='지원금 이력 저장소에도 누적 (history_store.py로 조회)')
+    parser.add_argument('--history-store', default='/app/output/subsidy_history.sqlite', help='이력 저장소 경로')
+    parser.add_argument('--format', choices=['xlsx', 'csv', 'parquet'], default='xlsx', help='저장 형식')
+    parser.add_argument('--partition', action=argparse.BooleanOptionalAction, default=None,
+                        help='통신사/날짜별 디렉토리 분할 (기본: parquet만)')
+    parser.add_argument('--adaptive', action='store_true', help='지연/429 기반 적응형 동시성 (AIMD)')
+    parser.add_argument('--max-concurrency', type=int, default=32, help='적응형 동시성 상한')
+    parser.add_argument('--rate', type=float, help='초당 요청 수 상한 (기본: rate_limit.DEFAULT_HOST_LIMITS)')
+    parser.add_argument('--burst', type=int, help='순간 최대 요청 수 (기본: rate_limit.DEFAULT_HOST_LIMITS)')
+    parser.add_argument('--jitter', type=float, help='요청 간 무작위 추가 대기 상한 (초, 기본: rate_limit.DEFAULT_HOST_LIMITS)')
+    parser.add_argument('--catalog-ttl', type=int, default=6 * 3600,
+                        help='요금제 카탈로그 캐시 유효 시간 (초, 0이면 매번 조회)')
+    parser.add_argument('--openmetrics', action='store_true', help='실행 계측을 OpenMetrics 파일로도 저장')
+    parser.add_argument('--resume', action='store_true', help='중단된 실행의 체크포인트에서 이어서 수집')
+    parser.add_argument('--dedup', action='store_true', help='같은 지원금 표는 1번만 저장 (고유 표 + 색인 파일)')
+    parser.add_argument('--schedule', action='store_true',
+                        help='변동 이력 기반 순서 (핫 키 우선 + 조기 스냅샷, 콜드 키 생략, --incremental 필요)')
+    parser.add_argument('--cold-revisit', type=float, default=24, help='콜드 키 재방문 간격 (시간)')
+    parser.add_argument('--retry-passes', type=int, default=2,
+                        help='실패 작업 재시도 횟수 (본 수집 후 백오프 + 낮은 동시성, 0이면 재시도 없음)')
+    parser.add_argument('--http2', action='store_true', help='HTTP/2 다중화 전송 (httpx[http2], 커넥션 1~2개 공유, 미지원 시 HTTP/1.1)')
+    parser.add_argument('--parse-processes', type=int, default=0,
+                        help='/notice 파싱 프로세스 수 (0: 조회 스레드와 같은 프로세스에서 파싱)')
+    args = parser.parse_args()
+    
+    if (args.rate, args.burst, args.jitter) != (None, None, None):
+        from rate_limit import override_host
+        override_host('shop.tworld.co.kr', args.rate, args.burst, args.jitter)
+    
+    controller = None
+    if args.adaptive:
+        from rate_limit import AIMDController
+        controller = AIMDController(initial=args.threads, max_limit=args.max_concurrency)
+    
+    store = None
+    if args.incremental:
+        from result_store import ResultStore
+        store = ResultStore(args.store)
+    
+    history = None
+    if args.history:
+        from history_store import HistoryStore
+        history = HistoryStore(args.history_store)
+    
+    scheduler = None
+    if args.schedule:
+        if store is None:
+            print("⚠️  --schedule은 --incremental과 함께 사용해야 합니다 (변동 이력 없음, 스케줄링 생략)")
+        else:
+            from scheduler import ChangeScheduler
+            scheduler = ChangeScheduler(store, cold_revisit=args.cold_revisit * 3600)
+    
+    crawler = SKTStableCrawler(store=store, output_format=args.format, partition=args.partition,
+                               controller=controller, http2=args.http2)
+    crawler.catalog_cache_ttl = args.catalog_ttl
+    crawler.openmetrics = args.openmetrics
+    crawler.dedup_output = args.dedup
+    crawler.scheduler = scheduler
+    crawler.parse_processes = args.parse_processes
+    crawler.history = history
+    crawler.retry_passes = args.retry_passes
+    
+    if args.engine == 'async':
+        crawler.run_async(concurrency=args.concurrency, resume=args.resume)
+    else:
+        # 안정성을 위해 스레드 수 제한 (기본 5개)
+        crawler.run(max_threads=args.threads, resume=args.resume)
+    
+    if store is not None:
+        store.close()
+    
+    if history is not None:
+        history.close()
\ No newline at end of file
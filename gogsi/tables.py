@@ -0,0 +1,186 @@
+# =========================
+# 지원금 표 중복 제거 저장 (표 1번 저장 + 요금제별 표 ID)
+# =========================
+import json
+import hashlib
+
+from writers import open_writer
+
+# 표 ID 컬럼 / 표 행 수 컬럼
+TABLE_ID = '표ID'
+TABLE_ROWS = '행수'
+
+
+def table_hash(rows):
+    """
+    행 순서와 무관한 표 해시 (sha256 hex)
+    """
+    canonical = sorted(json.dumps(r, ensure_ascii=False, sort_keys=True, default=str) for r in rows)
+    return hashlib.sha256('\n'.join(canonical).encode('utf-8')).hexdigest()
+
+
+def split_tables(rows, key_fields):
+    """
+    행 목록 → [(키 값 dict, 표 행 목록), ...]
+    - 키 컬럼(요금제명 / 가입유형 / 약정 등) 값이 같은 행끼리 표 1개 (등장 순서 유지)
+    - 표 행에서는 키 컬럼을 뺌
+    """
+    groups = {}
+    for row in rows:
+        key = tuple(row.get(f) for f in key_fields)
+        table = groups.get(key)
+        if table is None:
+            table = groups[key] = []
+        table.append({k: v for k, v in row.items() if k not in key_fields})
+
+    return [(dict(zip(key_fields, key)), table) for key, table in groups.items()]
+
+
+class DedupWriter:
+    """
+    같은 단말/지원금 표는 한 번만 저장하고, 요금제 × 가입유형 × 약정마다 표 ID만 남기는 저장기
+    - {prefix}_tables: 표ID + 표 컬럼 (처음 본 표만 기록)
+    - {prefix}_index: 키 컬럼 + 표ID + 행수
+    - RowWriter와 같은 write_rows / close / rows_written 인터페이스 (rows_written은 펼친 행 수)
+    - 펼친 평면 파일이 필요하면 expand_tables로 다시 합침
+    """
+
+    def __init__(self, fmt, output_dir, prefix, carrier, partition, schema, key_fields):
+        self.key_fields = tuple(key_fields)
+        self.table_columns = [(name, kind) for name, kind in schema if name not in self.key_fields]
+        
+        self.tables = open_writer(fmt, output_dir, f"{prefix}_tables", carrier, partition,
+                                  schema=[(TABLE_ID, 'str')] + self.table_columns)
+        self.index = open_writer(fmt, output_dir, f"{prefix}_index", carrier, partition,
+                                 schema=[(name, kind) for name, kind in schema if name in self.key_fields]
+                                 + [(TABLE_ID, 'str'), (TABLE_ROWS, 'int')])
+        
+        self.seen = set()
+        self.rows_written = 0
+        self.tables_written = 0
+
+    def write_rows(self, rows):
+        if not rows:
+            return
+        
+        index_rows = []
+        for keys, table in split_tables(rows, self.key_fields):
+            table_id = table_hash(table)[:16]
+            
+            if table_id not in self.seen:
+                self.seen.add(table_id)
+                self.tables.write_rows([{TABLE_ID: table_id, **row} for row in table])
+                self.tables_written += 1
+            
+            index_rows.append({**keys, TABLE_ID: table_id, TABLE_ROWS: len(table)})
+        
+        self.index.write_rows(index_rows)
+        self.rows_written += len(rows)
+
+    def write_buffer(self, buffer, chunk_size=5000):
+        """
+        ColumnBuffer 저장 (키 컬럼 값이 바뀌는 지점에서만 끊어 표가 나뉘지 않게 함)
+        """
+        chunk, last_key = [], None
+        for row in buffer.iter_dicts():
+            key = tuple(row.get(f) for f in self.key_fields)
+            if len(chunk) >= chunk_size and key != last_key:
+                self.write_rows(chunk)
+                chunk = []
+            chunk.append(row)
+            last_key = key
+        self.write_rows(chunk)
+
+    def close(self):
+        """
+        두 파일 마무리 후 색인 파일 경로 반환 (행이 없으면 None)
+        """
+        self.tables.close()
+        path = self.index.close()
+        
+        if path and self.rows_written:
+            ratio = self.tables.rows_written / self.rows_written * 100
+            print(f"🗜️  표 중복 제거: {self.index.rows_written:,}개 조합 → 고유 표 {self.tables_written:,}개 "
+                  f"(행 {self.rows_written:,} → {self.tables.rows_written:,}, {ratio:.1f}%)")
+        return path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ==========================================================
+# 평면 파일로 펼치기
+# ==========================================================
+def read_table_file(path):
+    import pandas as pd
+
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    if path.endswith('.csv'):
+        return pd.read_csv(path, encoding='utf-8-sig', dtype={TABLE_ID: str})
+    return pd.read_excel(path, dtype={TABLE_ID: str})
+
+
+def expand_tables(tables_path, index_path, writer, columns=None, chunk_size=5000):
+    """
+    표 파일 + 색인 파일 → 평면 행으로 펼쳐 writer에 저장, 저장한 행 수 반환
+    - columns: 출력 컬럼 순서 (없으면 색인 키 컬럼 + 표 컬럼)
+    """
+    tables = read_table_file(tables_path)
+    index = read_table_file(index_path).drop(columns=[TABLE_ROWS])
+
+    flat = index.merge(tables, on=TABLE_ID, how='inner', sort=False).drop(columns=[TABLE_ID])
+    if columns:
+        flat = flat[[c for c in columns if c in flat.columns]]
+    
+    # 빈 값이 섞인 금액 컬럼이 실수로 읽히지 않도록 nullable 정수로 변환 후 None 처리
+    flat = flat.convert_dtypes()
+    flat = flat.astype(object).where(flat.notna(), None)
+
+    rows = flat.to_dict('records')
+    for start in range(0, len(rows), chunk_size):
+        writer.write_rows(rows[start:start + chunk_size])
+    return len(rows)
+
+
+# ==========================================================
+# 실행 진입점
+# ==========================================================
+if __name__ == "__main__":
+    import os
+    import argparse
+
+    parser = argparse.ArgumentParser(description="중복 제거 저장본(표 + 색인)을 평면 파일로 펼치기")
+    parser.add_argument('tables', help='{prefix}_tables 파일')
+    parser.add_argument('index', help='{prefix}_index 파일')
+    parser.add_argument('--carrier', choices=['skt', 'lguplus', 'all'], help='통신사 컬럼 순서 복원')
+    parser.add_argument('--format', choices=['xlsx', 'csv', 'parquet'], default='xlsx', help='저장 형식')
+    parser.add_argument('--out', default='.', help='저장 디렉토리')
+    args = parser.parse_args()
+
+    columns = None
+    if args.carrier == 'skt':
+        from skt_crawler import SKTStableCrawler
+        columns = [name for name, _ in SKTStableCrawler.COLUMNS] + ['변동유형']
+    elif args.carrier == 'lguplus':
+        from lguplus_crawler import LGUplusCrawler
+        columns = [name for name, _ in LGUplusCrawler.COLUMNS] + ['변동유형']
+    elif args.carrier == 'all':
+        from skt_crawler import SKTStableCrawler
+        from lguplus_crawler import LGUplusCrawler
+        columns = ['통신사']
+        for name, _ in SKTStableCrawler.COLUMNS + LGUplusCrawler.COLUMNS + (('변동유형', 'str'),):
+            if name not in columns:
+                columns.append(name)
+
+    prefix = os.path.basename(args.index).rsplit('.', 1)[0]
+    if prefix.endswith('_index'):
+        prefix = prefix[:-len('_index')]
+
+    writer = open_writer(args.format, args.out, f"{prefix}_flat", 'ALL', partition=False)
+    count = expand_tables(args.tables, args.index, writer, columns)
+    path = writer.close()
+    print(f"📂 {count:,}건 펼침: {path}")
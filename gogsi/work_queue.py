@@ -0,0 +1,236 @@
+# =========================
+# 분산 수집용 작업 큐 (SQLite, 샤드 임대 / 만료 시 재배포)
+# =========================
+import json
+import time
+import sqlite3
+from datetime import datetime
+
+
+class WorkQueue:
+    """
+    코디네이터가 조회 작업을 샤드로 나눠 올리고, 워커 프로세스(또는 공유 디렉토리의 다른 호스트)가
+    샤드를 임대해 처리한 뒤 결과 행을 돌려주는 SQLite 큐
+    - 임대(lease): 워커는 lease_seconds 동안 샤드를 독점, 처리 중에는 heartbeat로 연장
+    - 워커가 죽어 임대가 만료되면 다른 워커에게 재배포 (max_attempts회 넘으면 failed)
+    - 완료 보고는 현재 임대 주인일 때만 반영 (만료 후 늦게 끝난 워커의 중복 결과 무시)
+    - 연결은 스레드/프로세스마다 따로 열어야 함 (sqlite3 커넥션 공유 금지)
+    """
+
+    def __init__(self, path, timeout=30):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id       INTEGER PRIMARY KEY AUTOINCREMENT,
+                carrier      TEXT NOT NULL,
+                options_json TEXT NOT NULL,
+                created_at   TEXT NOT NULL,
+                finished_at  TEXT
+            );
+            CREATE TABLE IF NOT EXISTS shards (
+                shard_id      INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id        INTEGER NOT NULL,
+                tasks_json    TEXT NOT NULL,
+                state         TEXT NOT NULL DEFAULT 'pending',
+                attempts      INTEGER NOT NULL DEFAULT 0,
+                lease_owner   TEXT,
+                lease_expires REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_shards_state ON shards (state, job_id);
+            CREATE TABLE IF NOT EXISTS results (
+                result_id  INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id     INTEGER NOT NULL,
+                shard_id   INTEGER NOT NULL,
+                task_json  TEXT NOT NULL,
+                rows_json  TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_results_job ON results (job_id, result_id);
+        """)
+
+    # ==========================================================
+    # 코디네이터
+    # ==========================================================
+    def publish(self, carrier, tasks, shard_size=20, options=None):
+        """
+        작업 목록을 shard_size개씩 나눠 올리고 job_id 반환
+        - options: 워커가 크롤러를 만들 때 쓰는 설정 (base_url, paging 등)
+        """
+        tasks = list(tasks)
+        with self.transaction():
+            cur = self.conn.execute(
+                "INSERT INTO jobs (carrier, options_json, created_at) VALUES (?, ?, ?)",
+                (carrier, json.dumps(options or {}, ensure_ascii=False),
+                 datetime.now().isoformat(timespec='seconds'))
+            )
+            job_id = cur.lastrowid
+            self.conn.executemany(
+                "INSERT INTO shards (job_id, tasks_json) VALUES (?, ?)",
+                [
+                    (job_id, json.dumps(tasks[i:i + shard_size], ensure_ascii=False))
+                    for i in range(0, len(tasks), shard_size)
+                ]
+            )
+        return job_id
+
+    def progress(self, job_id):
+        """
+        샤드 상태별 개수 {'pending': n, 'leased': n, 'done': n, 'failed': n}
+        """
+        counts = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0}
+        for state, count in self.conn.execute(
+            "SELECT state, COUNT(*) FROM shards WHERE job_id = ? GROUP BY state", (job_id,)
+        ):
+            counts[state] = count
+        return counts
+
+    def take_results(self, job_id, limit=500):
+        """
+        도착한 결과를 꺼내고 큐에서 삭제 → [(task, rows), ...]
+        """
+        with self.transaction():
+            found = self.conn.execute(
+                "SELECT result_id, task_json, rows_json FROM results WHERE job_id = ? "
+                "ORDER BY result_id LIMIT ?",
+                (job_id, limit)
+            ).fetchall()
+            if found:
+                self.conn.execute(
+                    "DELETE FROM results WHERE job_id = ? AND result_id <= ?", (job_id, found[-1][0])
+                )
+        return [(json.loads(task), json.loads(rows)) for _, task, rows in found]
+
+    def active_leases(self, job_id):
+        """
+        임대가 아직 유효한(워커가 처리 중인) 샤드 수
+        """
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM shards WHERE job_id = ? AND state = 'leased' AND lease_expires >= ?",
+            (job_id, time.time())
+        ).fetchone()[0]
+
+    def fail_open_shards(self, job_id):
+        """
+        대기 중이거나 임대가 만료된 샤드를 failed 처리 (처리할 워커가 없을 때), 처리한 샤드 수 반환
+        - 방금 임대된 샤드는 건드리지 않음 (원격 워커가 처리 중일 수 있음)
+        """
+        with self.transaction():
+            cur = self.conn.execute(
+                "UPDATE shards SET state = 'failed', lease_owner = NULL WHERE job_id = ? AND "
+                "(state = 'pending' OR (state = 'leased' AND lease_expires < ?))",
+                (job_id, time.time())
+            )
+        return cur.rowcount
+
+    def finish_job(self, job_id):
+        self.conn.execute(
+            "UPDATE jobs SET finished_at = ? WHERE job_id = ?",
+            (datetime.now().isoformat(timespec='seconds'), job_id)
+        )
+
+    # ==========================================================
+    # 워커
+    # ==========================================================
+    def lease(self, worker_id, lease_seconds=60, max_attempts=3):
+        """
+        처리할 샤드 1개 임대 → (shard_id, job_id, carrier, options, tasks), 없으면 None
+        - 대기 중이거나 임대가 만료된 샤드 중 가장 오래된 것
+        - 만료된 샤드가 이미 max_attempts번 배포됐으면 failed 처리
+        """
+        now = time.time()
+        with self.transaction():
+            self.conn.execute(
+                "UPDATE shards SET state = 'failed', lease_owner = NULL "
+                "WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, max_attempts)
+            )
+            found = self.conn.execute(
+                "SELECT s.shard_id, s.job_id, j.carrier, j.options_json, s.tasks_json "
+                "FROM shards s JOIN jobs j ON j.job_id = s.job_id "
+                "WHERE j.finished_at IS NULL AND "
+                "(s.state = 'pending' OR (s.state = 'leased' AND s.lease_expires < ?)) "
+                "ORDER BY s.shard_id LIMIT 1",
+                (now,)
+            ).fetchone()
+            if found is None:
+                return None
+            
+            shard_id, job_id, carrier, options, tasks = found
+            self.conn.execute(
+                "UPDATE shards SET state = 'leased', attempts = attempts + 1, "
+                "lease_owner = ?, lease_expires = ? WHERE shard_id = ?",
+                (worker_id, now + lease_seconds, shard_id)
+            )
+        return shard_id, job_id, carrier, json.loads(options), json.loads(tasks)
+
+    def heartbeat(self, shard_id, worker_id, lease_seconds=60):
+        """
+        임대 연장 (임대를 잃었으면 False)
+        """
+        cur = self.conn.execute(
+            "UPDATE shards SET lease_expires = ? "
+            "WHERE shard_id = ? AND lease_owner = ? AND state = 'leased'",
+            (time.time() + lease_seconds, shard_id, worker_id)
+        )
+        return cur.rowcount == 1
+
+    def complete(self, shard_id, worker_id, results):
+        """
+        샤드 결과 보고 [(task, rows), ...] (임대를 잃었으면 반영하지 않고 False)
+        """
+        with self.transaction():
+            cur = self.conn.execute(
+                "UPDATE shards SET state = 'done', lease_owner = NULL "
+                "WHERE shard_id = ? AND lease_owner = ? AND state = 'leased'",
+                (shard_id, worker_id)
+            )
+            if cur.rowcount != 1:
+                return False
+            
+            job_id = self.conn.execute(
+                "SELECT job_id FROM shards WHERE shard_id = ?", (shard_id,)
+            ).fetchone()[0]
+            self.conn.executemany(
+                "INSERT INTO results (job_id, shard_id, task_json, rows_json) VALUES (?, ?, ?, ?)",
+                [
+                    (job_id, shard_id, json.dumps(task, ensure_ascii=False),
+                     json.dumps(rows, ensure_ascii=False, default=str))
+                    for task, rows in results
+                ]
+            )
+        return True
+
+    def has_open_work(self):
+        """
+        끝나지 않은 작업에 대기 / 임대 중 샤드가 남아 있는지
+        """
+        return self.conn.execute(
+            "SELECT 1 FROM shards s JOIN jobs j ON j.job_id = s.job_id "
+            "WHERE j.finished_at IS NULL AND s.state IN ('pending', 'leased') LIMIT 1"
+        ).fetchone() is not None
+
+    # ==========================================================
+    # 공통
+    # ==========================================================
+    def transaction(self):
+        return _Transaction(self.conn)
+
+    def close(self):
+        self.conn.close()
+
+
+class _Transaction:
+    """
+    BEGIN IMMEDIATE ... COMMIT (여러 프로세스가 동시에 임대해도 같은 샤드를 받지 않도록 쓰기 잠금 선점)
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
@@ -0,0 +1,228 @@
+# =========================
+# 스트리밍 결과 저장 (xlsx / csv / parquet)
+# =========================
+import os
+import csv
+from datetime import datetime
+
+from records import ColumnBuffer
+
+
+class RowWriter:
+    """
+    수집 중에 행을 바로 디스크로 내보내는 저장기 기본 클래스
+    - write_rows(rows): 행 목록(dict) 추가
+    - write_buffer(buffer): records.ColumnBuffer 추가
+    - close(): 파일 마무리 후 저장 경로 반환
+    - schema: [(컬럼명, 'str' | 'int'), ...] (없으면 첫 행의 키 순서 사용)
+    """
+
+    def __init__(self, path, schema=None):
+        self.path = path
+        self.schema = list(schema) if schema else None
+        self.rows_written = 0
+        self.columns = None
+
+    def _ensure_open(self, first_row_keys):
+        if self.columns is None:
+            self.columns = [name for name, _ in self.schema] if self.schema else list(first_row_keys)
+            self._open()
+
+    def write_rows(self, rows):
+        if not rows:
+            return
+        self._ensure_open(rows[0].keys())
+        self._write(rows)
+        self.rows_written += len(rows)
+
+    def write_buffer(self, buffer, chunk_size=5000):
+        """
+        ColumnBuffer의 행을 chunk_size 단위 dict로 복원해 저장
+        """
+        chunk = []
+        for row in buffer.iter_dicts():
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                self.write_rows(chunk)
+                chunk = []
+        self.write_rows(chunk)
+
+    def _open(self):
+        raise NotImplementedError
+
+    def _write(self, rows):
+        raise NotImplementedError
+
+    def _close(self):
+        raise NotImplementedError
+
+    def close(self):
+        """
+        저장 마무리 (행이 하나도 없으면 파일을 만들지 않고 None 반환)
+        """
+        if self.columns is None:
+            return None
+        self._close()
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class XlsxStreamWriter(RowWriter):
+    """
+    openpyxl write-only 모드 (행을 임시 파일로 흘려 보내 메모리 일정)
+    """
+
+    def _open(self):
+        from openpyxl import Workbook
+        
+        self._wb = Workbook(write_only=True)
+        self._ws = self._wb.create_sheet()
+        self._ws.append(self.columns)
+
+    def _write(self, rows):
+        for row in rows:
+            self._ws.append([row.get(c) for c in self.columns])
+
+    def _close(self):
+        self._wb.save(self.path)
+
+
+class CsvStreamWriter(RowWriter):
+    """
+    CSV 저장 (엑셀에서 한글이 깨지지 않도록 utf-8-sig)
+    """
+
+    def _open(self):
+        self._file = open(self.path, 'w', newline='', encoding='utf-8-sig')
+        self._csv = csv.DictWriter(self._file, fieldnames=self.columns, extrasaction='ignore')
+        self._csv.writeheader()
+
+    def _write(self, rows):
+        self._csv.writerows(rows)
+
+    def _close(self):
+        self._file.close()
+
+
+class ParquetStreamWriter(RowWriter):
+    """
+    Parquet 저장 (batch_size 행마다 row group 1개씩 기록)
+    - schema가 있으면 ColumnBuffer에 모아 사전 인코딩 컬럼 그대로 기록
+    - schema가 없으면 첫 배치 기준 추론, 첫 배치에서 값이 모두 비어 있던 컬럼은 문자열로 처리
+    """
+
+    def __init__(self, path, schema=None, batch_size=10000):
+        super().__init__(path, schema)
+        self.batch_size = batch_size
+        self._buffer = []
+        self._records = ColumnBuffer(self.schema) if self.schema else None
+
+    def _open(self):
+        self._writer = None
+        self._schema = None
+
+    def _write(self, rows):
+        if self._records is not None:
+            self._records.append_dicts(rows)
+            pending = len(self._records)
+        else:
+            self._buffer.extend(rows)
+            pending = len(self._buffer)
+        
+        if pending >= self.batch_size:
+            self._flush()
+
+    def _write_table(self, table):
+        import pyarrow.parquet as pq
+        
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table)
+
+    def write_buffer(self, buffer, chunk_size=5000):
+        """
+        스키마가 같은 ColumnBuffer는 dict 복원 없이 그대로 기록
+        """
+        if self._records is None or buffer.columns != self._records.columns or not len(buffer):
+            return super().write_buffer(buffer, chunk_size)
+        
+        self._ensure_open(buffer.columns)
+        self._flush()
+        self._write_table(buffer.to_arrow())
+        self.rows_written += len(buffer)
+
+    def _flush(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        if self._records is not None:
+            if len(self._records):
+                self._write_table(self._records.to_arrow())
+                self._records.clear()
+            return
+        
+        if not self._buffer:
+            return
+        
+        if self._schema is None:
+            inferred = pa.Table.from_pylist(self._buffer).schema
+            self._schema = pa.schema([
+                pa.field(f.name, pa.string() if pa.types.is_null(f.type) else f.type)
+                for f in inferred
+            ])
+            self._string_cols = [f.name for f in self._schema if pa.types.is_string(f.type)]
+            self._writer = pq.ParquetWriter(self.path, self._schema)
+        
+        for row in self._buffer:
+            for col in self._string_cols:
+                value = row.get(col)
+                if value is not None and not isinstance(value, str):
+                    row[col] = str(value)
+        
+        table = pa.Table.from_pylist(self._buffer, schema=self._schema)
+        self._writer.write_table(table)
+        self._buffer = []
+
+    def _close(self):
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+
+
+# 저장 형식 → (저장기 클래스, 확장자)
+WRITER_FORMATS = {
+    'xlsx': (XlsxStreamWriter, 'xlsx'),
+    'csv': (CsvStreamWriter, 'csv'),
+    'parquet': (ParquetStreamWriter, 'parquet'),
+}
+
+
+def open_writer(fmt, output_dir, prefix, carrier, partition=True, now=None, schema=None):
+    """
+    형식/파티션 설정에 맞는 저장기 생성
+    - schema: [(컬럼명, 'str' | 'int'), ...] (컬럼 순서 고정, parquet 사전 인코딩)
+    - partition=True: {output_dir}/{fmt}/carrier={통신사}/date={YYYY-MM-DD}/{prefix}_{HHMMSS}.{ext}
+    - partition=False: {output_dir}/{prefix}_{timestamp}.{ext} (기존 파일명 규칙)
+    """
+    if fmt not in WRITER_FORMATS:
+        raise ValueError(f"지원하지 않는 저장 형식: {fmt}")
+    
+    writer_cls, ext = WRITER_FORMATS[fmt]
+    now = now or datetime.now()
+    
+    if partition:
+        directory = os.path.join(
+            output_dir, fmt, f"carrier={carrier}", f"date={now.strftime('%Y-%m-%d')}"
+        )
+        filename = f"{prefix}_{now.strftime('%H%M%S')}.{ext}"
+    else:
+        directory = output_dir
+        filename = f"{prefix}.{ext}"
+    
+    os.makedirs(directory, exist_ok=True)
+    return writer_cls(os.path.join(directory, filename), schema=schema)
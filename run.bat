@@ -24,11 +24,8 @@ echo.
 
 if not exist output mkdir output
 
-echo [1/2] SKT 크롤러 실행 중...
-podman run --rm -v ./output:/app/output gongsi-crawler python -u skt_crawler.py
-
-echo [2/2] LG U+ 크롤러 실행 중...
-podman run --rm -v ./output:/app/output --shm-size=2g gongsi-crawler python -u lguplus_crawler.py
+echo SKT + LG U+ 통합 크롤러 실행 중...
+podman run --rm -v ./output:/app/output --shm-size=2g gongsi-crawler python -u orchestrator.py
 
 echo.
 echo ========================================